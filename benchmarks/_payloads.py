@@ -0,0 +1,62 @@
+"""
+benchmarks/_payloads.py
+
+Synthetic, API-shaped payloads shared by the benchmark scripts.
+"""
+
+
+
+def make_product(n: int, n_specs: int = 20, n_ladders: int = 6, n_extra: int = 0) -> dict:
+    """
+    Builds a product payload shaped like a `/ftps/wm/product/detail` `result` (or a search hit).
+
+    `n_extra` adds that many members the library never reads, standing in for the rest of a real payload
+    (packaging, weights, alternative image sizes, ...).
+    """
+    base_price = 0.05 + (n % 97) / 100
+    payload = {
+        "productId": 100000 + n,
+        "productCode": f"C{n}",
+        "productModel": f"MODEL-{n}",
+        "title": f"ACME MODEL-{n}",
+        "parentCatalogId": 1000 + n % 30,
+        "parentCatalogName": f"Parent Catalog {n % 30}",
+        "catalogId": 2000 + n % 300,
+        "catalogName": f"Catalog {n % 300}",
+        "brandId": 300 + n % 500,
+        "brandNameEn": f"Brand {n % 500}",
+        "split": 5,
+        "minBuyNumber": 5,
+        "isHot": n % 2,
+        "stockNumber": (n * 37) % 50000,
+        "productPriceList": [
+            {"ladder": 5 * 10 ** i, "usdPrice": round(base_price * (1 - 0.05 * i), 4)}
+            for i in range(n_ladders)
+        ],
+        "productImages": [f"https://assets.lcsc.com/images/C{n}_front.jpg", f"https://assets.lcsc.com/images/C{n}_back.jpg"],
+        "pdfUrl": f"https://www.lcsc.com/datasheet/C{n}.pdf",
+        "productIntroEn": f"Synthetic benchmark product number {n}",
+        "paramVOList": [
+            {"paramNameEn": f"Parameter {j}", "paramCode": f"param_{10000 + j}", "paramValueEn": f"{(n + j) % 100}kΩ"}
+            for j in range(n_specs)
+        ],
+        "url": f"https://www.lcsc.com/product-detail/C{n}.html",
+        "isDiscount": n % 4 == 0,
+    }
+    for k in range(n_extra):
+        payload[f"extraMember{k}"] = f"Unused value {k} of product C{n}"
+    return payload
+
+
+
+def make_search_result(n_hits: int = 100, n_extra: int = 0) -> dict:
+    """
+    Builds a payload shaped like a `/ftps/wm/search/global` `result` with `n_hits` products.
+    """
+    return {"productSearchResultVO": {
+        "productList": [make_product(i + 1, n_extra=n_extra) for i in range(n_hits)],
+        "totalCount": n_hits,
+        "currentPage": 1,
+        "pageSize": n_hits,
+        "totalPage": 1,
+    }}
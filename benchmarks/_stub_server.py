@@ -0,0 +1,112 @@
+"""
+benchmarks/_stub_server.py
+
+A local HTTP server that replays canned product detail and search responses with configurable latency.
+"""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from _payloads import make_product, make_search_result
+
+
+
+_DETAIL_PATH = "/ftps/wm/product/detail"
+_SEARCH_PATH = "/ftps/wm/search/global"
+
+
+
+def _envelope(result: dict) -> bytes:
+    return json.dumps({"code": 200, "msg": None, "result": result}, separators=(",", ":")).encode()
+
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        stub: "StubServer" = self.server.stub
+        parts = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        if stub.latency:
+            time.sleep(stub.latency)
+        if parts.path == _DETAIL_PATH:
+            body = stub.detail_body(params.get("productCode", ""))
+        elif parts.path == _SEARCH_PATH:
+            body = stub.search_body
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with stub.lock:
+            stub.requests += 1
+
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+
+class StubServer:
+    """
+    Serves the detail and search endpoints from canned JSON bodies, encoded once up front.
+
+    By default the bodies are synthetic, API-shaped payloads (see: `_payloads.py`). Pass `fixtures`, a directory holding
+    `detail.json` and/or `search.json` (full response bodies, e.g. saved from the real API), to replay those instead;
+    a recorded detail body is served for every part number.
+
+    ## Parameters
+    - `latency` ( *float*, *optional* ) - Seconds each response is delayed, simulating the network round trip.
+    - `fixtures` ( *str*, *optional* ) - Directory of recorded response bodies.
+    - `n_products` ( *int*, *optional* ) - Number of distinct synthetic products (`C1` ... `Cn`) the detail endpoint knows.
+    """
+    def __init__(self, latency: float = 0.0, fixtures: str | None = None, n_products: int = 1000) -> None:
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = 0
+        self._recorded_detail = None
+        search_body = None
+        if fixtures is not None:
+            detail_path, search_path = os.path.join(fixtures, "detail.json"), os.path.join(fixtures, "search.json")
+            if os.path.exists(detail_path):
+                with open(detail_path, "rb") as f:
+                    self._recorded_detail = f.read()
+            if os.path.exists(search_path):
+                with open(search_path, "rb") as f:
+                    search_body = f.read()
+        self._details = {} if self._recorded_detail is not None else {f"C{i + 1}": _envelope(make_product(i + 1)) for i in range(n_products)}
+        self.search_body = search_body or _envelope(make_search_result(100))
+        self._server = _Server(("127.0.0.1", 0), _Handler)
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def detail_body(self, code: str) -> bytes:
+        if self._recorded_detail is not None:
+            return self._recorded_detail
+        return self._details.get(code) or self._details["C1"]
@@ -0,0 +1,62 @@
+"""
+benchmarks/bench_construction.py
+
+Measures the cost of building `ProductDetails` objects from raw payloads.
+
+Usage: `python benchmarks/bench_construction.py [n_products]`
+"""
+import sys
+import time
+
+from _payloads import make_product, make_search_result
+from lcsc.client import _build_search_results
+from lcsc.types import ProductDetails
+
+
+
+def _per_item_us(func, payloads: list[dict], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(payloads)
+        best = min(best, time.perf_counter() - start)
+    return best / len(payloads) * 1e6
+
+
+
+def construct_only(payloads: list[dict]) -> None:
+    for p in payloads:
+        ProductDetails(p)
+
+
+
+def construct_and_read_stock(payloads: list[dict]) -> None:
+    for p in payloads:
+        ProductDetails(p).stock
+
+
+
+def construct_and_materialize(payloads: list[dict]) -> None:
+    for p in payloads:
+        d = ProductDetails(p)
+        d.parent_catalog, d.catalog, d.brand, d.price, d.specs
+
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    payloads = [make_product(i + 1) for i in range(n)]
+    print(f"ProductDetails construction, {n} products (best of 5, us/product):")
+    print(f"  construct only:                  {_per_item_us(construct_only, payloads):8.2f}")
+    print(f"  construct + read stock:          {_per_item_us(construct_and_read_stock, payloads):8.2f}")
+    print(f"  construct + every sub-structure: {_per_item_us(construct_and_materialize, payloads):8.2f}")
+    search = make_search_result(100)
+    start = time.perf_counter()
+    for _ in range(200):
+        _build_search_results(search, 500, "stock")
+    print(f"  100-hit search, min_stock + sort: {(time.perf_counter() - start) / 200 * 1e3:7.3f} ms/page")
+
+
+
+if __name__ == "__main__":
+    main()
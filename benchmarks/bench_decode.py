@@ -0,0 +1,87 @@
+"""
+benchmarks/bench_decode.py
+
+Measures decoding a 100-hit search response into `SearchResult` objects: parse throughput of each installed JSON
+parser, and the memory held by (and peak memory while building) many pages of results with `keep_raw` on and off.
+
+Usage: `python benchmarks/bench_decode.py [n_pages]`
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from _payloads import make_search_result
+from lcsc import _json
+from lcsc.client import _build_search_results
+
+
+
+def _decoders() -> dict:
+    decoders = {"json": json.loads}
+    try:
+        import orjson
+        decoders["orjson"] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec.json
+        decoders["msgspec"] = msgspec.json.decode
+    except ImportError:
+        pass
+    return decoders
+
+
+
+def _best_ms(func, repeat: int = 200) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+
+def _memory(body: bytes, n_pages: int, keep_raw: bool, materialize: bool) -> tuple[float, float]:
+    """
+    Returns `(retained, peak)` bytes per product after decoding `n_pages` pages and keeping every result.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = []
+    for _ in range(n_pages):
+        results = _build_search_results(_json.loads(body)["result"], None, "stock", keep_raw)
+        if materialize:
+            for r in results:
+                d = r.product_details
+                d.parent_catalog, d.catalog, d.brand, d.price, d.specs
+        kept.extend(results)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (retained - before) / len(kept), (peak - before) / len(kept)
+
+
+
+def main() -> None:
+    n_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    body = json.dumps({"code": 200, "result": make_search_result(100, n_extra=40)}).encode()
+    print(f"100-hit search page, {len(body) / 1024:.0f} KiB of JSON (best of 200):")
+    for name, loads in _decoders().items():
+        ms = _best_ms(lambda: loads(body))
+        total = _best_ms(lambda: _build_search_results(loads(body)["result"], 500, "stock"))
+        print(f"  {name:8} decode {ms:6.3f} ms ({len(body) / ms / 1e3:6.1f} MB/s), decode + build results {total:6.3f} ms/page")
+    print(f"Memory of {n_pages} pages of results (parser: {_json.backend}, tracemalloc):")
+    for materialize in (False, True):
+        print("  every sub-structure materialized:" if materialize else "  scalar fields only:")
+        for keep_raw in (True, False):
+            retained, peak = _memory(body, n_pages, keep_raw, materialize)
+            print(f"    keep_raw={keep_raw!s:5}  retained {retained:8,.0f} bytes/product, peak {peak:8,.0f} bytes/product")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+benchmarks/bench_memory.py
+
+Measures the memory held by fully materialized `ProductDetails` objects, excluding the raw payloads they were built from.
+
+Usage: `python benchmarks/bench_memory.py [n_products]`
+"""
+import gc
+import sys
+import tracemalloc
+
+from _payloads import make_product
+from lcsc.types import ProductDetails
+
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    payloads = [make_product(i + 1) for i in range(n)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    products = []
+    for p in payloads:
+        d = ProductDetails(p)
+        d.parent_catalog, d.catalog, d.brand, d.price, d.specs
+        products.append(d)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{n} products, 20 specs + 6 price ladders each, all sub-structures materialized:")
+    print(f"  {(after - before) / n:,.0f} bytes/product (excluding raw payloads)")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+benchmarks/run.py
+
+Runs the benchmark suite against a local stub server and emits the results as JSON.
+
+Usage: `python benchmarks/run.py [--latency SECONDS] [--fixtures DIR] [--quick] [--scale FACTOR] [--only NAME ...] [--output FILE] [--baseline FILE]`
+
+With `--baseline`, each metric is also compared with the same metric in an earlier results file, and the ratios are
+printed to stderr (values above 1 are better for throughput metrics and worse for latency/cost metrics).
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+from _payloads import make_product, make_search_result
+from _stub_server import StubServer
+import lcsc
+from lcsc import _json
+from lcsc.client import _build_search_results
+from lcsc.types import ProductDetails
+
+
+
+def _scaled(n: int, scale: float) -> int:
+    return max(1, round(n * scale))
+
+
+
+def _best(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+
+def bench_single_lookup(stub: StubServer, quick: bool, scale: float = 1.0) -> dict:
+    """
+    Latency of sequential `get_product_details` calls over one keep-alive connection.
+    """
+    n = _scaled(50 if quick else 300, scale)
+    latencies = []
+    with lcsc.LCSCClient(base_url=stub.url, retry=None) as client:
+        client.get_product_details("C1")
+        for i in range(n):
+            start = time.perf_counter()
+            client.get_product_details(f"C{i % 1000 + 1}")
+            latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "calls": n,
+        "mean_ms": statistics.fmean(latencies) * 1e3,
+        "p50_ms": latencies[len(latencies) // 2] * 1e3,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1e3,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1e3,
+    }
+
+
+
+def bench_batch_throughput(stub: StubServer, quick: bool, scale: float = 1.0) -> dict:
+    """
+    Products per second fetched with `get_product_details_many` (threads) and `AsyncLCSCClient` at several concurrency levels.
+    """
+    n = _scaled(200 if quick else 1000, scale)
+    codes = [f"C{i + 1}" for i in range(n)]
+    results = {}
+    for workers in (1, 4, 16, 64):
+        with lcsc.LCSCClient(base_url=stub.url, pool_size=workers, retry=None) as client:
+            start = time.perf_counter()
+            fetched = client.get_product_details_many(codes, max_workers=workers)
+            elapsed = time.perf_counter() - start
+        errors = sum(isinstance(r, Exception) for r in fetched.values())
+        results[f"threads_{workers}"] = {"products_per_s": n / elapsed, "errors": errors}
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        return results
+    for concurrency in (16, 64, 256):
+        async def run() -> float:
+            async with lcsc.AsyncLCSCClient(base_url=stub.url, concurrency=concurrency, retry=None) as client:
+                start = time.perf_counter()
+                await asyncio.gather(*(client.get_product_details(code) for code in codes))
+                return time.perf_counter() - start
+        results[f"asyncio_{concurrency}"] = {"products_per_s": n / asyncio.run(run()), "errors": 0}
+    return results
+
+
+
+def bench_parse(stub: StubServer, quick: bool, scale: float = 1.0) -> dict:
+    """
+    Cost of decoding a detail body and building `ProductDetails` from it.
+    """
+    n = _scaled(2000 if quick else 20000, scale)
+    payloads = [make_product(i + 1) for i in range(n)]
+    body = stub.detail_body("C1")
+    repeat = 3 if quick else 5
+    def materialize() -> None:
+        for p in payloads:
+            d = ProductDetails(p)
+            d.parent_catalog, d.catalog, d.brand, d.price, d.specs
+    return {
+        "json_backend": _json.backend,
+        "decode_detail_us": _best(lambda: [_json.loads(body) for _ in range(1000)], repeat) / 1000 * 1e6,
+        "construct_us": _best(lambda: [ProductDetails(p) for p in payloads], repeat) / n * 1e6,
+        "construct_lean_us": _best(lambda: [ProductDetails(p, False) for p in payloads], repeat) / n * 1e6,
+        "materialize_us": _best(materialize, repeat) / n * 1e6,
+    }
+
+
+
+def bench_search(stub: StubServer, quick: bool, scale: float = 1.0) -> dict:
+    """
+    Cost of turning a 100-hit search page into filtered, sorted `SearchResult` lists.
+    """
+    raw = make_search_result(100)
+    repeat = _scaled(50 if quick else 300, scale)
+    body = stub.search_body
+    return {
+        "decode_page_ms": _best(lambda: _json.loads(body), repeat) * 1e3,
+        "filter_sort_stock_ms": _best(lambda: _build_search_results(raw, 500, "stock"), repeat) * 1e3,
+        "filter_sort_price_ms": _best(lambda: _build_search_results(raw, 500, "price"), repeat) * 1e3,
+        "no_filter_sort_stock_ms": _best(lambda: _build_search_results(raw, None, "stock"), repeat) * 1e3,
+        "top10_price_ms": _best(lambda: _build_search_results(raw, 500, "price", limit=10), repeat) * 1e3,
+    }
+
+
+
+def bench_order_cost(stub: StubServer, quick: bool, scale: float = 1.0) -> dict:
+    """
+    Throughput of `ProductDetails.get_order_cost`, and of `PriceTable.cost` when NumPy is installed.
+    """
+    rng = random.Random(0)
+    products = [ProductDetails(make_product(i + 1)) for i in range(1000)]
+    lines = [(products[rng.randrange(1000)], 5 * rng.randint(1, 2000)) for _ in range(_scaled(20000 if quick else 100000, scale))]
+    repeat = 3 if quick else 5
+    elapsed = _best(lambda: [p.get_order_cost(q) for p, q in lines], repeat)
+    results = {"get_order_cost_per_s": len(lines) / elapsed}
+    try:
+        from lcsc.pricing import PriceTable
+    except ImportError:
+        return results
+    table = PriceTable(products)
+    rows = table.rows(p.product_code for p, _ in lines)
+    quantities = [q for _, q in lines]
+    elapsed = _best(lambda: table.cost(rows, quantities), repeat)
+    results["price_table_cost_per_s"] = len(lines) / elapsed
+    return results
+
+
+
+BENCHMARKS = {
+    "single_lookup": bench_single_lookup,
+    "batch_throughput": bench_batch_throughput,
+    "parse": bench_parse,
+    "search": bench_search,
+    "order_cost": bench_order_cost,
+}
+
+
+
+def _flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[prefix + key] = value
+    return flat
+
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    """
+    Returns one `metric: old -> new (xRATIO)` line per metric present in both result sets.
+    """
+    old, new = _flatten(baseline["results"]), _flatten(results["results"])
+    lines = []
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key] / old[key] if old[key] else float("inf")
+        lines.append(f"{key}: {old[key]:.4g} -> {new[key]:.4g} (x{ratio:.2f})")
+    return lines
+
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the lcsc benchmark suite against a local stub server.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of simulated latency per response.")
+    parser.add_argument("--fixtures", help="Directory with recorded detail.json/search.json response bodies.")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations, for smoke runs.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply the workload sizes by this factor (e.g. 0.01 for a smoke test).")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Run only these benchmarks.")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    parser.add_argument("--baseline", help="Earlier results file to compare against.")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "lcsc_version": lcsc.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": _json.backend,
+            "latency_s": args.latency,
+            "fixtures": args.fixtures,
+            "quick": args.quick,
+            "scale": args.scale,
+        },
+        "results": {},
+    }
+    with StubServer(latency=args.latency, fixtures=args.fixtures) as stub:
+        for name in args.only or BENCHMARKS:
+            print(f"running {name}...", file=sys.stderr)
+            results["results"][name] = BENCHMARKS[name](stub, args.quick, args.scale)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        for line in compare(results, baseline):
+            print(line, file=sys.stderr)
+
+
+
+if __name__ == "__main__":
+    main()
@@ -36,24 +36,164 @@ view(results)
 results = lcsc.get_search_results("L7805CV", sort_by="stock")
 view(results)
 ```
+- *Reusing pooled connections across many lookups*
+```python
+with lcsc.LCSCClient(pool_size=20, timeout=10) as client:
+    details = [client.get_product_details(code) for code in ("C111887", "C3795")]
+```
+- *Running many lookups concurrently from asyncio (requires `pip install "lcsc[async]"`)*
+```python
+async with lcsc.AsyncLCSCClient(concurrency=200) as client:
+    details = await asyncio.gather(*(client.get_product_details(code) for code in codes))
+```
+- *Fetching many products concurrently*
+```python
+results = lcsc.get_product_details_many(["C111887", "C3795"], max_workers=16)
+```
+- *Walking every page of the search results*
+```python
+for result in lcsc.iter_search_results("L7805CV", min_stock=1000, limit=250):
+    print(result.product_details.product_code)
+```
+- *Caching responses on disk across runs and processes*
+```python
+lcsc.set_default_client(lcsc.LCSCClient(cache=lcsc.ResponseCache("lcsc-cache.sqlite3")))
+details = lcsc.get_product_details("C111887")                   # network, then cached
+details = lcsc.get_product_details("C111887", cache="only")     # disk only, never the network
+details = lcsc.get_product_details("C111887", cache="refresh")  # network, cache updated
+```
+- *Keeping static product data in memory while refreshing stock and price often*
+```python
+client = lcsc.LCSCClient(product_cache=lcsc.ProductCache(static_ttl=6 * 3600, volatile_ttl=60))
+details = client.get_product_details("C111887")
+print(client.product_cache.stats())
+```
+- *Pricing a BOM (rows or a CSV with `lcsc_code` and `quantity` columns)*
+```python
+quote = lcsc.quote_bom([("C111887", 120), ("C3795", 7)])
+print(quote.total_cost, [line.lcsc_code for line in quote.shortfalls])
+quote = lcsc.quote_bom("bom.csv")
+```
+- *Searching locally held products offline*
+```python
+index = lcsc.ProductIndex(lcsc.iter_search_results("L7805", limit=500))
+results = index.search("7805 to-220", min_stock=1000, sort_by="price")
+results = index.search(ranges={"param_10953_n": (9.9e3, 10.1e3), "param_10954": (None, 1)})  # 9.9k-10.1kΩ, tolerance ≤ 1%
+index.save("products.idx")
+```
+- *Streaming a large snapshot to NDJSON, CSV or Parquet (Parquet/Arrow require `pip install "lcsc[arrow]"`)*
+```python
+lcsc.write_ndjson(lcsc.iter_search_results("resistor"), "resistors.ndjson")
+lcsc.write_csv(lcsc.iter_search_results("resistor"), "resistors.csv", spec_codes=["param_10953_n"])
+lcsc.write_parquet(lcsc.iter_search_results("resistor"), "resistors.parquet", batch_size=10_000)
+```
+- *Decoding faster and holding less memory in bulk jobs (`pip install "lcsc[fast]"` adds `orjson`)*
+```python
+client = lcsc.LCSCClient(keep_raw=False)  # details drop the parts of the payload they never read; `view_raw()` is unavailable
+results = list(client.iter_search_results("resistor", limit=10_000))
+```
+- *Sharing one request between concurrent lookups of the same part (on by default)*
+```python
+client = lcsc.LCSCClient()  # pass coalesce=False to disable
+with concurrent.futures.ThreadPoolExecutor(50) as pool:
+    details = list(pool.map(client.get_product_details, ["C111887"] * 50))
+print(client.deduplicated)  # calls served by another thread's in-flight request
+```
+- *Throttling and retrying (retries on 429/5xx with jittered backoff are on by default)*
+```python
+limiter = lcsc.TokenBucket(rate=20, burst=40)                       # shared by every thread of the client
+limiter = lcsc.SQLiteTokenBucket("limits.sqlite3", rate=20)         # ...or by every process using the file
+client = lcsc.LCSCClient(rate_limiter=limiter, retry=lcsc.RetryPolicy(max_retries=5, backoff=1.0))
+```
+- *Measuring where time goes, and exporting it to Prometheus*
+```python
+metrics = lcsc.Metrics()
+metrics.on_request_end(lambda endpoint, params, status, seconds, size, error: print(endpoint, status, f"{seconds:.3f}s"))
+client = lcsc.LCSCClient(metrics=metrics)
+details = client.get_product_details("C111887")
+print(metrics.snapshot()["endpoints"])
+print(metrics.render_prometheus())
+```
+- *Recording traffic to a cassette, and replaying it offline (no network, no sleeps)*
+```python
+with lcsc.RecordingTransport("traffic.cassette") as transport:
+    quote = lcsc.quote_bom("bom.csv", client=lcsc.LCSCClient(transport=transport))
+client = lcsc.LCSCClient(transport=lcsc.ReplayTransport("traffic.cassette"))
+quote = lcsc.quote_bom("bom.csv", client=client)  # served from the memory-mapped cassette
+```
+- *Using the `lcsc` command (one JSON line per result, streamed as results arrive)*
+```bash
+lcsc detail C111887 C3795
+cut -d, -f1 bom.csv | lcsc detail --workers 32 > parts.ndjson   # codes from stdin, resolved concurrently
+lcsc search L7805CV --min-stock 1000 --sort price --limit 10
+```
+- *Mirroring whole catalogs with a resumable, multiprocess crawl*
+```python
+crawler = lcsc.Crawler("mirror.sqlite3", processes=4, concurrency=4, rate=20)
+crawler.discover(["resistor", "capacitor"])  # or crawler.add_catalogs([details.catalog, ...])
+print(crawler.run())                          # interrupted? run() again resumes from the last committed page
+lcsc.write_parquet(crawler.iter_products(), "mirror.parquet")
+```
+- *Tracking stock and price history in a compact store of changes only*
+```python
+history = lcsc.HistoryStore("history.sqlite3")
+history.record(lcsc.get_product_details_many(codes).values())  # e.g. every few hours; unchanged parts cost nothing
+history.history("C111887", since=time.time() - 7 * 86400)       # {"stock": [(t, stock), ...], "price": [(t, {qty: usd}), ...]}
+history.changed_since(time.time() - 86400, "price")             # codes whose price ladder changed in the last day
+```
+- *Watching parts for restocks and price changes, polling volatile parts more often*
+```python
+watcher = lcsc.StockWatcher(codes, rate=2, min_interval=60, max_interval=6 * 3600)
+async for event in watcher.events():  # or StockWatcher(..., callback=print).run()
+    if event.kind == "in_stock":
+        print(event.product_code, event.old, "->", event.new)
+```
+- *Downloading datasheets and images into a deduplicated, resumable file store*
+```python
+downloader = lcsc.Downloader("files", max_workers=8)
+files = downloader.download_products(lcsc.get_product_details_many(codes).values())
+print(files["C111887"][0].path)  # files/objects/<sha256[:2]>/<sha256>, shared by every URL with that content
+```
 """
-import requests
+from typing import Iterable, Iterator
 from .types import ProductDetails, SearchResult
-__version__ = "1.3.1"
-
+from .client import LCSCClient, get_default_client, set_default_client
+from .errors import LCSCError, CacheMissError, LCSCHTTPError, LCSCResponseError
+from .ratelimit import TokenBucket, SQLiteTokenBucket, RetryPolicy
+from .metrics import Metrics
+from .transport import Transport, HTTPTransport, RecordingTransport, ReplayTransport
+__version__ = "1.4.0"
 
-_HEADERS = {
-    "accept-language": "en-US,en;q=0.9",
-    "accept": "application/json, text/plain, */*",
-    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36",
+# The asyncio API and the optional subsystems are only imported on first use, so that programs (and the `lcsc`
+# command) don't pay for importing `asyncio`, `sqlite3`, `multiprocessing` and modules they never touch.
+_LAZY_NAMES = {
+    "AsyncLCSCClient": "aio", "get_default_async_client": "aio", "set_default_async_client": "aio", "aclose_default_client": "aio", "get_product_details_async": "aio", "get_search_results_async": "aio",
+    "ResponseCache": "cache", "ProductCache": "cache",
+    "BomQuote": "bom", "BomLineQuote": "bom", "quote_bom": "bom", "read_bom_csv": "bom",
+    "ProductIndex": "index", "SpecRangeIndex": "index",
+    "flatten_product": "export", "write_ndjson": "export", "write_csv": "export", "write_parquet": "export", "write_arrow": "export",
+    "Crawler": "crawler",
+    "HistoryStore": "history",
+    "StockWatcher": "watch", "WatchEvent": "watch",
+    "Downloader": "download", "Download": "download",
 }
 
+
+
+def __getattr__(name: str):
+    module = _LAZY_NAMES.get(name)
+    if module is not None:
+        from importlib import import_module
+        return getattr(import_module(f".{module}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+
 def _request(url: str, params: dict, method: str = "GET", payload: dict | None = None):
     """
-    Private wrapper around `request.request()`.
+    Private wrapper around `LCSCClient._request()`, using the shared default client.
     """
-    response = requests.request(method=method, url=url, params=params, headers=_HEADERS, data=payload)
-    return response
+    return get_default_client()._request(url, params, method, payload)
 
 
 
@@ -69,12 +209,13 @@ def view(data: list | dict):
 
 
 
-def get_product_details(lcsc_part_number: str) -> ProductDetails:
+def get_product_details(lcsc_part_number: str, cache: str = "default") -> ProductDetails:
     """
     Get details for a product with a specific LCSC part #.
 
     ## Parameters
     - `lcsc_part_number` ( *str* ) - The part number on the product's page, under the `LCSC Part #` label.
+    - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`); only has an effect if the default client has a `ResponseCache`.
 
     ## Returns
     - `product_details` ( *ProductDetails* ) - Dataclass object containing the product's details.
@@ -86,15 +227,58 @@ def get_product_details(lcsc_part_number: str) -> ProductDetails:
     >>> details.view()
     ```
     """
-    response = _request("https://wmsc.lcsc.com/ftps/wm/product/detail", {
-        "productCode": lcsc_part_number,
-    })
-    raw_data = response.json()["result"]
-    return ProductDetails(raw_data)
+    return get_default_client().get_product_details(lcsc_part_number, cache)
 
 
 
-def get_search_results(keyword: str, min_stock: int = 500, sort_by: str = "stock") -> list[SearchResult]:
+def get_product_details_many(lcsc_part_numbers: Iterable[str], max_workers: int | None = None, cache: str = "default") -> dict[str, ProductDetails | Exception]:
+    """
+    Get details for many products concurrently.
+
+    Repeated part numbers are only requested once, and a failed lookup does not abort the batch.
+
+    ## Parameters
+    - `lcsc_part_numbers` ( *Iterable[str]* ) - The LCSC part numbers to look up.
+    - `max_workers` ( *int*, *optional* ) - Number of worker threads. Defaults to the client's `pool_size`.
+    - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+
+    ## Returns
+    - `results` ( *dict[str, ProductDetails | Exception]* ) - Maps each part number, in input order, to its details or to the exception raised while fetching it.
+
+    ## Example
+    ```python
+    >>> results = lcsc.get_product_details_many(["C111887", "C3795", "C111887"], max_workers=16)
+    >>> failed = [code for code, r in results.items() if isinstance(r, Exception)]
+    ```
+    """
+    return get_default_client().get_product_details_many(lcsc_part_numbers, max_workers, cache)
+
+
+
+def iter_product_details(lcsc_part_numbers: Iterable[str], max_workers: int | None = None, cache: str = "default") -> Iterator[tuple[str, ProductDetails | Exception]]:
+    """
+    Get details for many products concurrently, yielding each one as soon as its request completes.
+
+    ## Parameters
+    - `lcsc_part_numbers` ( *Iterable[str]* ) - The LCSC part numbers to look up. Duplicates are only requested once.
+    - `max_workers` ( *int*, *optional* ) - Number of worker threads. Defaults to the client's `pool_size`.
+    - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+
+    ## Yields
+    - `(lcsc_part_number, result)` ( *tuple[str, ProductDetails | Exception]* ) - In completion order; `result` is the exception if the lookup failed.
+
+    ## Example
+    ```python
+    >>> for code, details in lcsc.iter_product_details(codes):
+    ...     if not isinstance(details, Exception):
+    ...         print(code, details.stock)
+    ```
+    """
+    return get_default_client().iter_product_details(lcsc_part_numbers, max_workers, cache)
+
+
+
+def get_search_results(keyword: str, min_stock: int = 500, sort_by: str = "stock", cache: str = "default", limit: int | None = None) -> list[SearchResult]:
     """
     Get search results for a specific search query/keyword.
 
@@ -103,7 +287,9 @@ def get_search_results(keyword: str, min_stock: int = 500, sort_by: str = "stock
     ## Parameters
     - `keyword` ( *str* ) - The search query.
     - `min_stock` ( *int*, *optional* ) - Limit results to only products with at least the specified quantity. Pass `None` to disable.
-    - `sort_by` ( *str*, *optional* ) - Return the list sorted by either quantity in stock (`stock`) or by base-price (`price`).
+    - `sort_by` ( *str*, *optional* ) - Return the list sorted by either quantity in stock (`stock`) or by base-price (`price`). Anything else raises `ValueError`.
+    - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+    - `limit` ( *int*, *optional* ) - Return only the first `limit` results of the sorted list; only those are built into objects.
 
     ## Example
     ```python
@@ -111,27 +297,32 @@ def get_search_results(keyword: str, min_stock: int = 500, sort_by: str = "stock
     >>> results = lcsc.get_search_results("L7805CV")
     >>> results = lcsc.get_search_results("L7805CV", min_stock=1000)
     >>> results = lcsc.get_search_results("L7805CV", sort_by="price")
+    >>> cheapest = lcsc.get_search_results("L7805CV", sort_by="price", limit=5)
     >>> view(results)
     ```
     """
-    if sort_by.lower() not in ["stock", "price"]:
-        print(f"Invalid `sort_by` parameter given.")
-        return
-    response = _request("https://wmsc.lcsc.com/ftps/wm/search/global", {
-        "keyword": keyword,
-        "currentPage": 1,
-        "pageSize": 100,
-        "searchType": "product",
-    })
-    raw_data = response.json()["result"]
-    product_list = raw_data["productSearchResultVO"]["productList"]
-    results = []
-    for i, data in enumerate(product_list):
-        product_details = ProductDetails(data)
-        if min_stock is None or product_details.stock >= min_stock:
-            results.append(SearchResult(i, data["url"], bool(data["isDiscount"]), product_details))
-    if sort_by.lower() == "stock":
-        results.sort(key=lambda x: x.product_details.stock, reverse=True)
-    elif sort_by.lower() == "price":
-        results.sort(key=lambda x: x.product_details.price[list(x.product_details.price.keys())[0]].price)
-    return results
+    return get_default_client().get_search_results(keyword, min_stock, sort_by, cache, limit)
+
+
+
+def iter_search_results(keyword: str, min_stock: int | None = None, page_size: int = 100, limit: int | None = None, prefetch: bool = True, cache: str = "default") -> Iterator[SearchResult]:
+    """
+    Lazily walk every page of the search results for a keyword, yielding each result as its page arrives.
+
+    Unlike `get_search_results`, this is not limited to the first 100 hits and does not sort; results come in the API's order.
+
+    ## Parameters
+    - `keyword` ( *str* ) - The search query.
+    - `min_stock` ( *int*, *optional* ) - Skip products with less than the specified quantity in stock.
+    - `page_size` ( *int*, *optional* ) - Number of hits requested per page.
+    - `limit` ( *int*, *optional* ) - Stop after yielding this many results.
+    - `prefetch` ( *bool*, *optional* ) - Request the next page in the background while the current one is being consumed.
+    - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+
+    ## Example
+    ```python
+    >>> for result in lcsc.iter_search_results("L7805CV", min_stock=1000, limit=250):
+    ...     print(result.product_details.product_code)
+    ```
+    """
+    return get_default_client().iter_search_results(keyword, min_stock, page_size, limit, prefetch, cache)
@@ -36,10 +36,148 @@ view(results)
 results = lcsc.get_search_results("L7805CV", sort_by="stock")
 view(results)
 ```
+- *Reusing pooled connections across many lookups*
+```python
+with lcsc.LCSCClient(pool_size=20, timeout=10) as client:
+    details = [client.get_product_details(code) for code in ("C111887", "C3795")]
+```
+- *Running many lookups concurrently from asyncio (requires `pip install "lcsc[async]"`)*
+```python
+async with lcsc.AsyncLCSCClient(concurrency=200) as client:
+    details = await asyncio.gather(*(client.get_product_details(code) for code in codes))
+```
+- *Fetching many products concurrently*
+```python
+results = lcsc.get_product_details_many(["C111887", "C3795"], max_workers=16)
+```
+- *Walking every page of the search results*
+```python
+for result in lcsc.iter_search_results("L7805CV", min_stock=1000, limit=250):
+    print(result.product_details.product_code)
+```
+- *Caching responses on disk across runs and processes*
+```python
+lcsc.set_default_client(lcsc.LCSCClient(cache=lcsc.ResponseCache("lcsc-cache.sqlite3")))
+details = lcsc.get_product_details("C111887")                   # network, then cached
+details = lcsc.get_product_details("C111887", cache="only")     # disk only, never the network
+details = lcsc.get_product_details("C111887", cache="refresh")  # network, cache updated
+```
+- *Keeping static product data in memory while refreshing stock and price often*
+```python
+client = lcsc.LCSCClient(product_cache=lcsc.ProductCache(static_ttl=6 * 3600, volatile_ttl=60))
+details = client.get_product_details("C111887")
+print(client.product_cache.stats())
+```
+- *Pricing a BOM (rows or a CSV with `lcsc_code` and `quantity` columns)*
+```python
+quote = lcsc.quote_bom([("C111887", 120), ("C3795", 7)])
+print(quote.total_cost, [line.lcsc_code for line in quote.shortfalls])
+quote = lcsc.quote_bom("bom.csv")
+```
+- *Searching locally held products offline*
+```python
+index = lcsc.ProductIndex(lcsc.iter_search_results("L7805", limit=500))
+results = index.search("7805 to-220", min_stock=1000, sort_by="price")
+results = index.search(ranges={"param_10953_n": (9.9e3, 10.1e3), "param_10954": (None, 1)})  # 9.9k-10.1kΩ, tolerance ≤ 1%
+index.save("products.idx")
+```
+- *Streaming a large snapshot to NDJSON, CSV or Parquet (Parquet/Arrow require `pip install "lcsc[arrow]"`)*
+```python
+lcsc.write_ndjson(lcsc.iter_search_results("resistor"), "resistors.ndjson")
+lcsc.write_csv(lcsc.iter_search_results("resistor"), "resistors.csv", spec_codes=["param_10953_n"])
+lcsc.write_parquet(lcsc.iter_search_results("resistor"), "resistors.parquet", batch_size=10_000)
+```
+- *Decoding faster and holding less memory in bulk jobs (`pip install "lcsc[fast]"` adds `orjson`)*
+```python
+client = lcsc.LCSCClient(keep_raw=False)  # details drop the parts of the payload they never read; `view_raw()` is unavailable
+results = list(client.iter_search_results("resistor", limit=10_000))
+```
+- *Sharing one request between concurrent lookups of the same part (on by default)*
+```python
+client = lcsc.LCSCClient()  # pass coalesce=False to disable
+with concurrent.futures.ThreadPoolExecutor(50) as pool:
+    details = list(pool.map(client.get_product_details, ["C111887"] * 50))
+print(client.deduplicated)  # calls served by another thread's in-flight request
+```
+- *Throttling and retrying (retries on 429/5xx with jittered backoff are on by default)*
+```python
+limiter = lcsc.TokenBucket(rate=20, burst=40)                       # shared by every thread of the client
+limiter = lcsc.SQLiteTokenBucket("limits.sqlite3", rate=20)         # ...or by every process using the file
+client = lcsc.LCSCClient(rate_limiter=limiter, retry=lcsc.RetryPolicy(max_retries=5, backoff=1.0))
+```
+- *Measuring where time goes, and exporting it to Prometheus*
+```python
+metrics = lcsc.Metrics()
+metrics.on_request_end(lambda endpoint, params, status, seconds, size, error: print(endpoint, status, f"{seconds:.3f}s"))
+client = lcsc.LCSCClient(metrics=metrics)
+details = client.get_product_details("C111887")
+print(metrics.snapshot()["endpoints"])
+print(metrics.render_prometheus())
+```
+- *Recording traffic to a cassette, and replaying it offline (no network, no sleeps)*
+```python
+with lcsc.RecordingTransport("traffic.cassette") as transport:
+    quote = lcsc.quote_bom("bom.csv", client=lcsc.LCSCClient(transport=transport))
+client = lcsc.LCSCClient(transport=lcsc.ReplayTransport("traffic.cassette"))
+quote = lcsc.quote_bom("bom.csv", client=client)  # served from the memory-mapped cassette
+```
+- *Using the `lcsc` command (one JSON line per result, streamed as results arrive)*
+```bash
+lcsc detail C111887 C3795
+cut -d, -f1 bom.csv | lcsc detail --workers 32 > parts.ndjson   # codes from stdin, resolved concurrently
+lcsc search L7805CV --min-stock 1000 --sort price --limit 10
+```
+- *Mirroring whole catalogs with a resumable, multiprocess crawl*
+```python
+crawler = lcsc.Crawler("mirror.sqlite3", processes=4, concurrency=4, rate=20)
+crawler.discover(["resistor", "capacitor"])  # or crawler.add_catalogs([details.catalog, ...])
+print(crawler.run())                          # interrupted? run() again resumes from the last committed page
+lcsc.write_parquet(crawler.iter_products(), "mirror.parquet")
+```
+- *Tracking stock and price history in a compact store of changes only*
+```python
+history = lcsc.HistoryStore("history.sqlite3")
+history.record(lcsc.get_product_details_many(codes).values())  # e.g. every few hours; unchanged parts cost nothing
+history.history("C111887", since=time.time() - 7 * 86400)       # {"stock": [(t, stock), ...], "price": [(t, {qty: usd}), ...]}
+history.changed_since(time.time() - 86400, "price")             # codes whose price ladder changed in the last day
+```
+- *Watching parts for restocks and price changes, polling volatile parts more often*
+```python
+watcher = lcsc.StockWatcher(codes, rate=2, min_interval=60, max_interval=6 * 3600)
+async for event in watcher.events():  # or StockWatcher(..., callback=print).run()
+    if event.kind == "in_stock":
+        print(event.product_code, event.old, "->", event.new)
+```
+- *Downloading datasheets and images into a deduplicated, resumable file store*
+```python
+downloader = lcsc.Downloader("files", max_workers=8)
+files = downloader.download_products(lcsc.get_product_details_many(codes).values())
+print(files["C111887"][0].path)  # files/objects/<sha256[:2]>/<sha256>, shared by every URL with that content
+```
 """
+from typing import Iterable, Iterator
 from .types import ProductDetails, SearchResult
-__all__ = ["view", "get_product_details", "get_search_results", "__version__"]
+from .client import LCSCClient, get_default_client, set_default_client
+from .aio import AsyncLCSCClient, get_default_async_client, set_default_async_client, aclose_default_client
+from .cache import ResponseCache, ProductCache
+from .errors import LCSCError, CacheMissError, LCSCHTTPError, LCSCResponseError
+from .ratelimit import TokenBucket, SQLiteTokenBucket, RetryPolicy
+from .metrics import Metrics
+from .transport import Transport, HTTPTransport, RecordingTransport, ReplayTransport
+from .bom import BomQuote, BomLineQuote, quote_bom, read_bom_csv
+from .index import ProductIndex, SpecRangeIndex
+from .export import flatten_product, write_ndjson, write_csv, write_parquet, write_arrow
+from .crawler import Crawler
+from .history import HistoryStore
+from .watch import StockWatcher, WatchEvent
+from .download import Downloader, Download
+__all__ = ["view", "get_product_details", "get_product_details_many", "iter_product_details", "get_search_results", "iter_search_results", "LCSCClient", "get_default_client", "set_default_client", "AsyncLCSCClient", "get_default_async_client", "set_default_async_client", "aclose_default_client", "ResponseCache", "ProductCache", "LCSCError", "CacheMissError", "LCSCHTTPError", "LCSCResponseError", "TokenBucket", "SQLiteTokenBucket", "RetryPolicy", "Metrics", "Transport", "HTTPTransport", "RecordingTransport", "ReplayTransport", "BomQuote", "BomLineQuote", "quote_bom", "read_bom_csv", "ProductIndex", "SpecRangeIndex", "flatten_product", "write_ndjson", "write_csv", "write_parquet", "write_arrow", "Crawler", "HistoryStore", "StockWatcher", "WatchEvent", "Downloader", "Download", "get_product_details_async", "get_search_results_async", "__version__"]
 
 def view(data: list | dict) -> None: ...
-def get_product_details(lcsc_part_number: str) -> "ProductDetails": ...
-def get_search_results(keyword: str, min_stock: int = 500, sort_by: str = "stock") -> list["SearchResult"]: ...
+def get_product_details(lcsc_part_number: str, cache: str = "default") -> "ProductDetails": ...
+def get_product_details_many(lcsc_part_numbers: Iterable[str], max_workers: int | None = None, cache: str = "default") -> dict[str, "ProductDetails" | Exception]: ...
+def iter_product_details(lcsc_part_numbers: Iterable[str], max_workers: int | None = None, cache: str = "default") -> Iterator[tuple[str, "ProductDetails" | Exception]]: ...
+def get_search_results(keyword: str, min_stock: int = 500, sort_by: str = "stock", cache: str = "default", limit: int | None = None) -> list["SearchResult"]: ...
+def iter_search_results(keyword: str, min_stock: int | None = None, page_size: int = 100, limit: int | None = None, prefetch: bool = True, cache: str = "default") -> Iterator["SearchResult"]: ...
+async def get_product_details_async(lcsc_part_number: str, client: AsyncLCSCClient | None = None) -> "ProductDetails": ...
+async def get_search_results_async(keyword: str, min_stock: int = 500, sort_by: str = "stock", client: AsyncLCSCClient | None = None, limit: int | None = None) -> list["SearchResult"]: ...
@@ -0,0 +1,11 @@
+"""
+src/lcsc/__main__.py
+
+Runs the `lcsc` command-line tool (`python -m lcsc ...`).
+"""
+import sys
+from .cli import main
+
+
+
+sys.exit(main())
@@ -0,0 +1,18 @@
+"""
+src/lcsc/_json.py
+
+JSON decoding for API response bodies, using the fastest parser that is installed.
+
+`loads(body)` takes `bytes` or `str` and is `orjson.loads` if `orjson` is installed, else `msgspec.json.decode`
+if `msgspec` is, else the standard library's `json.loads`. `backend` names the parser in use.
+"""
+try:
+    from orjson import loads
+    backend = "orjson"
+except ImportError:
+    try:
+        from msgspec.json import decode as loads
+        backend = "msgspec"
+    except ImportError:
+        from json import loads
+        backend = "json"
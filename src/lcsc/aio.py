@@ -0,0 +1,380 @@
+"""
+src/lcsc/aio.py
+
+Asyncio client for the `lcsc` package. Requires the optional `aiohttp` dependency (`pip install "lcsc[async]"`).
+"""
+import asyncio
+import atexit
+import time
+from typing import TYPE_CHECKING
+from .client import _BASE_URL, _HEADERS, _PRODUCT_DETAIL_PATH, _SEARCH_PATH, _build_search_results, _check_cache_mode, _decode_result, _flight_key, _search_params
+from .errors import CacheMissError, LCSCHTTPError, LCSCResponseError
+from .metrics import Metrics
+from .ratelimit import RetryPolicy, TokenBucket, _is_throttled
+from .singleflight import AsyncSingleFlight
+from .types import ProductDetails, SearchResult
+if TYPE_CHECKING:
+    from .cache import ResponseCache
+
+
+
+class AsyncLCSCClient:
+    """
+    Asyncio client for LCSC's API.
+
+    All requests share one `aiohttp.ClientSession` (and therefore one connection pool), and at most
+    `concurrency` requests are in flight at any time; extra calls wait on a semaphore. A client can be used from
+    several event loops in turn (e.g. successive `asyncio.run()` calls); it opens a new session in each.
+
+    Calls into a `cache` (and into a rate limiter other than an in-memory `TokenBucket`, such as a `SQLiteTokenBucket`)
+    run in a worker thread, so that disk I/O and lock waits don't block the event loop.
+
+    ## Parameters
+    - `headers` ( *dict*, *optional* ) - Extra headers to send with every request. Merged over the default headers.
+    - `timeout` ( *float*, *optional* ) - Total timeout for a single request, in seconds. Pass `None` to disable.
+    - `concurrency` ( *int*, *optional* ) - Maximum number of requests in flight at once.
+    - `pool_size` ( *int*, *optional* ) - Maximum number of open connections. Defaults to `concurrency`.
+    - `base_url` ( *str*, *optional* ) - Root URL of the API.
+    - `cache` ( *ResponseCache*, *optional* ) - Persistent cache for raw API responses (see: `LCSCClient` for the cache modes).
+    - `keep_raw` ( *bool*, *optional* ) - Whether returned `ProductDetails` keep the full raw payload (see: `ProductDetails`).
+    - `coalesce` ( *bool*, *optional* ) - Share one network request between coroutines asking for the same URL and parameters at the same time (see: `deduplicated`).
+    - `rate_limiter` ( *TokenBucket*, *optional* ) - Limits the request rate; may be shared with threaded clients and (as a `SQLiteTokenBucket`) other processes.
+    - `retry` ( *RetryPolicy*, *optional* ) - When and how long to back off before retrying failed requests. Pass `None` to disable retries.
+    - `metrics` ( *Metrics*, *optional* ) - Records latencies, sizes, retries, decode/build times and cache lookups, and runs request hooks.
+    - `search_hints` ( *dict*, *optional* ) - Extra query parameters sent with every search request (see: `LCSCClient.search_hints`).
+
+    ## Example
+    ```python
+    >>> async with lcsc.AsyncLCSCClient(concurrency=200) as client:
+    ...     details = await asyncio.gather(*(client.get_product_details(c) for c in codes))
+    ```
+    """
+    def __init__(self, headers: dict | None = None, timeout: float | None = 30.0, concurrency: int = 100, pool_size: int | None = None, base_url: str = _BASE_URL, cache: "ResponseCache | None" = None, keep_raw: bool = True, coalesce: bool = True, rate_limiter: TokenBucket | None = None, retry: RetryPolicy | None = RetryPolicy(), metrics: Metrics | None = None, search_hints: dict | None = None) -> None:
+        self._headers = dict(_HEADERS)
+        if headers:
+            self._headers.update(headers)
+        self._timeout = timeout
+        self._concurrency = concurrency
+        self._pool_size = concurrency if pool_size is None else pool_size
+        self._base_url = base_url.rstrip("/")
+        self._cache = cache
+        self._keep_raw = keep_raw
+        self._flight = AsyncSingleFlight() if coalesce else None
+        self._rate_limiter = rate_limiter
+        # Only the in-memory bucket is cheap enough to call from the event loop.
+        self._limiter_blocks = rate_limiter is not None and type(rate_limiter).reserve is not TokenBucket.reserve
+        self._retry = retry
+        self._metrics = metrics
+        self._search_hints = dict(search_hints) if search_hints else None
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session = None
+        self._loop = None
+
+    async def __aenter__(self) -> "AsyncLCSCClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """
+        The headers sent with every request made by this client.
+        """
+        return self._headers
+
+    @property
+    def concurrency(self) -> int:
+        """
+        The maximum number of requests in flight at once.
+        """
+        return self._concurrency
+
+    @property
+    def base_url(self) -> str:
+        """
+        The root URL of the API (e.g. `https://wmsc.lcsc.com`).
+        """
+        return self._base_url
+
+    @property
+    def keep_raw(self) -> bool:
+        """
+        Whether returned `ProductDetails` keep the full raw payload.
+        """
+        return self._keep_raw
+
+    @property
+    def rate_limiter(self) -> TokenBucket | None:
+        """
+        The rate limiter applied to every request made through this client, if any.
+        """
+        return self._rate_limiter
+
+    @property
+    def retry(self) -> RetryPolicy | None:
+        """
+        The retry policy for failed requests, if any.
+        """
+        return self._retry
+
+    @property
+    def metrics(self) -> Metrics | None:
+        """
+        The metrics recorder used by this client, if any.
+        """
+        return self._metrics
+
+    @property
+    def search_hints(self) -> dict | None:
+        """
+        Extra query parameters sent with every search request, if any.
+        """
+        return self._search_hints
+
+    @property
+    def deduplicated(self) -> int:
+        """
+        Number of calls that were served by another coroutine's identical in-flight request instead of making their own.
+        """
+        return self._flight.deduplicated if self._flight is not None else 0
+
+    async def close(self) -> None:
+        """
+        Closes the underlying session and all of its pooled connections.
+        """
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    def _get_session(self):
+        """
+        Returns the underlying `aiohttp.ClientSession`, creating it on first use in the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # The session and semaphore belong to the loop they were created in; start over in this one.
+            self._loop = loop
+            self._session = None
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        if self._session is None:
+            import aiohttp
+            self._session = aiohttp.ClientSession(
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+                connector=aiohttp.TCPConnector(limit=self._pool_size),
+            )
+        return self._session
+
+    async def _get_result(self, path: str, params: dict, cache: str = "default") -> dict:
+        """
+        Requests an API endpoint and returns the decoded `result` member of its JSON body, going through the response cache if there is one.
+        """
+        if self._cache is not None and cache != "refresh":
+            result = await asyncio.to_thread(self._cache.get, path, params)
+            if self._metrics is not None:
+                self._metrics.observe_cache("response", "miss" if result is None else "hit")
+            if result is not None:
+                return result
+        if cache == "only":
+            raise CacheMissError(f"No cached response for {path} with parameters {params}.")
+        if self._flight is not None:
+            return await self._flight.do(_flight_key(self._base_url + path, params), self._fetch_result, path, params)
+        return await self._fetch_result(path, params)
+
+    async def _fetch_result(self, path: str, params: dict) -> dict:
+        """
+        Requests an API endpoint over the network and stores the decoded `result` in the response cache, if there is one.
+        """
+        import aiohttp
+        session = self._get_session()
+        url = self._base_url + path
+        metrics = self._metrics
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                wait = await asyncio.to_thread(self._rate_limiter.reserve) if self._limiter_blocks else self._rate_limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            try:
+                async with self._semaphore:
+                    if metrics is not None:
+                        metrics.request_started(path, params)
+                        started = time.perf_counter()
+                    try:
+                        async with session.get(url, params={k: str(v) for k, v in params.items()}) as response:
+                            body = await response.read()
+                    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                        if metrics is not None:
+                            metrics.request_finished(path, params, None, time.perf_counter() - started, 0, e)
+                        raise
+                if metrics is None:
+                    result = _decode_result(response.status, body, url, response.headers.get("Retry-After"))
+                else:
+                    received = time.perf_counter()
+                    metrics.request_finished(path, params, response.status, received - started, len(body))
+                    result = _decode_result(response.status, body, url, response.headers.get("Retry-After"))
+                    metrics.observe_decode(path, time.perf_counter() - received)
+                break
+            except (LCSCHTTPError, LCSCResponseError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                delay = self._retry.get_delay("GET", e, attempt) if self._retry is not None else None
+                if delay is None:
+                    raise
+                if metrics is not None:
+                    metrics.observe_retry(path)
+                if self._rate_limiter is not None and _is_throttled(e):
+                    # The next acquire waits out the pause, together with every other caller.
+                    if self._limiter_blocks:
+                        await asyncio.to_thread(self._rate_limiter.pause, delay)
+                    else:
+                        self._rate_limiter.pause(delay)
+                else:
+                    await asyncio.sleep(delay)
+                attempt += 1
+        if self._cache is not None:
+            await asyncio.to_thread(self._cache.set, path, params, result)
+        return result
+
+    async def get_product_details(self, lcsc_part_number: str, cache: str = "default") -> ProductDetails:
+        """
+        Get details for a product with a specific LCSC part #.
+
+        ## Parameters
+        - `lcsc_part_number` ( *str* ) - The part number on the product's page, under the `LCSC Part #` label.
+        - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+
+        ## Returns
+        - `product_details` ( *ProductDetails* ) - Dataclass object containing the product's details.
+        """
+        _check_cache_mode(cache)
+        raw_data = await self._get_result(_PRODUCT_DETAIL_PATH, {
+            "productCode": lcsc_part_number,
+        }, cache)
+        if self._metrics is None:
+            return ProductDetails(raw_data, self._keep_raw)
+        started = time.perf_counter()
+        details = ProductDetails(raw_data, self._keep_raw)
+        self._metrics.observe_build(_PRODUCT_DETAIL_PATH, time.perf_counter() - started)
+        return details
+
+    async def get_search_results(self, keyword: str, min_stock: int = 500, sort_by: str = "stock", cache: str = "default", limit: int | None = None) -> list[SearchResult]:
+        """
+        Get search results for a specific search query/keyword.
+
+        ## Parameters
+        - `keyword` ( *str* ) - The search query.
+        - `min_stock` ( *int*, *optional* ) - Limit results to only products with at least the specified quantity. Pass `None` to disable.
+        - `sort_by` ( *str*, *optional* ) - Return the list sorted by either quantity in stock (`stock`) or by base-price (`price`). Anything else raises `ValueError`.
+        - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+        - `limit` ( *int*, *optional* ) - Return only the first `limit` results of the sorted list; only those are built into objects.
+        """
+        _check_cache_mode(cache)
+        if sort_by.lower() not in ["stock", "price"]:
+            raise ValueError(f"Invalid `sort_by` parameter {sort_by!r}.")
+        raw_data = await self._get_result(_SEARCH_PATH, _search_params(keyword, 1, 100, self._search_hints), cache)
+        if self._metrics is None:
+            return _build_search_results(raw_data, min_stock, sort_by, self._keep_raw, limit)
+        started = time.perf_counter()
+        results = _build_search_results(raw_data, min_stock, sort_by, self._keep_raw, limit)
+        self._metrics.observe_build(_SEARCH_PATH, time.perf_counter() - started, len(results))
+        return results
+
+
+
+_default_client: AsyncLCSCClient | None = None
+_exit_hook_registered = False
+
+def get_default_async_client() -> AsyncLCSCClient:
+    """
+    Returns the shared client used by the module-level async functions, creating it on first use.
+
+    Its session belongs to the event loop it was opened in, and a new one is opened in the next loop that uses the
+    client. Close it with `aclose_default_client()` before that loop is closed. A session left open in a loop
+    that is still open at interpreter exit is closed then.
+    """
+    global _default_client, _exit_hook_registered
+    if _default_client is None:
+        _default_client = AsyncLCSCClient()
+    if not _exit_hook_registered:
+        _exit_hook_registered = True
+        atexit.register(_close_default_client_at_exit)
+    return _default_client
+
+
+
+def set_default_async_client(client: AsyncLCSCClient | None) -> None:
+    """
+    Replaces the shared client used by the module-level async functions (e.g. to add a cache, a rate limiter, or change the concurrency).
+
+    ## Parameters
+    - `client` ( *AsyncLCSCClient | None* ) - The client to use from now on. `None` creates a new default client on next use.
+    """
+    global _default_client
+    _default_client = client
+
+
+
+async def aclose_default_client() -> None:
+    """
+    Closes the shared client's session and its pooled connections. The client stays usable and reopens a session on next use.
+
+    ## Example
+    ```python
+    >>> async def main():
+    ...     try:
+    ...         details = await lcsc.get_product_details_async("C111887")
+    ...     finally:
+    ...         await lcsc.aclose_default_client()
+    ```
+    """
+    if _default_client is not None:
+        await _default_client.close()
+
+
+
+def _close_default_client_at_exit() -> None:
+    """
+    Closes the shared client's session at interpreter exit, if the loop it belongs to can still run it.
+    """
+    client = _default_client
+    loop = client._loop if client is not None and client._session is not None else None
+    if loop is not None and not loop.is_closed() and not loop.is_running():
+        loop.run_until_complete(client.close())
+
+
+
+async def get_product_details_async(lcsc_part_number: str, client: AsyncLCSCClient | None = None) -> ProductDetails:
+    """
+    Asynchronously get details for a product with a specific LCSC part #.
+
+    Without a `client`, the shared default client is used (see: `get_default_async_client`), so connections are reused across calls.
+
+    ## Parameters
+    - `lcsc_part_number` ( *str* ) - The part number on the product's page, under the `LCSC Part #` label.
+    - `client` ( *AsyncLCSCClient*, *optional* ) - The client to send the request through.
+
+    ## Returns
+    - `product_details` ( *ProductDetails* ) - Dataclass object containing the product's details.
+    """
+    if client is None:
+        client = get_default_async_client()
+    return await client.get_product_details(lcsc_part_number)
+
+
+
+async def get_search_results_async(keyword: str, min_stock: int = 500, sort_by: str = "stock", client: AsyncLCSCClient | None = None, limit: int | None = None) -> list[SearchResult]:
+    """
+    Asynchronously get search results for a specific search query/keyword.
+
+    Without a `client`, the shared default client is used (see: `get_default_async_client`), so connections are reused across calls.
+
+    ## Parameters
+    - `keyword` ( *str* ) - The search query.
+    - `min_stock` ( *int*, *optional* ) - Limit results to only products with at least the specified quantity. Pass `None` to disable.
+    - `sort_by` ( *str*, *optional* ) - Return the list sorted by either quantity in stock (`stock`) or by base-price (`price`). Anything else raises `ValueError`.
+    - `client` ( *AsyncLCSCClient*, *optional* ) - The client to send the request through.
+    - `limit` ( *int*, *optional* ) - Return only the first `limit` results of the sorted list; only those are built into objects.
+    """
+    if client is None:
+        client = get_default_async_client()
+    return await client.get_search_results(keyword, min_stock, sort_by, limit=limit)
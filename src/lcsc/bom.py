@@ -0,0 +1,271 @@
+"""
+src/lcsc/bom.py
+
+Bill-of-materials costing for the `lcsc` package.
+"""
+import csv
+import os
+from typing import IO, Iterable
+from .client import LCSCClient, get_default_client
+from .types import ProductDetails
+
+
+
+def best_order_quantity(product_details: ProductDetails, required_quantity: int) -> tuple[int, float]:
+    """
+    Finds the cheapest legal order quantity that covers a required quantity.
+
+    The required quantity is first rounded up to the minimum order quantity and to a multiple of the split quantity.
+    Each higher price break is then tried as well, since buying up to the next break can cost less in total.
+
+    ## Parameters
+    - `product_details` ( *ProductDetails* ) - The product to order.
+    - `required_quantity` ( *int* ) - The quantity needed.
+
+    ## Returns
+    - `(order_quantity, total_cost)` ( *tuple[int, float]* ) - The cheapest legal quantity (the smallest one on ties) and its total cost.
+    """
+    if required_quantity <= 0:
+        return 0, 0.0
+    step = max(product_details.split_quantity, 1)
+    def legal(quantity: int) -> int:
+        quantity = max(quantity, product_details.min_quantity)
+        return -(-quantity // step) * step
+    base = legal(required_quantity)
+    candidates = {base} | {legal(b) for b in product_details.get_price_breaks() if b > base}
+    return min(((q, product_details.get_order_cost(q)) for q in candidates), key=lambda x: (x[1], x[0]))
+
+
+
+def read_bom_csv(file: str | os.PathLike | IO[str], code_column: str = "lcsc_code", quantity_column: str = "quantity") -> list[tuple[str, int]]:
+    """
+    Reads `(lcsc_code, required_quantity)` rows from a CSV file with a header row.
+
+    Column names are matched case-insensitively, and rows with an empty code are skipped.
+
+    ## Parameters
+    - `file` ( *str* | *PathLike* | *IO[str]* ) - Path to the CSV file, or an open text file.
+    - `code_column` ( *str*, *optional* ) - Name of the column holding LCSC part numbers.
+    - `quantity_column` ( *str*, *optional* ) - Name of the column holding required quantities.
+
+    ## Returns
+    - `rows` ( *list[tuple[str, int]]* ) - The BOM lines, in file order.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, newline="", encoding="utf-8-sig") as f:
+            return read_bom_csv(f, code_column, quantity_column)
+    reader = csv.DictReader(file)
+    columns = {name.strip().lower(): name for name in reader.fieldnames or []}
+    for column in (code_column, quantity_column):
+        if column.lower() not in columns:
+            raise ValueError(f"BOM CSV has no {column!r} column (found: {', '.join(reader.fieldnames or [])}).")
+    code_key, quantity_key = columns[code_column.lower()], columns[quantity_column.lower()]
+    rows = []
+    for row in reader:
+        code = (row[code_key] or "").strip()
+        if code:
+            rows.append((code, int(float(row[quantity_key]))))
+    return rows
+
+
+
+class BomLineQuote:
+    """
+    The quote for a single BOM line.
+    """
+    __slots__ = ("_lcsc_code", "_required_quantity", "_product_details", "_order_quantity", "_total_cost", "_error")
+
+    def __init__(self, lcsc_code: str, required_quantity: int, product_details: ProductDetails | None = None, error: Exception | None = None) -> None:
+        self._lcsc_code = lcsc_code
+        self._required_quantity = required_quantity
+        self._product_details = product_details
+        self._error = error
+        self._order_quantity = 0
+        self._total_cost = 0.0
+        if product_details is not None and error is None:
+            try:
+                self._order_quantity, self._total_cost = best_order_quantity(product_details, required_quantity)
+            except (ValueError, IndexError, KeyError) as e:
+                self._error = e
+
+    @property
+    def lcsc_code(self) -> str:
+        """
+        The line's LCSC part number.
+        """
+        return self._lcsc_code
+
+    @property
+    def required_quantity(self) -> int:
+        """
+        The quantity the BOM needs.
+        """
+        return self._required_quantity
+
+    @property
+    def product_details(self) -> ProductDetails | None:
+        """
+        The product's details, or `None` if they couldn't be fetched.
+        """
+        return self._product_details
+
+    @property
+    def error(self) -> Exception | None:
+        """
+        The exception raised while fetching or pricing the product, if any.
+        """
+        return self._error
+
+    @property
+    def order_quantity(self) -> int:
+        """
+        The cheapest legal quantity to order (`0` if the line has an error).
+        """
+        return self._order_quantity
+
+    @property
+    def total_cost(self) -> float:
+        """
+        The total cost of ordering `order_quantity`, in USD.
+        """
+        return self._total_cost
+
+    @property
+    def unit_price(self) -> float:
+        """
+        The effective unit price at `order_quantity`, in USD.
+        """
+        return self._total_cost / self._order_quantity if self._order_quantity else 0.0
+
+    @property
+    def stock(self) -> int:
+        """
+        The quantity currently in stock (`0` if the line has an error).
+        """
+        return self._product_details.stock if self._product_details is not None else 0
+
+    @property
+    def shortfall(self) -> int:
+        """
+        How many of `order_quantity` are not currently in stock.
+        """
+        return max(self._order_quantity - self.stock, 0)
+
+    def as_dict(self) -> dict[str, str | int | float | None]:
+        """
+        Returns the line quote as a dictionary.
+
+        ## Keys
+        - `lcsc_code` ( *str* ) - The line's LCSC part number.
+        - `required_quantity` ( *int* ) - The quantity the BOM needs.
+        - `order_quantity` ( *int* ) - The cheapest legal quantity to order.
+        - `unit_price` ( *float* ) - The effective unit price at `order_quantity`, in USD.
+        - `total_cost` ( *float* ) - The total cost of ordering `order_quantity`, in USD.
+        - `stock` ( *int* ) - The quantity currently in stock.
+        - `shortfall` ( *int* ) - How many of `order_quantity` are not currently in stock.
+        - `error` ( *str* | *None* ) - The error message, if the line couldn't be quoted.
+        """
+        return {
+            "lcsc_code": self.lcsc_code,
+            "required_quantity": self.required_quantity,
+            "order_quantity": self.order_quantity,
+            "unit_price": self.unit_price,
+            "total_cost": self.total_cost,
+            "stock": self.stock,
+            "shortfall": self.shortfall,
+            "error": None if self._error is None else f"{type(self._error).__name__}: {self._error}",
+        }
+
+
+
+class BomQuote:
+    """
+    The quote for a whole BOM.
+    """
+    __slots__ = ("_lines",)
+
+    def __init__(self, lines: list[BomLineQuote]) -> None:
+        self._lines = lines
+
+    @property
+    def lines(self) -> list[BomLineQuote]:
+        """
+        The per-line quotes, in BOM order.
+        """
+        return self._lines
+
+    @property
+    def total_cost(self) -> float:
+        """
+        The total cost of every line that could be quoted, in USD.
+        """
+        return sum(line.total_cost for line in self._lines)
+
+    @property
+    def shortfalls(self) -> list[BomLineQuote]:
+        """
+        The lines whose order quantity exceeds the current stock.
+        """
+        return [line for line in self._lines if line.error is None and line.shortfall > 0]
+
+    @property
+    def errors(self) -> list[BomLineQuote]:
+        """
+        The lines that couldn't be quoted (fetch failure or unorderable product).
+        """
+        return [line for line in self._lines if line.error is not None]
+
+    def as_dict(self) -> dict[str, float | list[dict]]:
+        """
+        Returns the BOM quote as a dictionary.
+
+        ## Keys
+        - `total_cost` ( *float* ) - The total cost of every line that could be quoted, in USD.
+        - `lines` ( *list[dict]* ) - The per-line quotes, as dictionaries.
+        """
+        return {"total_cost": self.total_cost, "lines": [line.as_dict() for line in self._lines]}
+
+    def view(self) -> None:
+        """
+        Views the BOM quote in a GUI window.
+        """
+        from pyjsonviewer import view_data as _view
+        _view(json_data=self.as_dict())
+
+
+
+def quote_bom(bom: Iterable[tuple[str, int]] | str | os.PathLike, client: LCSCClient | None = None, max_workers: int | None = None, cache: str = "default") -> BomQuote:
+    """
+    Prices a bill of materials, fetching every distinct part concurrently.
+
+    Each line is rounded up to a legal order quantity, and buying up to a higher price break is chosen when that is cheaper in total.
+
+    ## Parameters
+    - `bom` ( *Iterable[tuple[str, int]]* | *str* | *PathLike* ) - `(lcsc_code, required_quantity)` rows, or the path to a CSV file (see: `read_bom_csv`).
+    - `client` ( *LCSCClient*, *optional* ) - The client to fetch through. Defaults to the shared default client.
+    - `max_workers` ( *int*, *optional* ) - Number of worker threads. Defaults to the client's `pool_size`.
+    - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+
+    ## Returns
+    - `quote` ( *BomQuote* ) - Per-line quotes, total cost, shortfalls and errors.
+
+    ## Example
+    ```python
+    >>> quote = lcsc.quote_bom([("C111887", 120), ("C3795", 7)])
+    >>> quote.total_cost
+    >>> [(line.lcsc_code, line.shortfall) for line in quote.shortfalls]
+    ```
+    """
+    if isinstance(bom, (str, os.PathLike)):
+        bom = read_bom_csv(bom)
+    rows = [(str(code).strip(), int(quantity)) for code, quantity in bom]
+    client = client or get_default_client()
+    fetched = client.get_product_details_many((code for code, _ in rows), max_workers, cache)
+    lines = []
+    for code, quantity in rows:
+        result = fetched[code]
+        if isinstance(result, Exception):
+            lines.append(BomLineQuote(code, quantity, error=result))
+        else:
+            lines.append(BomLineQuote(code, quantity, result))
+    return BomQuote(lines)
@@ -0,0 +1,319 @@
+"""
+src/lcsc/cache.py
+
+Response and product caches for the `lcsc` package.
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from ._json import loads
+from .client import _PRODUCT_DETAIL_PATH, _SEARCH_PATH
+from .types import ProductDetails
+
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key      TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL,
+    body     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+# A hit only rewrites `accessed` if it is older than this, so most hits stay read-only.
+_TOUCH_INTERVAL = 5.0
+# Fraction of `max_entries` evicted at once, and (roughly) how many inserts pass between size checks.
+_EVICT_FRACTION = 0.1
+
+
+
+class ResponseCache:
+    """
+    On-disk cache of the decoded `result` member of API responses, keyed on endpoint + query parameters.
+
+    The database runs in WAL mode, so several threads and worker processes can share one cache file.
+    Entries expire after a per-endpoint TTL. The cache's size is checked every `max_entries / 10` inserts, and once it holds
+    more than `max_entries`, the least recently used entries are evicted in a batch down to 90% of it. Recency is tracked to
+    within a few seconds, so that most hits don't write to the database.
+
+    ## Parameters
+    - `path` ( *str* ) - Path to the SQLite database file. Created if it doesn't exist.
+    - `detail_ttl` ( *float*, *optional* ) - Seconds a product detail response stays fresh.
+    - `search_ttl` ( *float*, *optional* ) - Seconds a search response stays fresh (also used for any other endpoint).
+    - `max_entries` ( *int*, *optional* ) - Maximum number of cached responses. Pass `None` to disable eviction.
+
+    ## Example
+    ```python
+    >>> cache = lcsc.ResponseCache("lcsc-cache.sqlite3", detail_ttl=7 * 86400, search_ttl=3600)
+    >>> client = lcsc.LCSCClient(cache=cache)
+    >>> details = client.get_product_details("C111887")                   # network, then cached
+    >>> details = client.get_product_details("C111887")                   # served from disk
+    >>> details = client.get_product_details("C111887", cache="refresh")  # network, cache updated
+    ```
+    """
+    def __init__(self, path: str, detail_ttl: float = 7 * 24 * 3600, search_ttl: float = 3600, max_entries: int | None = 100_000) -> None:
+        self._path = str(path)
+        self._ttls = {_PRODUCT_DETAIL_PATH: detail_ttl, _SEARCH_PATH: search_ttl}
+        self._default_ttl = search_ttl
+        self._max_entries = max_entries
+        self._evict_every = max(1, int(max_entries * _EVICT_FRACTION)) if max_entries is not None else 0
+        self._inserts = self._evict_every
+        self._evict_lock = threading.Lock()
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    @property
+    def path(self) -> str:
+        """
+        Path to the SQLite database file.
+        """
+        return self._path
+
+    @property
+    def max_entries(self) -> int | None:
+        """
+        Maximum number of cached responses before least recently used entries are evicted.
+        """
+        return self._max_entries
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns this thread's connection to the database, opening it on first use.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(endpoint: str, params: dict) -> str:
+        return endpoint + "?" + json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+    def ttl(self, endpoint: str) -> float:
+        """
+        Returns the number of seconds a response from `endpoint` stays fresh.
+        """
+        return self._ttls.get(endpoint, self._default_ttl)
+
+    def get(self, endpoint: str, params: dict) -> dict | None:
+        """
+        Returns the cached `result` for a request, or `None` if it is missing or expired.
+
+        ## Parameters
+        - `endpoint` ( *str* ) - The endpoint path (e.g. `/ftps/wm/product/detail`).
+        - `params` ( *dict* ) - The request's query parameters.
+        """
+        conn = self._connect()
+        key = self._key(endpoint, params)
+        row = conn.execute("SELECT created, accessed, body FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[0] > self.ttl(endpoint):
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        if now - row[1] > _TOUCH_INTERVAL:
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return loads(row[2])
+
+    def set(self, endpoint: str, params: dict, result: dict) -> None:
+        """
+        Stores the `result` of a request, evicting the least recently used entries if the cache is full.
+
+        ## Parameters
+        - `endpoint` ( *str* ) - The endpoint path (e.g. `/ftps/wm/product/detail`).
+        - `params` ( *dict* ) - The request's query parameters.
+        - `result` ( *dict* ) - The decoded `result` member of the response.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, endpoint, created, accessed, body) VALUES (?, ?, ?, ?, ?)",
+            (self._key(endpoint, params), endpoint, now, now, json.dumps(result, separators=(",", ":"))),
+        )
+        if self._max_entries is not None:
+            with self._evict_lock:
+                self._inserts += 1
+                check = self._inserts >= self._evict_every
+                if check:
+                    self._inserts = 0
+            if check:
+                self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """
+        Evicts the least recently used entries, down to 90% of `max_entries`, if the cache holds more than `max_entries`.
+        """
+        count = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self._max_entries:
+            keep = self._max_entries - self._evict_every
+            conn.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)", (count - keep,))
+
+    def delete(self, endpoint: str, params: dict) -> None:
+        """
+        Removes a single cached response, if present.
+        """
+        self._connect().execute("DELETE FROM responses WHERE key = ?", (self._key(endpoint, params),))
+
+    def clear(self) -> None:
+        """
+        Removes every cached response.
+        """
+        self._connect().execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Closes this thread's connection to the database.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+
+class ProductCache:
+    """
+    In-process LRU cache of `ProductDetails` with separate lifetimes for static and volatile data.
+
+    Static fields (model, title, catalogs, brand, specs, datasheet, ...) stay fresh for `static_ttl` seconds, while
+    `stock` and `price` expire after `volatile_ttl`. When only the volatile part has expired, the client re-fetches the
+    product and re-parses just its stock and price ladder, reusing the cached static fields.
+
+    ## Parameters
+    - `max_entries` ( *int*, *optional* ) - Maximum number of products held; the least recently used are evicted first.
+    - `static_ttl` ( *float*, *optional* ) - Seconds the static fields stay fresh.
+    - `volatile_ttl` ( *float*, *optional* ) - Seconds `stock` and `price` stay fresh.
+
+    ## Example
+    ```python
+    >>> client = lcsc.LCSCClient(product_cache=lcsc.ProductCache(static_ttl=6 * 3600, volatile_ttl=60))
+    >>> details = client.get_product_details("C111887")
+    >>> client.product_cache.stats()
+    {'hits': 0, 'volatile_refreshes': 0, 'misses': 1, 'size': 1}
+    ```
+    """
+    def __init__(self, max_entries: int = 10_000, static_ttl: float = 6 * 3600, volatile_ttl: float = 60) -> None:
+        self._max_entries = max_entries
+        self._static_ttl = static_ttl
+        self._volatile_ttl = volatile_ttl
+        self._entries: OrderedDict[str, list] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._volatile_refreshes = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of lookups served entirely from the cache.
+        """
+        return self._hits
+
+    @property
+    def volatile_refreshes(self) -> int:
+        """
+        Number of lookups whose static fields were served from the cache, but whose stock and price had to be refreshed.
+        """
+        return self._volatile_refreshes
+
+    @property
+    def misses(self) -> int:
+        """
+        Number of lookups for products that were missing or whose static fields had expired.
+        """
+        return self._misses
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the cache's counters as a dictionary.
+
+        ## Keys
+        - `hits` ( *int* ) - Lookups served entirely from the cache.
+        - `volatile_refreshes` ( *int* ) - Lookups that only needed stock and price refreshed.
+        - `misses` ( *int* ) - Lookups for missing or expired products.
+        - `size` ( *int* ) - Number of products currently cached.
+        """
+        with self._lock:
+            return {"hits": self._hits, "volatile_refreshes": self._volatile_refreshes, "misses": self._misses, "size": len(self._entries)}
+
+    def lookup(self, lcsc_part_number: str) -> tuple[ProductDetails | None, bool]:
+        """
+        Looks up a product and updates the hit/miss counters.
+
+        ## Returns
+        - `(details, volatile_fresh)` ( *tuple[ProductDetails | None, bool]* ) - The cached details (`None` if missing or if the static fields expired), and whether its stock and price are still fresh.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(lcsc_part_number)
+            if entry is None or now >= entry[1]:
+                if entry is not None:
+                    del self._entries[lcsc_part_number]
+                self._misses += 1
+                return None, False
+            self._entries.move_to_end(lcsc_part_number)
+            if now < entry[2]:
+                self._hits += 1
+                return entry[0], True
+            self._volatile_refreshes += 1
+            return entry[0], False
+
+    def put(self, details: ProductDetails) -> None:
+        """
+        Caches freshly fetched details, resetting both the static and the volatile lifetimes.
+        """
+        with self._lock:
+            self._insert(details, time.monotonic())
+
+    def update_volatile(self, details: ProductDetails) -> None:
+        """
+        Replaces a cached product with details whose stock and price were just refreshed, keeping the static lifetime.
+        If the product was evicted meanwhile, it is cached again like `put()` does.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(details.product_code)
+            if entry is None:
+                self._insert(details, now)
+            else:
+                entry[0] = details
+                entry[2] = now + self._volatile_ttl
+
+    def _insert(self, details: ProductDetails, now: float) -> None:
+        """
+        Caches details with fresh lifetimes as the most recently used product, evicting the least recently used ones
+        beyond `max_entries`. The caller holds the lock.
+        """
+        self._entries[details.product_code] = [details, now + self._static_ttl, now + self._volatile_ttl]
+        self._entries.move_to_end(details.product_code)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, lcsc_part_number: str) -> None:
+        """
+        Removes a product from the cache, if present.
+        """
+        with self._lock:
+            self._entries.pop(lcsc_part_number, None)
+
+    def clear(self) -> None:
+        """
+        Removes every product and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._volatile_refreshes = self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,187 @@
+"""
+src/lcsc/cli.py
+
+The `lcsc` command-line tool: product lookups and searches, streamed as NDJSON.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Iterable, Iterator
+from . import __version__
+from .client import _BASE_URL, LCSCClient
+
+
+
+def _iter_codes(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Yields the part codes in `lines` (whitespace-separated; anything after a `#` is a comment), without duplicates.
+    """
+    seen = set()
+    for line in lines:
+        for code in line.split("#", 1)[0].split():
+            if code not in seen:
+                seen.add(code)
+                yield code
+
+
+
+class _LineWriter:
+    """
+    Writes NDJSON lines from any thread, flushing each one so that consumers see results as soon as they are ready.
+
+    Once the reader has gone away (e.g. `lcsc search ... | head`), `closed` is set and further lines are dropped.
+    """
+    def __init__(self, file: IO[str]) -> None:
+        self._file = file
+        self._lock = threading.Lock()
+        self.errors = 0
+        self.closed = False
+
+    def write(self, row: dict, error: bool = False) -> None:
+        line = json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            self.errors += error
+            if self.closed:
+                return
+            try:
+                self._file.write(line)
+                self._file.flush()
+            except BrokenPipeError:
+                self.closed = True
+
+
+
+def _make_client(args: argparse.Namespace) -> LCSCClient:
+    """
+    Builds the client described by the common command-line options.
+    """
+    from .ratelimit import RetryPolicy, TokenBucket
+    from .transport import HTTPTransport, RecordingTransport, ReplayTransport
+    if args.replay:
+        transport = ReplayTransport(args.replay)
+    elif args.record:
+        transport = RecordingTransport(args.record, HTTPTransport(timeout=args.timeout, pool_size=args.workers))
+    else:
+        transport = HTTPTransport(timeout=args.timeout, pool_size=args.workers)
+    cache = None
+    if args.cache:
+        from .cache import ResponseCache
+        cache = ResponseCache(args.cache)
+    return LCSCClient(
+        base_url=args.base_url,
+        cache=cache,
+        keep_raw=False,
+        rate_limiter=TokenBucket(args.rate) if args.rate else None,
+        retry=RetryPolicy(max_retries=args.retries) if args.retries else None,
+        transport=transport,
+    )
+
+
+
+def _detail(client: LCSCClient, args: argparse.Namespace, out: _LineWriter) -> None:
+    """
+    Looks up every part code concurrently, writing each result (or error) as soon as its request completes.
+
+    Codes are submitted as they are read, with at most twice `--workers` lookups pending, so a long stream on stdin
+    starts producing output right away and is never held in memory as a whole.
+    """
+    from .export import flatten_product
+    codes = _iter_codes(args.codes) if args.codes and args.codes != ["-"] else _iter_codes(sys.stdin)
+    slots = threading.BoundedSemaphore(args.workers * 2)
+    def done(code, future) -> None:
+        try:
+            out.write(flatten_product(future.result()))
+        except Exception as e:
+            out.write({"product_code": code, "error": str(e), "error_type": type(e).__name__}, error=True)
+        finally:
+            slots.release()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for code in codes:
+            slots.acquire()
+            if out.closed:
+                break
+            future = executor.submit(client.get_product_details, code, args.cache_mode)
+            future.add_done_callback(lambda f, code=code: done(code, f))
+
+
+
+def _search(client: LCSCClient, args: argparse.Namespace, out: _LineWriter) -> None:
+    """
+    Writes the search results for one keyword: streamed page by page in the API's order, or sorted (first page only).
+    """
+    from .export import flatten_product
+    if args.sort:
+        results = client.get_search_results(args.keyword, args.min_stock, args.sort, args.cache_mode, args.limit)
+    else:
+        results = client.iter_search_results(args.keyword, args.min_stock, limit=args.limit, cache=args.cache_mode)
+    for result in results:
+        out.write(flatten_product(result))
+        if out.closed:
+            break
+
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Returns the argument parser of the `lcsc` command.
+    """
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--workers", type=int, default=16, help="Concurrent requests (default: %(default)s).")
+    common.add_argument("--timeout", type=float, default=30.0, help="Request timeout in seconds (default: %(default)s).")
+    common.add_argument("--retries", type=int, default=3, help="Retries of failed requests; 0 disables (default: %(default)s).")
+    common.add_argument("--rate", type=float, help="Maximum requests per second.")
+    common.add_argument("--cache", metavar="PATH", help="SQLite response cache file.")
+    common.add_argument("--cache-mode", choices=("default", "refresh", "only"), default="default", help="How the response cache is used (default: %(default)s).")
+    common.add_argument("--record", metavar="CASSETTE", help="Record every response to a cassette file.")
+    common.add_argument("--replay", metavar="CASSETTE", help="Serve responses from a recorded cassette, without the network.")
+    common.add_argument("--base-url", default=_BASE_URL, help=argparse.SUPPRESS)
+
+    parser = argparse.ArgumentParser(prog="lcsc", description="Look up LCSC products and search results. Every result is written to stdout as one JSON line.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    detail = commands.add_parser("detail", parents=[common], help="Product details for LCSC part codes.", description="Looks up part codes concurrently and writes each product as soon as it arrives (in completion order). Failed lookups are written as {\"product_code\", \"error\", \"error_type\"} lines.")
+    detail.add_argument("codes", nargs="*", metavar="CODE", help="LCSC part codes (e.g. C111887). Without any, or with -, codes are read from stdin, whitespace-separated.")
+
+    search = commands.add_parser("search", parents=[common], help="Search results for a keyword.")
+    search.add_argument("keyword", help="The search query.")
+    search.add_argument("--min-stock", type=int, help="Skip products with less than this quantity in stock.")
+    search.add_argument("--sort", choices=("stock", "price"), help="Sort the first page of results (at most 100) by stock (highest first) or base price (lowest first). Without it, every page is streamed in the API's order.")
+    search.add_argument("--limit", type=int, help="Stop after this many results.")
+    return parser
+
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Runs the `lcsc` command.
+
+    ## Parameters
+    - `argv` ( *list[str]*, *optional* ) - The command-line arguments, without the program name. Defaults to `sys.argv[1:]`.
+
+    ## Returns
+    - `status` ( *int* ) - The exit status: `0` on success, `1` if any lookup failed, `2` for invalid arguments.
+    """
+    args = build_parser().parse_args(argv)
+    out = _LineWriter(sys.stdout)
+    client = _make_client(args)
+    try:
+        if args.command == "detail":
+            _detail(client, args, out)
+        else:
+            _search(client, args, out)
+    except Exception as e:
+        print(f"lcsc: error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        client.close()
+        if client.cache is not None:
+            client.cache.close()
+    if out.closed:
+        # Keeps the interpreter's final flush of stdout from failing again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    return 1 if out.errors else 0
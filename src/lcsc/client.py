@@ -0,0 +1,574 @@
+"""
+src/lcsc/client.py
+
+Connection-pooled HTTP client for the `lcsc` package.
+"""
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Iterable, Iterator
+from ._json import loads
+from .errors import CacheMissError, LCSCHTTPError, LCSCResponseError
+from .metrics import Metrics
+from .ratelimit import RetryPolicy, TokenBucket, _is_throttled, _parse_retry_after
+from .singleflight import SingleFlight
+from .transport import _HEADERS, HTTPTransport, Response, Transport
+from .types import ProductDetails, SearchResult
+if TYPE_CHECKING:
+    import requests
+    from .cache import ProductCache, ResponseCache
+
+
+
+_BASE_URL = "https://wmsc.lcsc.com"
+_PRODUCT_DETAIL_PATH = "/ftps/wm/product/detail"
+_SEARCH_PATH = "/ftps/wm/search/global"
+
+_CACHE_MODES = ("default", "refresh", "only")
+
+
+
+def _iter_search_page(raw_data: dict, min_stock: int | None, offset: int = 0, keep_raw: bool = True) -> Iterator[SearchResult]:
+    """
+    Yields the `SearchResult` objects of one raw search `result` payload that pass the `min_stock` filter.
+
+    Hits are filtered on their raw `stockNumber`, so dropped hits never become `ProductDetails`.
+    """
+    product_list = raw_data["productSearchResultVO"]["productList"]
+    for i, data in enumerate(product_list):
+        if min_stock is None or int(data["stockNumber"]) >= min_stock:
+            yield SearchResult(offset + i, data["url"], bool(data["isDiscount"]), ProductDetails(data, keep_raw))
+
+
+
+def _raw_stock(hit: tuple[int, dict]) -> int:
+    return int(hit[1]["stockNumber"])
+
+
+def _raw_base_price(hit: tuple[int, dict]) -> float:
+    # The price of the first ladder, as `ProductDetails.price` would give it; hits without prices sort last.
+    price_list = hit[1]["productPriceList"]
+    return float(price_list[0]["usdPrice"]) if price_list else float("inf")
+
+
+
+def _build_search_results(raw_data: dict, min_stock: int | None, sort_by: str, keep_raw: bool = True, limit: int | None = None) -> list[SearchResult]:
+    """
+    Builds the (filtered and sorted) list of `SearchResult` objects from a raw search `result` payload.
+
+    Filtering and sorting work on the raw hits, with each sort key computed once per hit, and with a `limit` only the
+    top `limit` hits are selected (with a heap) and built into objects. Ties keep the API's order.
+    """
+    product_list = raw_data["productSearchResultVO"]["productList"]
+    if min_stock is None:
+        hits = list(enumerate(product_list))
+    else:
+        hits = [(i, data) for i, data in enumerate(product_list) if int(data["stockNumber"]) >= min_stock]
+    sort_by = sort_by.lower()
+    if sort_by == "stock":
+        hits = sorted(hits, key=_raw_stock, reverse=True) if limit is None else heapq.nlargest(limit, hits, key=_raw_stock)
+    elif sort_by == "price":
+        hits = sorted(hits, key=_raw_base_price) if limit is None else heapq.nsmallest(limit, hits, key=_raw_base_price)
+    elif limit is not None:
+        hits = hits[:max(limit, 0)]
+    return [SearchResult(i, data["url"], bool(data["isDiscount"]), ProductDetails(data, keep_raw)) for i, data in hits]
+
+
+
+def _check_cache_mode(cache: str) -> None:
+    """
+    Raises a `ValueError` for an unknown `cache` mode.
+    """
+    if cache not in _CACHE_MODES:
+        raise ValueError(f"Invalid `cache` mode {cache!r}; expected one of {', '.join(_CACHE_MODES)}.")
+
+
+
+def _flight_key(url: str, params: dict) -> tuple:
+    """
+    Identifies interchangeable requests for single-flight coalescing: the same URL with the same query parameters.
+    """
+    return (url, tuple(sorted((k, str(v)) for k, v in params.items())))
+
+
+
+def _decode_result(status: int, body: bytes, url: str, retry_after: str | None = None) -> dict:
+    """
+    Checks a response's status and returns the `result` member of its JSON body.
+    """
+    if status >= 400:
+        raise LCSCHTTPError(status, url, _parse_retry_after(retry_after))
+    try:
+        data = loads(body)
+    except ValueError:
+        raise LCSCResponseError(f"Non-JSON response body from {url}: {body[:100]!r}", url, False) from None
+    result = data.get("result") if isinstance(data, dict) else None
+    if result is None:
+        detail = f" (code {data.get('code')}: {data.get('msg')})" if isinstance(data, dict) else ""
+        raise LCSCResponseError(f"Response from {url} has no `result`{detail}.", url, True)
+    return result
+
+
+
+def _search_params(keyword: str, page: int, page_size: int, hints: dict | None = None) -> dict:
+    """
+    Builds the query parameters for one page of the global search endpoint, plus any server-side filter `hints`.
+    """
+    params = {
+        "keyword": keyword,
+        "currentPage": page,
+        "pageSize": page_size,
+        "searchType": "product",
+    }
+    if hints:
+        params.update(hints)
+    return params
+
+
+
+class LCSCClient:
+    """
+    Reusable client for LCSC's API.
+
+    Every request made through the same client goes over one `requests.Session`, so TCP/TLS connections
+    to the API host are kept alive and reused instead of being re-established for each lookup.
+    Pass a `transport` to record that traffic to a cassette file, or to replay one offline (see: `lcsc.transport`).
+
+    ## Parameters
+    - `headers` ( *dict*, *optional* ) - Extra headers to send with every request. Merged over the default headers.
+    - `timeout` ( *float* | *tuple[float, float]*, *optional* ) - Request timeout in seconds, or a `(connect, read)` tuple. Pass `None` to disable.
+    - `pool_size` ( *int*, *optional* ) - Maximum number of keep-alive connections held open per host.
+    - `base_url` ( *str*, *optional* ) - Root URL of the API.
+    - `cache` ( *ResponseCache*, *optional* ) - Persistent cache for raw API responses (see: `lcsc.cache.ResponseCache`).
+    - `product_cache` ( *ProductCache*, *optional* ) - In-memory cache of product details with separate static/volatile lifetimes (see: `lcsc.cache.ProductCache`).
+    - `keep_raw` ( *bool*, *optional* ) - Whether returned `ProductDetails` keep the full raw payload (see: `ProductDetails`). Pass `False` for bulk jobs that never call `view_raw`.
+    - `coalesce` ( *bool*, *optional* ) - Share one network request between threads asking for the same URL and parameters at the same time (see: `deduplicated`).
+    - `rate_limiter` ( *TokenBucket*, *optional* ) - Limits the request rate of every thread using this client; pass a `SQLiteTokenBucket` to share the limit between processes.
+    - `retry` ( *RetryPolicy*, *optional* ) - When and how long to back off before retrying failed requests. Pass `None` to disable retries.
+    - `metrics` ( *Metrics*, *optional* ) - Records latencies, sizes, retries, decode/build times and cache lookups, and runs request hooks (see: `lcsc.metrics.Metrics`).
+    - `search_hints` ( *dict*, *optional* ) - Extra query parameters sent with every search request, for filters or sort orders the search endpoint applies itself (see: `search_hints`).
+    - `transport` ( *Transport*, *optional* ) - Sends the client's requests. Defaults to an `HTTPTransport` built from `headers`, `timeout` and `pool_size`, which are ignored when a transport is given.
+
+    ## Cache modes
+    Every lookup method takes a `cache` argument, which only has an effect when the client has a cache:
+    - `"default"` - Serve fresh cached responses, and store anything fetched from the network.
+    - `"refresh"` - Always fetch from the network, and overwrite the cached response.
+    - `"only"` - Never touch the network; raise `CacheMissError` if there is no fresh cached response.
+
+    With a `product_cache`, a product whose stock and price expired is re-fetched from the network (bypassing `cache`'s possibly older copy, unless the mode is `"only"`).
+
+    ## Example
+    ```python
+    >>> with lcsc.LCSCClient(pool_size=20) as client:
+    ...     details = client.get_product_details("C111887")
+    ...     results = client.get_search_results("L7805CV")
+    ```
+    """
+    def __init__(self, headers: dict | None = None, timeout: float | tuple[float, float] | None = (5.0, 30.0), pool_size: int = 10, base_url: str = _BASE_URL, cache: "ResponseCache | None" = None, product_cache: "ProductCache | None" = None, keep_raw: bool = True, coalesce: bool = True, rate_limiter: TokenBucket | None = None, retry: RetryPolicy | None = RetryPolicy(), metrics: Metrics | None = None, search_hints: dict | None = None, transport: Transport | None = None) -> None:
+        self._headers = dict(_HEADERS)
+        if headers:
+            self._headers.update(headers)
+        self._timeout = timeout
+        self._pool_size = pool_size
+        self._base_url = base_url.rstrip("/")
+        self._cache = cache
+        self._product_cache = product_cache
+        self._keep_raw = keep_raw
+        self._flight = SingleFlight() if coalesce else None
+        self._rate_limiter = rate_limiter
+        self._retry = retry
+        self._metrics = metrics
+        self._search_hints = dict(search_hints) if search_hints else None
+        self._transport = transport if transport is not None else HTTPTransport(self._headers, timeout, pool_size)
+
+    def __enter__(self) -> "LCSCClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """
+        The headers sent with every request made by this client.
+        """
+        return self._headers
+
+    @property
+    def timeout(self) -> float | tuple[float, float] | None:
+        """
+        The request timeout, in seconds (or a `(connect, read)` tuple).
+        """
+        return self._timeout
+
+    @property
+    def pool_size(self) -> int:
+        """
+        The maximum number of keep-alive connections held open per host.
+        """
+        return self._pool_size
+
+    @property
+    def base_url(self) -> str:
+        """
+        The root URL of the API (e.g. `https://wmsc.lcsc.com`).
+        """
+        return self._base_url
+
+    @property
+    def cache(self) -> "ResponseCache | None":
+        """
+        The persistent response cache used by this client, if any.
+        """
+        return self._cache
+
+    @property
+    def product_cache(self) -> "ProductCache | None":
+        """
+        The in-memory product details cache used by this client, if any.
+        """
+        return self._product_cache
+
+    @property
+    def keep_raw(self) -> bool:
+        """
+        Whether returned `ProductDetails` keep the full raw payload.
+        """
+        return self._keep_raw
+
+    @property
+    def rate_limiter(self) -> TokenBucket | None:
+        """
+        The rate limiter shared by every request made through this client, if any.
+        """
+        return self._rate_limiter
+
+    @property
+    def retry(self) -> RetryPolicy | None:
+        """
+        The retry policy for failed requests, if any.
+        """
+        return self._retry
+
+    @property
+    def metrics(self) -> Metrics | None:
+        """
+        The metrics recorder used by this client, if any.
+        """
+        return self._metrics
+
+    @property
+    def search_hints(self) -> dict | None:
+        """
+        Extra query parameters sent with every search request, if any.
+
+        The search endpoint has no documented filter or sort parameters, so none are sent by default. Hints can only
+        shrink responses: results are always filtered by `min_stock` and sorted locally as well.
+        """
+        return self._search_hints
+
+    @property
+    def deduplicated(self) -> int:
+        """
+        Number of calls that were served by another thread's identical in-flight request instead of making their own.
+        """
+        return self._flight.deduplicated if self._flight is not None else 0
+
+    @property
+    def transport(self) -> Transport:
+        """
+        The transport every request is sent through.
+        """
+        return self._transport
+
+    @property
+    def session(self) -> "requests.Session | None":
+        """
+        The underlying `requests.Session` used for all requests, or `None` if the transport has none (e.g. a `ReplayTransport`).
+        """
+        return getattr(self._transport, "session", None)
+
+    def close(self) -> None:
+        """
+        Closes the transport (for the default one, the session and all of its pooled connections).
+        """
+        self._transport.close()
+
+    def _request(self, url: str, params: dict, method: str = "GET", payload: dict | None = None) -> Response:
+        """
+        Private wrapper around `Transport.send()`.
+        """
+        return self._transport.send(method, url, params, payload)
+
+    def _get_result(self, path: str, params: dict, cache: str = "default") -> dict:
+        """
+        Requests an API endpoint and returns the decoded `result` member of its JSON body, going through the response cache if there is one.
+        """
+        if self._cache is not None and cache != "refresh":
+            result = self._cache.get(path, params)
+            if self._metrics is not None:
+                self._metrics.observe_cache("response", "miss" if result is None else "hit")
+            if result is not None:
+                return result
+        if cache == "only":
+            raise CacheMissError(f"No cached response for {path} with parameters {params}.")
+        url = self._base_url + path
+        if self._flight is not None:
+            return self._flight.do(_flight_key(url, params), self._fetch_result, path, params)
+        return self._fetch_result(path, params)
+
+    def _fetch_result(self, path: str, params: dict) -> dict:
+        """
+        Requests an API endpoint over the network and stores the decoded `result` in the response cache, if there is one.
+
+        Each attempt first waits for the rate limiter. Failures are retried as the retry policy allows, and a throttling
+        response (`429`, `503`, or any with `Retry-After`) pauses the rate limiter for the retry delay, so that every thread
+        backs off rather than just this one.
+        """
+        url = self._base_url + path
+        metrics = self._metrics
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            try:
+                if metrics is None:
+                    response = self._request(url, params)
+                    result = _decode_result(response.status_code, response.content, url, response.headers.get("Retry-After"))
+                else:
+                    result = self._fetch_once_measured(metrics, url, path, params)
+                break
+            except (LCSCHTTPError, LCSCResponseError, *self._transport.network_errors) as e:
+                delay = self._retry.get_delay("GET", e, attempt) if self._retry is not None else None
+                if delay is None:
+                    raise
+                if metrics is not None:
+                    metrics.observe_retry(path)
+                if self._rate_limiter is not None and _is_throttled(e):
+                    # The next acquire waits out the pause, together with every other caller.
+                    self._rate_limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+                attempt += 1
+        if self._cache is not None:
+            self._cache.set(path, params, result)
+        return result
+
+    def _fetch_once_measured(self, metrics: Metrics, url: str, path: str, params: dict) -> dict:
+        """
+        Makes a single request and decodes it like `_fetch_result`, reporting to `metrics` and its hooks along the way.
+        """
+        metrics.request_started(path, params)
+        started = time.perf_counter()
+        try:
+            response = self._request(url, params)
+        except self._transport.network_errors as e:
+            metrics.request_finished(path, params, None, time.perf_counter() - started, 0, e)
+            raise
+        received = time.perf_counter()
+        metrics.request_finished(path, params, response.status_code, received - started, len(response.content))
+        result = _decode_result(response.status_code, response.content, url, response.headers.get("Retry-After"))
+        metrics.observe_decode(path, time.perf_counter() - received)
+        return result
+
+    def _build_details(self, raw_data: dict) -> ProductDetails:
+        """
+        Builds `ProductDetails` from a detail `result`, timing it if the client has metrics.
+        """
+        if self._metrics is None:
+            return ProductDetails(raw_data, self._keep_raw)
+        started = time.perf_counter()
+        details = ProductDetails(raw_data, self._keep_raw)
+        self._metrics.observe_build(_PRODUCT_DETAIL_PATH, time.perf_counter() - started)
+        return details
+
+    def _search_page(self, raw_data: dict, min_stock: int | None, offset: int) -> Iterable[SearchResult]:
+        """
+        The results of one search page: built lazily, or all at once and timed if the client has metrics.
+        """
+        if self._metrics is None:
+            return _iter_search_page(raw_data, min_stock, offset, self._keep_raw)
+        started = time.perf_counter()
+        results = list(_iter_search_page(raw_data, min_stock, offset, self._keep_raw))
+        self._metrics.observe_build(_SEARCH_PATH, time.perf_counter() - started, len(results))
+        return results
+
+    def get_product_details(self, lcsc_part_number: str, cache: str = "default") -> ProductDetails:
+        """
+        Get details for a product with a specific LCSC part #.
+
+        ## Parameters
+        - `lcsc_part_number` ( *str* ) - The part number on the product's page, under the `LCSC Part #` label.
+        - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+
+        ## Returns
+        - `product_details` ( *ProductDetails* ) - Dataclass object containing the product's details.
+        """
+        _check_cache_mode(cache)
+        params = {"productCode": lcsc_part_number}
+        if self._product_cache is None:
+            return self._build_details(self._get_result(_PRODUCT_DETAIL_PATH, params, cache))
+        cached = None
+        if cache != "refresh":
+            cached, volatile_fresh = self._product_cache.lookup(lcsc_part_number)
+            if self._metrics is not None:
+                self._metrics.observe_cache("product", "hit" if volatile_fresh else "miss" if cached is None else "volatile_refresh")
+            if volatile_fresh:
+                return cached
+        if cached is not None:
+            details = cached._with_volatile(self._get_result(_PRODUCT_DETAIL_PATH, params, "only" if cache == "only" else "refresh"))
+            self._product_cache.update_volatile(details)
+        else:
+            details = self._build_details(self._get_result(_PRODUCT_DETAIL_PATH, params, cache))
+            self._product_cache.put(details)
+        return details
+
+    def iter_product_details(self, lcsc_part_numbers: Iterable[str], max_workers: int | None = None, cache: str = "default") -> Iterator[tuple[str, ProductDetails | Exception]]:
+        """
+        Fetches details for many products concurrently, yielding each one as soon as its request completes.
+
+        Repeated part numbers are only requested once. A failed lookup does not stop the batch; its exception is yielded in place of the details.
+        Pending requests are cancelled if the iterator is closed early.
+
+        ## Parameters
+        - `lcsc_part_numbers` ( *Iterable[str]* ) - The LCSC part numbers to look up.
+        - `max_workers` ( *int*, *optional* ) - Number of worker threads. Defaults to the client's `pool_size`.
+        - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+
+        ## Yields
+        - `(lcsc_part_number, result)` ( *tuple[str, ProductDetails | Exception]* ) - In completion order, not input order.
+        """
+        _check_cache_mode(cache)
+        codes = list(dict.fromkeys(lcsc_part_numbers))
+        if not codes:
+            return
+        executor = ThreadPoolExecutor(max_workers=max_workers or self._pool_size)
+        try:
+            futures = {executor.submit(self.get_product_details, code, cache): code for code in codes}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = e
+                yield futures[future], result
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_product_details_many(self, lcsc_part_numbers: Iterable[str], max_workers: int | None = None, cache: str = "default") -> dict[str, ProductDetails | Exception]:
+        """
+        Fetches details for many products concurrently.
+
+        ## Parameters
+        - `lcsc_part_numbers` ( *Iterable[str]* ) - The LCSC part numbers to look up. Duplicates are only requested once.
+        - `max_workers` ( *int*, *optional* ) - Number of worker threads. Defaults to the client's `pool_size`.
+        - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+
+        ## Returns
+        - `results` ( *dict[str, ProductDetails | Exception]* ) - Maps each part number, in input order, to its details or to the exception raised while fetching it.
+        """
+        codes = list(dict.fromkeys(lcsc_part_numbers))
+        results = dict(self.iter_product_details(codes, max_workers, cache))
+        return {code: results[code] for code in codes}
+
+    def get_search_results(self, keyword: str, min_stock: int = 500, sort_by: str = "stock", cache: str = "default", limit: int | None = None) -> list[SearchResult]:
+        """
+        Get search results for a specific search query/keyword.
+
+        ## Parameters
+        - `keyword` ( *str* ) - The search query.
+        - `min_stock` ( *int*, *optional* ) - Limit results to only products with at least the specified quantity. Pass `None` to disable.
+        - `sort_by` ( *str*, *optional* ) - Return the list sorted by either quantity in stock (`stock`) or by base-price (`price`). Anything else raises `ValueError`.
+        - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+        - `limit` ( *int*, *optional* ) - Return only the first `limit` results of the sorted list; only those are built into objects.
+        """
+        _check_cache_mode(cache)
+        if sort_by.lower() not in ["stock", "price"]:
+            raise ValueError(f"Invalid `sort_by` parameter {sort_by!r}.")
+        raw_data = self._get_result(_SEARCH_PATH, _search_params(keyword, 1, 100, self._search_hints), cache)
+        if self._metrics is None:
+            return _build_search_results(raw_data, min_stock, sort_by, self._keep_raw, limit)
+        started = time.perf_counter()
+        results = _build_search_results(raw_data, min_stock, sort_by, self._keep_raw, limit)
+        self._metrics.observe_build(_SEARCH_PATH, time.perf_counter() - started, len(results))
+        return results
+
+    def iter_search_results(self, keyword: str, min_stock: int | None = None, page_size: int = 100, limit: int | None = None, prefetch: bool = True, cache: str = "default") -> Iterator[SearchResult]:
+        """
+        Lazily walks every page of the search results for a keyword, yielding each `SearchResult` as its page arrives.
+
+        Results are yielded in the API's order (no sorting), and `index` counts across pages.
+        No further pages are requested once the caller stops iterating or `limit` results have been yielded.
+
+        ## Parameters
+        - `keyword` ( *str* ) - The search query.
+        - `min_stock` ( *int*, *optional* ) - Skip products with less than the specified quantity in stock.
+        - `page_size` ( *int*, *optional* ) - Number of hits requested per page.
+        - `limit` ( *int*, *optional* ) - Stop after yielding this many results.
+        - `prefetch` ( *bool*, *optional* ) - Request the next page in the background while the current one is being consumed.
+        - `cache` ( *str*, *optional* ) - The cache mode (`default`, `refresh` or `only`).
+
+        ## Yields
+        - `result` ( *SearchResult* ) - The next search result.
+        """
+        _check_cache_mode(cache)
+        if limit is not None and limit <= 0:
+            return
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        pending = None
+        count = 0
+        page = 1
+        try:
+            raw_data = self._get_result(_SEARCH_PATH, _search_params(keyword, page, page_size, self._search_hints), cache)
+            while True:
+                search_vo = raw_data["productSearchResultVO"]
+                total_pages = search_vo.get("totalPage")
+                has_next = len(search_vo["productList"]) >= page_size and (total_pages is None or page < total_pages)
+                if has_next and executor is not None:
+                    pending = executor.submit(self._get_result, _SEARCH_PATH, _search_params(keyword, page + 1, page_size, self._search_hints), cache)
+                for result in self._search_page(raw_data, min_stock, (page - 1) * page_size):
+                    yield result
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+                if not has_next:
+                    return
+                page += 1
+                if pending is not None:
+                    raw_data, pending = pending.result(), None
+                else:
+                    raw_data = self._get_result(_SEARCH_PATH, _search_params(keyword, page, page_size, self._search_hints), cache)
+        finally:
+            if pending is not None:
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+
+
+_default_client: LCSCClient | None = None
+_default_client_lock = threading.Lock()
+
+def get_default_client() -> LCSCClient:
+    """
+    Returns the shared client used by the module-level functions, creating it on first use.
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = LCSCClient()
+    return _default_client
+
+
+
+def set_default_client(client: LCSCClient) -> None:
+    """
+    Replaces the shared client used by the module-level functions (e.g. to change headers, timeouts or pool size).
+
+    ## Parameters
+    - `client` ( *LCSCClient* ) - The client to use from now on.
+    """
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
@@ -0,0 +1,360 @@
+"""
+src/lcsc/crawler.py
+
+Multiprocess crawler that mirrors whole catalogs into SQLite, sharded by catalog ID, with checkpoint/resume.
+"""
+import json
+import os
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator
+from ._json import loads
+from .client import _BASE_URL, _SEARCH_PATH, LCSCClient, _search_params
+from .types import CatalogDetails, ProductDetails
+
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shards (
+    catalog_id   INTEGER PRIMARY KEY,
+    catalog_name TEXT NOT NULL,
+    next_page    INTEGER NOT NULL DEFAULT 1,
+    total_pages  INTEGER,
+    done         INTEGER NOT NULL DEFAULT 0,
+    owner        TEXT,
+    error        TEXT,
+    products     INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS products (
+    product_code TEXT PRIMARY KEY,
+    catalog_id   INTEGER NOT NULL,
+    crawled      REAL NOT NULL,
+    data         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_catalog ON products (catalog_id);
+"""
+
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+
+class _ShardWorker:
+    """
+    Claims pending shards from the crawl database one at a time and pages through each of them.
+    """
+    def __init__(self, path: str, owner: str, client: LCSCClient, page_size: int, concurrency: int, follow: bool) -> None:
+        self._conn = _connect(path)
+        self._owner = owner
+        self._client = client
+        self._page_size = page_size
+        self._concurrency = concurrency
+        self._follow = follow
+
+    def run(self) -> None:
+        while True:
+            shard = self._claim()
+            if shard is None:
+                return
+            catalog_id = shard[0]
+            try:
+                self._crawl(*shard)
+            except Exception as e:
+                self._conn.execute("UPDATE shards SET owner = NULL, error = ? WHERE catalog_id = ?", (f"{type(e).__name__}: {e}", catalog_id))
+
+    def _claim(self) -> tuple[int, str, int, int | None] | None:
+        """
+        Atomically takes the next unclaimed, unfinished shard that hasn't failed in this run.
+        """
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT catalog_id, catalog_name, next_page, total_pages FROM shards WHERE done = 0 AND owner IS NULL AND error IS NULL ORDER BY catalog_id LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE shards SET owner = ? WHERE catalog_id = ?", (self._owner, row[0]))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return row
+
+    def _fetch(self, keyword: str, page: int) -> dict:
+        return self._client._get_result(_SEARCH_PATH, _search_params(keyword, page, self._page_size, self._client.search_hints))
+
+    def _crawl(self, catalog_id: int, catalog_name: str, next_page: int, total_pages: int | None) -> None:
+        """
+        Fetches the shard's remaining pages, up to `concurrency` at a time, and commits them in page order. The first
+        failed page stops the shard.
+
+        The checkpoint (`next_page`) only moves past a page once its products are stored, in the same transaction,
+        so a crash re-fetches at most the pages that were in flight.
+        """
+        if total_pages is None:
+            raw_data = self._fetch(catalog_name, next_page)
+            search_vo = raw_data["productSearchResultVO"]
+            total_pages = search_vo.get("totalPage")
+            has_next = len(search_vo["productList"]) >= self._page_size
+            done = not has_next or (total_pages is not None and next_page >= total_pages)
+            self._store(catalog_id, next_page, total_pages, raw_data, done)
+            if done:
+                return
+            next_page += 1
+        if total_pages is None:
+            # No page count from the API: walk sequentially until a short page.
+            while True:
+                raw_data = self._fetch(catalog_name, next_page)
+                short = len(raw_data["productSearchResultVO"]["productList"]) < self._page_size
+                self._store(catalog_id, next_page, None, raw_data, done=short)
+                if short:
+                    return
+                next_page += 1
+        if next_page > total_pages:
+            self._store(catalog_id, next_page - 1, total_pages, None, done=True)
+            return
+        # At most two pages per thread are in flight or waiting for their turn, so a failed page stops the shard
+        # without the rest of it being fetched (and thrown away), and out-of-order pages can't pile up in memory.
+        executor = ThreadPoolExecutor(max_workers=self._concurrency)
+        pending: deque[tuple[int, Future]] = deque()
+        pages = iter(range(next_page, total_pages + 1))
+        try:
+            while True:
+                while len(pending) < self._concurrency * 2 and (page := next(pages, None)) is not None:
+                    pending.append((page, executor.submit(self._fetch, catalog_name, page)))
+                if not pending:
+                    return
+                page, future = pending.popleft()
+                self._store(catalog_id, page, total_pages, future.result(), done=page == total_pages)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _store(self, catalog_id: int, page: int, total_pages: int | None, raw_data: dict | None, done: bool) -> None:
+        """
+        Stores the shard's hits from one page and advances its checkpoint, in one transaction.
+
+        Hits from other catalogs are dropped (the keyword search is fuzzy), but with `follow` their catalogs become new shards.
+        """
+        conn = self._conn
+        now = time.time()
+        rows, seen = [], {}
+        for data in raw_data["productSearchResultVO"]["productList"] if raw_data is not None else ():
+            if int(data["catalogId"]) == catalog_id:
+                rows.append((data["productCode"], catalog_id, now, json.dumps(data, separators=(",", ":"))))
+            elif self._follow:
+                seen[int(data["catalogId"])] = data["catalogName"]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("INSERT OR REPLACE INTO products (product_code, catalog_id, crawled, data) VALUES (?, ?, ?, ?)", rows)
+            conn.executemany("INSERT OR IGNORE INTO shards (catalog_id, catalog_name) VALUES (?, ?)", seen.items())
+            if done:
+                conn.execute(
+                    "UPDATE shards SET next_page = ?, total_pages = ?, done = 1, owner = NULL, products = (SELECT COUNT(*) FROM products WHERE catalog_id = ?) WHERE catalog_id = ?",
+                    (page + 1, total_pages, catalog_id, catalog_id),
+                )
+            else:
+                conn.execute("UPDATE shards SET next_page = ?, total_pages = ? WHERE catalog_id = ?", (page + 1, total_pages, catalog_id))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        self._conn.close()
+        self._client.close()
+
+
+
+def _run_worker(path: str, owner: str, page_size: int, concurrency: int, follow: bool, rate: float | None, client_options: dict) -> None:
+    """
+    Entry point of a crawler worker process: builds its own client (sharing the crawl's rate limit) and works through shards.
+    """
+    from .ratelimit import SQLiteTokenBucket
+    limiter = SQLiteTokenBucket(path, rate, name="crawler") if rate else None
+    client = LCSCClient(pool_size=concurrency, keep_raw=False, coalesce=False, rate_limiter=limiter, **client_options)
+    worker = _ShardWorker(path, owner, client, page_size, concurrency, follow)
+    try:
+        worker.run()
+    finally:
+        worker.close()
+        if limiter is not None:
+            limiter.close()
+
+
+
+class Crawler:
+    """
+    Mirrors whole catalogs into a local SQLite database, one shard per catalog ID, spread across worker processes.
+
+    There is no catalog listing endpoint, so each shard searches for its catalog's name and keeps the hits whose
+    catalog ID matches. Catalogs come from `add_catalogs()` (e.g. the `CatalogDetails` of products you already have)
+    or `discover()`, and with `follow` every catalog seen in a crawled page is added as a new shard too, so the crawl
+    spreads to related catalogs on its own.
+
+    Workers claim shards from the database, page through each with up to `concurrency` requests in flight, and
+    commit every page together with the shard's checkpoint. If a crawl is interrupted, `run()` resumes every
+    unfinished shard from its last committed page. All workers share one request rate limit (see: `SQLiteTokenBucket`).
+
+    ## Parameters
+    - `path` ( *str* ) - The crawl database (shards, checkpoints and products). Created if it doesn't exist.
+    - `processes` ( *int*, *optional* ) - Number of worker processes. `0` crawls in the calling process.
+    - `concurrency` ( *int*, *optional* ) - Pages in flight per worker.
+    - `page_size` ( *int*, *optional* ) - Hits requested per page.
+    - `rate` ( *float*, *optional* ) - Maximum requests per second across all workers. Pass `None` for no limit.
+    - `follow` ( *bool*, *optional* ) - Add the catalogs of off-catalog hits as new shards.
+    - `base_url` ( *str*, *optional* ) - Root URL of the API.
+    - `client_options` ( *dict*, *optional* ) - Extra (picklable) keyword arguments for each worker's `LCSCClient`, e.g. `timeout` or `retry`.
+
+    ## Example
+    ```python
+    >>> crawler = lcsc.Crawler("mirror.sqlite3", processes=4, rate=20)
+    >>> crawler.discover(["resistor", "capacitor", "diode"])
+    >>> crawler.run()  # safe to interrupt; run() again to resume
+    >>> lcsc.write_parquet(crawler.iter_products(), "mirror.parquet")
+    ```
+    """
+    def __init__(self, path: str, processes: int = 4, concurrency: int = 4, page_size: int = 100, rate: float | None = 10.0, follow: bool = True, base_url: str = _BASE_URL, client_options: dict | None = None) -> None:
+        self._path = str(path)
+        self._processes = processes
+        self._concurrency = concurrency
+        self._page_size = page_size
+        self._rate = rate
+        self._follow = follow
+        self._client_options = dict(client_options or {}, base_url=base_url)
+        self._conn = _connect(self._path)
+        self._conn.executescript(_SCHEMA)
+
+    @property
+    def path(self) -> str:
+        """
+        Path to the crawl database.
+        """
+        return self._path
+
+    @property
+    def processes(self) -> int:
+        """
+        Number of worker processes (`0` crawls in the calling process).
+        """
+        return self._processes
+
+    def add_catalogs(self, catalogs: Iterable[CatalogDetails | tuple[int, str]]) -> int:
+        """
+        Adds catalogs to crawl. Catalogs that already have a shard are left as they are.
+
+        ## Parameters
+        - `catalogs` ( *Iterable[CatalogDetails | tuple[int, str]]* ) - `CatalogDetails` (e.g. `details.catalog`) or `(id, name)` pairs.
+
+        ## Returns
+        - `added` ( *int* ) - The number of new shards.
+        """
+        rows = [(c.id, c.name) if isinstance(c, CatalogDetails) else (int(c[0]), str(c[1])) for c in catalogs]
+        before = self._conn.total_changes
+        self._conn.executemany("INSERT OR IGNORE INTO shards (catalog_id, catalog_name) VALUES (?, ?)", rows)
+        return self._conn.total_changes - before
+
+    def discover(self, keywords: Iterable[str], client: LCSCClient | None = None) -> int:
+        """
+        Searches each keyword (first page only) and adds the catalog of every hit.
+
+        ## Parameters
+        - `keywords` ( *Iterable[str]* ) - Seed search queries.
+        - `client` ( *LCSCClient*, *optional* ) - The client to search with. Defaults to a new one with the crawler's `base_url`.
+
+        ## Returns
+        - `added` ( *int* ) - The number of new shards.
+        """
+        own_client = client is None
+        client = client if client is not None else LCSCClient(**self._client_options)
+        try:
+            catalogs = {}
+            for keyword in keywords:
+                for result in client.iter_search_results(keyword, page_size=self._page_size, limit=self._page_size, prefetch=False):
+                    catalog = result.product_details.catalog
+                    catalogs[catalog.id] = catalog
+        finally:
+            if own_client:
+                client.close()
+        return self.add_catalogs(catalogs.values())
+
+    def run(self) -> dict[str, int]:
+        """
+        Crawls every unfinished shard, resuming each from its checkpoint, and returns once no shard is left to claim.
+
+        Shards that failed (after the client's retries) are recorded with their error and left unfinished; they are
+        retried by the next `run()`.
+
+        ## Returns
+        - `progress` ( *dict[str, int]* ) - See: `progress()`.
+        """
+        # Any claim in the database belongs to a previous run that didn't finish.
+        self._conn.execute("UPDATE shards SET owner = NULL, error = NULL WHERE done = 0")
+        args = (self._path, self._page_size, self._concurrency, self._follow, self._rate, self._client_options)
+        if self._processes <= 0:
+            _run_worker(self._path, f"{os.getpid()}-0", *args[1:])
+        else:
+            import multiprocessing
+            context = multiprocessing.get_context("spawn")
+            workers = [context.Process(target=_run_worker, args=(self._path, f"{os.getpid()}-{i}", *args[1:]), daemon=True) for i in range(self._processes)]
+            for worker in workers:
+                worker.start()
+            try:
+                for worker in workers:
+                    worker.join()
+            finally:
+                for worker in workers:
+                    if worker.is_alive():
+                        worker.terminate()
+        return self.progress()
+
+    def progress(self) -> dict[str, int]:
+        """
+        Summarizes the crawl.
+
+        ## Keys
+        - `shards` ( *int* ) - Known catalogs.
+        - `done` ( *int* ) - Fully crawled catalogs.
+        - `failed` ( *int* ) - Unfinished catalogs whose last attempt failed.
+        - `products` ( *int* ) - Stored products.
+        """
+        shards, done, failed = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(done), 0), COALESCE(SUM(error IS NOT NULL AND done = 0), 0) FROM shards").fetchone()
+        products = self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+        return {"shards": shards, "done": done, "failed": failed, "products": products}
+
+    def errors(self) -> dict[int, str]:
+        """
+        Maps the ID of every unfinished catalog whose last attempt failed to its error message.
+        """
+        return dict(self._conn.execute("SELECT catalog_id, error FROM shards WHERE done = 0 AND error IS NOT NULL"))
+
+    def iter_products(self, catalog_id: int | None = None, keep_raw: bool = True) -> Iterator[ProductDetails]:
+        """
+        Yields the stored products, ordered by part code, without loading them all into memory.
+
+        ## Parameters
+        - `catalog_id` ( *int*, *optional* ) - Only yield products of this catalog.
+        - `keep_raw` ( *bool*, *optional* ) - Whether the products keep their full raw payload (see: `ProductDetails`).
+        """
+        conn = _connect(self._path)
+        try:
+            if catalog_id is None:
+                rows = conn.execute("SELECT data FROM products ORDER BY product_code")
+            else:
+                rows = conn.execute("SELECT data FROM products WHERE catalog_id = ? ORDER BY product_code", (catalog_id,))
+            for (data,) in rows:
+                yield ProductDetails(loads(data), keep_raw)
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        """
+        Closes the crawler's connection to the database.
+        """
+        self._conn.close()
@@ -0,0 +1,330 @@
+"""
+src/lcsc/download.py
+
+Concurrent, resumable downloads of datasheets and product images into a content-addressed file store.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+from .errors import LCSCHTTPError
+from .ratelimit import RetryPolicy, TokenBucket, _is_throttled, _parse_retry_after
+from .singleflight import SingleFlight
+from .transport import _HEADERS
+from .types import ProductDetails
+if TYPE_CHECKING:
+    import requests
+
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url          TEXT PRIMARY KEY,
+    sha256       TEXT NOT NULL,
+    size         INTEGER NOT NULL,
+    content_type TEXT,
+    fetched      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS urls_sha256 ON urls (sha256);
+"""
+
+
+
+class Download(NamedTuple):
+    """
+    A file in a `Downloader`'s store.
+
+    ## Attributes
+    - `url` ( *str* ) - The URL it was downloaded from.
+    - `sha256` ( *str* ) - The hex SHA-256 of its content, which names the stored file.
+    - `path` ( *str* ) - The stored file. Shared by every URL with the same content.
+    - `size` ( *int* ) - Its size in bytes.
+    - `content_type` ( *str | None* ) - The `Content-Type` the server sent.
+    - `transferred` ( *int* ) - Bytes received by this call: `0` if the URL was already stored, less than `size` if an interrupted transfer was resumed.
+    """
+    url: str
+    sha256: str
+    path: str
+    size: int
+    content_type: str | None
+    transferred: int
+
+
+
+def _range_start(content_range: str | None) -> int | None:
+    """
+    Returns the first byte position of a `Content-Range: bytes <start>-<end>/<size>` header, or `None` if it is missing or malformed.
+    """
+    if not content_range or not content_range.startswith("bytes "):
+        return None
+    try:
+        return int(content_range[6:].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+
+class Downloader:
+    """
+    Downloads files such as `ProductDetails.datasheet_url` and `image_urls` concurrently into a content-addressed store.
+
+    Bodies are streamed to disk in `chunk_size` pieces and hashed on the way, then moved to
+    `objects/<sha256[:2]>/<sha256>` under `directory`. A file served under many URLs (e.g. a datasheet shared by
+    every variant of a part) is stored once. An SQLite index maps each URL to its file, so a URL that is already
+    stored is not requested again, and concurrent requests for one URL are coalesced into a single transfer.
+
+    An interrupted transfer leaves its bytes in `partial/`. The next attempt (a retry, or a later call) resumes it
+    with a `Range` request, guarded by `If-Range` with the server's `ETag` or `Last-Modified`, and starts over if
+    the server sends the whole file instead.
+
+    ## Parameters
+    - `directory` ( *str* ) - Root of the store. Created if it doesn't exist.
+    - `max_workers` ( *int*, *optional* ) - Maximum number of concurrent transfers.
+    - `chunk_size` ( *int*, *optional* ) - Bytes read from the network and written to disk at a time.
+    - `timeout` ( *float* | *tuple[float, float]*, *optional* ) - Request timeout in seconds, or a `(connect, read)` tuple. The read timeout applies between chunks.
+    - `headers` ( *dict*, *optional* ) - Extra headers to send with every request.
+    - `rate_limiter` ( *TokenBucket*, *optional* ) - Taken from before every request.
+    - `retry` ( *RetryPolicy*, *optional* ) - When to retry failed transfers. `None` disables retries.
+
+    ## Example
+    ```python
+    >>> downloader = lcsc.Downloader("files", max_workers=8)
+    >>> files = downloader.download_products(client.get_product_details_many(codes).values())
+    >>> files["C111887"][0].path  # the datasheet
+    ```
+    """
+    def __init__(self, directory: str, max_workers: int = 8, chunk_size: int = 1 << 16, timeout: float | tuple[float, float] | None = (5.0, 60.0), headers: dict | None = None, rate_limiter: TokenBucket | None = None, retry: RetryPolicy | None = RetryPolicy()) -> None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._directory = str(directory)
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+        self._timeout = timeout
+        self._rate_limiter = rate_limiter
+        self._retry = retry
+        self._network_errors = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+        self._session = requests.Session()
+        self._session.headers.update(_HEADERS)
+        self._session.headers["Accept"] = "*/*"
+        if headers:
+            self._session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._flight = SingleFlight()
+        self._local = threading.local()
+        os.makedirs(os.path.join(self._directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(self._directory, "partial"), exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+
+    @property
+    def directory(self) -> str:
+        """
+        Root of the store.
+        """
+        return self._directory
+
+    @property
+    def session(self) -> "requests.Session":
+        """
+        The underlying `requests.Session`.
+        """
+        return self._session
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns this thread's connection to the URL index, opening it on first use.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self._directory, "index.sqlite3"), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def object_path(self, sha256: str) -> str:
+        """
+        Returns where the file with this content hash is (or would be) stored.
+        """
+        return os.path.join(self._directory, "objects", sha256[:2], sha256)
+
+    def get(self, url: str) -> Download | None:
+        """
+        Returns the stored file for `url`, or `None` if it hasn't been downloaded (or its file has been deleted).
+        """
+        row = self._connect().execute("SELECT sha256, size, content_type FROM urls WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        path = self.object_path(row[0])
+        if not os.path.exists(path):
+            return None
+        return Download(url, row[0], path, row[1], row[2], 0)
+
+    def __contains__(self, url: str) -> bool:
+        return self.get(url) is not None
+
+    def download(self, url: str, refresh: bool = False) -> Download:
+        """
+        Downloads `url` into the store, unless it is already there.
+
+        ## Parameters
+        - `url` ( *str* ) - The file's URL.
+        - `refresh` ( *bool*, *optional* ) - Download it again even if it is stored.
+
+        ## Returns
+        - `download` ( *Download* ) - The stored file.
+        """
+        if not refresh:
+            stored = self.get(url)
+            if stored is not None:
+                return stored
+        return self._flight.do(url, self._fetch, url)
+
+    def download_many(self, urls: Iterable[str], refresh: bool = False) -> dict[str, Download | Exception]:
+        """
+        Downloads many URLs concurrently. Repeated URLs are only downloaded once, and a failure does not stop the batch.
+
+        ## Parameters
+        - `urls` ( *Iterable[str]* ) - The URLs to download. Empty strings are skipped.
+        - `refresh` ( *bool*, *optional* ) - Download them again even if they are stored.
+
+        ## Returns
+        - `results` ( *dict[str, Download | Exception]* ) - Maps each URL, in input order, to its stored file or to the exception raised while downloading it.
+        """
+        urls = [url for url in dict.fromkeys(urls) if url]
+        results: dict[str, Download | Exception] = {}
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = {executor.submit(self.download, url, refresh): url for url in urls}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = e
+        return {url: results[url] for url in urls}
+
+    def download_products(self, products: Iterable[ProductDetails], datasheets: bool = True, images: bool = True) -> dict[str, list[Download | Exception]]:
+        """
+        Downloads the datasheets and images of many products concurrently. Files shared between products are downloaded once.
+
+        ## Parameters
+        - `products` ( *Iterable[ProductDetails]* ) - The products. Anything else (e.g. exceptions from `get_product_details_many`) is skipped.
+        - `datasheets` ( *bool*, *optional* ) - Download `datasheet_url`.
+        - `images` ( *bool*, *optional* ) - Download `image_urls`.
+
+        ## Returns
+        - `files` ( *dict[str, list[Download | Exception]]* ) - Maps each product code to its results: the datasheet first, then the images in order.
+        """
+        wanted = {}
+        for details in products:
+            if isinstance(details, ProductDetails):
+                urls = ([details.datasheet_url] if datasheets else []) + (list(details.image_urls) if images else [])
+                wanted[details.product_code] = [url for url in urls if url]
+        results = self.download_many(url for urls in wanted.values() for url in urls)
+        return {code: [results[url] for url in urls] for code, urls in wanted.items()}
+
+    def _fetch(self, url: str) -> Download:
+        """
+        Transfers `url` into the store, resuming any partial transfer. Each request first waits for the rate limiter,
+        failures are retried as the retry policy allows, and a partial file the server can't resume is restarted from scratch.
+        """
+        key = hashlib.sha256(url.encode()).hexdigest()[:32]
+        partial = os.path.join(self._directory, "partial", key)
+        received = [0]
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            try:
+                result = self._transfer(url, partial, received)
+                if result is not None:
+                    break
+            except (LCSCHTTPError, *self._network_errors) as e:
+                delay = self._retry.get_delay("GET", e, attempt) if self._retry is not None else None
+                if delay is None:
+                    raise
+                if self._rate_limiter is not None and _is_throttled(e):
+                    self._rate_limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+                attempt += 1
+        sha256, size, content_type = result
+        path = self.object_path(sha256)
+        if os.path.exists(path):
+            os.remove(partial)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(partial, path)
+        self._connect().execute(
+            "INSERT OR REPLACE INTO urls (url, sha256, size, content_type, fetched) VALUES (?, ?, ?, ?, ?)",
+            (url, sha256, size, content_type, time.time()),
+        )
+        return Download(url, sha256, path, size, content_type, received[0])
+
+    def _transfer(self, url: str, partial: str, received: list[int]) -> tuple[str, int, str | None] | None:
+        """
+        Makes one request, appending to the partial file if the server honours the `Range`, and returns the complete
+        file's `(sha256, size, content_type)`. Bytes are counted into `received[0]` as they are written, so that they
+        are counted even when the transfer breaks off.
+
+        Returns `None` if the partial file doesn't line up with what the server has (e.g. it changed). The partial
+        file is then discarded, and the next request starts over.
+        """
+        meta_path = partial + ".json"
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            try:
+                with open(meta_path) as f:
+                    validator = json.load(f).get("validator")
+            except (OSError, ValueError):
+                validator = None
+            if validator:
+                headers["If-Range"] = validator
+        with self._session.get(url, headers=headers, stream=True, timeout=self._timeout) as response:
+            status = response.status_code
+            resumed = status == 206 and offset > 0
+            restart = offset > 0 and (status == 416 or (resumed and _range_start(response.headers.get("Content-Range")) != offset))
+            if not restart:
+                # A `206` without a `Range` in the request can't be appended to anything.
+                if status >= 400 or (status == 206 and not resumed):
+                    raise LCSCHTTPError(status, url, _parse_retry_after(response.headers.get("Retry-After")))
+                hasher = hashlib.sha256()
+                if resumed:
+                    with open(partial, "rb") as f:
+                        while chunk := f.read(1 << 20):
+                            hasher.update(chunk)
+                    mode = "ab"
+                else:
+                    offset, mode = 0, "wb"
+                    validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+                    with open(meta_path, "w") as f:
+                        json.dump({"url": url, "validator": validator}, f)
+                with open(partial, mode) as f:
+                    for chunk in response.iter_content(self._chunk_size):
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        offset += len(chunk)
+                        received[0] += len(chunk)
+                content_type = response.headers.get("Content-Type")
+        if restart:
+            os.remove(partial)
+            return None
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        return hasher.hexdigest(), offset, content_type
+
+    def close(self) -> None:
+        """
+        Closes the HTTP session and this thread's connection to the URL index.
+        """
+        self._session.close()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
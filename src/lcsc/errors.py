@@ -0,0 +1,51 @@
+"""
+src/lcsc/errors.py
+
+Exception types for the `lcsc` package.
+"""
+
+
+
+class LCSCError(Exception):
+    """
+    Base class for all errors raised by the `lcsc` package.
+    """
+
+
+
+class CacheMissError(LCSCError, LookupError):
+    """
+    Raised when a request is made with `cache="only"` and no fresh cached response exists.
+    """
+
+
+
+class LCSCHTTPError(LCSCError):
+    """
+    Raised when the API answers with an HTTP error status (after any retries).
+
+    ## Attributes
+    - `status` ( *int* ) - The HTTP status code.
+    - `url` ( *str* ) - The requested URL.
+    - `retry_after` ( *float* | *None* ) - Seconds the server asked to wait (from `Retry-After`), if any.
+    """
+    def __init__(self, status: int, url: str, retry_after: float | None = None) -> None:
+        super().__init__(f"HTTP {status} from {url}.")
+        self.status = status
+        self.url = url
+        self.retry_after = retry_after
+
+
+
+class LCSCResponseError(LCSCError, ValueError):
+    """
+    Raised when a response body is not JSON, or has no `result` member (e.g. the API reported an error).
+
+    ## Attributes
+    - `url` ( *str* ) - The requested URL.
+    - `is_json` ( *bool* ) - Whether the body was valid JSON (an API-level error) rather than e.g. an HTML error page.
+    """
+    def __init__(self, message: str, url: str, is_json: bool) -> None:
+        super().__init__(message)
+        self.url = url
+        self.is_json = is_json
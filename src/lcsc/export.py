@@ -0,0 +1,302 @@
+"""
+src/lcsc/export.py
+
+Streaming export of products and search results to NDJSON, CSV, Parquet and Arrow.
+"""
+import csv
+import json
+import os
+from typing import IO, TYPE_CHECKING, Iterable, Iterator
+from .types import ProductDetails, SearchResult
+if TYPE_CHECKING:
+    import pyarrow
+
+
+
+# `(column, arrow type name)` of the columns every exported row has, before the price and spec columns.
+_BASE_COLUMNS = (
+    ("product_id", "int64"),
+    ("product_code", "string"),
+    ("product_url", "string"),
+    ("product_model", "string"),
+    ("product_title", "string"),
+    ("parent_catalog_id", "int64"),
+    ("parent_catalog_name", "string"),
+    ("catalog_id", "int64"),
+    ("catalog_name", "string"),
+    ("brand_id", "int64"),
+    ("brand_name", "string"),
+    ("split_quantity", "int64"),
+    ("min_quantity", "int64"),
+    ("is_hot", "bool_"),
+    ("stock", "int64"),
+    ("datasheet_url", "string"),
+    ("description", "string"),
+    ("image_urls", "string"),
+    ("search_index", "int64"),
+    ("on_discount", "bool_"),
+)
+
+
+
+def _unwrap(item: ProductDetails | SearchResult) -> tuple[ProductDetails, int | None, bool | None]:
+    """
+    Returns `(details, search_index, on_discount)` for a product or a search result.
+    """
+    if isinstance(item, SearchResult):
+        return item.product_details, item.index, item.on_discount
+    return item, None, None
+
+
+def _base_values(details: ProductDetails, search_index: int | None, on_discount: bool | None) -> list:
+    parent_catalog, catalog, brand = details.parent_catalog, details.catalog, details.brand
+    return [
+        details.product_id,
+        details.product_code,
+        details.product_url,
+        details.product_model,
+        details.product_title,
+        parent_catalog.id,
+        parent_catalog.name,
+        catalog.id,
+        catalog.name,
+        brand.id,
+        brand.name,
+        details.split_quantity,
+        details.min_quantity,
+        details.is_hot,
+        details.stock,
+        details.datasheet_url,
+        details.description,
+        " ".join(details.image_urls or ()),
+        search_index,
+        on_discount,
+    ]
+
+
+def _columns(max_price_breaks: int, spec_codes: Iterable[str] | None) -> list[tuple[str, str]]:
+    """
+    Returns the fixed `(column, arrow type name)` layout used by the CSV, Parquet and Arrow writers.
+    """
+    columns = list(_BASE_COLUMNS)
+    for i in range(1, max_price_breaks + 1):
+        columns += [(f"price_{i}_quantity", "int64"), (f"price_{i}_usd", "float64")]
+    if spec_codes is None:
+        columns.append(("specs", "string"))
+    else:
+        columns += [(f"spec_{code}", "string") for code in spec_codes]
+    return columns
+
+
+def _row(item: ProductDetails | SearchResult, max_price_breaks: int, spec_codes: list[str] | None) -> list:
+    """
+    Flattens one item into a list of values matching `_columns(max_price_breaks, spec_codes)`.
+    """
+    details, search_index, on_discount = _unwrap(item)
+    row = _base_values(details, search_index, on_discount)
+    breaks = details._sorted_price_breaks()
+    price = details.price
+    for i in range(max_price_breaks):
+        if i < len(breaks):
+            row += [breaks[i], price[breaks[i]].price]
+        else:
+            row += [None, None]
+    specs = {s.code: s.value for s in details.specs}
+    if spec_codes is None:
+        row.append(json.dumps(specs, ensure_ascii=False, separators=(",", ":")))
+    else:
+        row += [specs.get(code) for code in spec_codes]
+    return row
+
+
+
+def flatten_product(item: ProductDetails | SearchResult, max_price_breaks: int | None = None, spec_codes: Iterable[str] | None = None) -> dict[str, str | int | float | bool | None]:
+    """
+    Flattens a product or search result into a single-level dictionary.
+
+    The price ladder becomes `price_<n>_quantity` / `price_<n>_usd` columns in ascending quantity order (`n` starts at 1),
+    and each spec becomes a `spec_<code>` column holding its raw value. `search_index` and `on_discount` are `None` for
+    plain `ProductDetails`.
+
+    ## Parameters
+    - `item` ( *ProductDetails* | *SearchResult* ) - The item to flatten.
+    - `max_price_breaks` ( *int*, *optional* ) - Number of price-ladder columns; missing breaks are `None`. Defaults to the product's own ladder length.
+    - `spec_codes` ( *Iterable[str]*, *optional* ) - Spec codes to emit columns for, in order. Defaults to every spec the product has.
+
+    ## Returns
+    - `row` ( *dict[str, str | int | float | bool | None]* ) - The flattened item.
+    """
+    details, search_index, on_discount = _unwrap(item)
+    row = dict(zip((name for name, _ in _BASE_COLUMNS), _base_values(details, search_index, on_discount)))
+    breaks = details._sorted_price_breaks()
+    price = details.price
+    for i in range(len(breaks) if max_price_breaks is None else max_price_breaks):
+        row[f"price_{i + 1}_quantity"] = breaks[i] if i < len(breaks) else None
+        row[f"price_{i + 1}_usd"] = price[breaks[i]].price if i < len(breaks) else None
+    if spec_codes is None:
+        for spec in details.specs:
+            row[f"spec_{spec.code}"] = spec.value
+    else:
+        specs = {s.code: s.value for s in details.specs}
+        for code in spec_codes:
+            row[f"spec_{code}"] = specs.get(code)
+    return row
+
+
+
+def write_ndjson(items: Iterable[ProductDetails | SearchResult], file: str | os.PathLike | IO[str], max_price_breaks: int | None = None, spec_codes: Iterable[str] | None = None) -> int:
+    """
+    Streams items to a newline-delimited JSON file, one flattened object per line (see: `flatten_product`).
+
+    Rows are written as the iterator yields them, so memory use doesn't grow with the number of rows.
+
+    ## Parameters
+    - `items` ( *Iterable[ProductDetails | SearchResult]* ) - The items to export (e.g. `lcsc.iter_search_results(...)`).
+    - `file` ( *str* | *PathLike* | *IO[str]* ) - Path to the output file, or an open text file.
+    - `max_price_breaks` ( *int*, *optional* ) - Number of price-ladder columns. Defaults to each product's own ladder length.
+    - `spec_codes` ( *Iterable[str]*, *optional* ) - Spec codes to emit columns for. Defaults to every spec each product has.
+
+    ## Returns
+    - `count` ( *int* ) - The number of rows written.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "w", encoding="utf-8") as f:
+            return write_ndjson(items, f, max_price_breaks, spec_codes)
+    spec_codes = None if spec_codes is None else list(spec_codes)
+    count = 0
+    for item in items:
+        file.write(json.dumps(flatten_product(item, max_price_breaks, spec_codes), ensure_ascii=False, separators=(",", ":")))
+        file.write("\n")
+        count += 1
+    return count
+
+
+
+def write_csv(items: Iterable[ProductDetails | SearchResult], file: str | os.PathLike | IO[str], max_price_breaks: int = 8, spec_codes: Iterable[str] | None = None) -> int:
+    """
+    Streams items to a CSV file with a header row and one flattened row per item.
+
+    A CSV needs its columns up front, so the price ladder is cut to `max_price_breaks` breaks, and specs go either into
+    one `spec_<code>` column per code in `spec_codes`, or (if `spec_codes` isn't given) into a single `specs` column
+    holding a JSON object of `{code: value}`.
+
+    ## Parameters
+    - `items` ( *Iterable[ProductDetails | SearchResult]* ) - The items to export.
+    - `file` ( *str* | *PathLike* | *IO[str]* ) - Path to the output file, or an open text file (opened with `newline=""`).
+    - `max_price_breaks` ( *int*, *optional* ) - Number of price-ladder columns; extra breaks are dropped, missing ones left empty.
+    - `spec_codes` ( *Iterable[str]*, *optional* ) - Spec codes to emit columns for, in order.
+
+    ## Returns
+    - `count` ( *int* ) - The number of rows written.
+
+    ## Example
+    ```python
+    >>> lcsc.write_csv(lcsc.iter_search_results("L7805"), "l7805.csv", spec_codes=["param_10953_n"])
+    ```
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "w", newline="", encoding="utf-8") as f:
+            return write_csv(items, f, max_price_breaks, spec_codes)
+    spec_codes = None if spec_codes is None else list(spec_codes)
+    writer = csv.writer(file)
+    writer.writerow([name for name, _ in _columns(max_price_breaks, spec_codes)])
+    count = 0
+    for item in items:
+        writer.writerow(_row(item, max_price_breaks, spec_codes))
+        count += 1
+    return count
+
+
+
+def iter_record_batches(items: Iterable[ProductDetails | SearchResult], batch_size: int = 10_000, max_price_breaks: int = 8, spec_codes: Iterable[str] | None = None) -> Iterator["pyarrow.RecordBatch"]:
+    """
+    Converts items into Arrow record batches of at most `batch_size` rows, using the same columns as `write_csv`.
+
+    Requires the optional `pyarrow` dependency (`pip install "lcsc[arrow]"`).
+
+    ## Parameters
+    - `items` ( *Iterable[ProductDetails | SearchResult]* ) - The items to convert.
+    - `batch_size` ( *int*, *optional* ) - Maximum number of rows per batch. Only one batch is held in memory at a time.
+    - `max_price_breaks` ( *int*, *optional* ) - Number of price-ladder columns.
+    - `spec_codes` ( *Iterable[str]*, *optional* ) - Spec codes to emit columns for, in order.
+
+    ## Yields
+    - `batch` ( *pyarrow.RecordBatch* ) - The next batch of rows.
+    """
+    import pyarrow as pa
+    spec_codes = None if spec_codes is None else list(spec_codes)
+    schema = _schema(pa, max_price_breaks, spec_codes)
+    rows = []
+    for item in items:
+        rows.append(_row(item, max_price_breaks, spec_codes))
+        if len(rows) >= batch_size:
+            yield _record_batch(pa, schema, rows)
+            rows = []
+    if rows:
+        yield _record_batch(pa, schema, rows)
+
+
+def _schema(pa, max_price_breaks: int, spec_codes: list[str] | None) -> "pyarrow.Schema":
+    return pa.schema([(name, getattr(pa, type_name)()) for name, type_name in _columns(max_price_breaks, spec_codes)])
+
+
+def _record_batch(pa, schema: "pyarrow.Schema", rows: list[list]) -> "pyarrow.RecordBatch":
+    return pa.RecordBatch.from_arrays([pa.array(column, type=field.type) for column, field in zip(zip(*rows), schema)], schema=schema)
+
+
+
+def write_parquet(items: Iterable[ProductDetails | SearchResult], file: str | os.PathLike | IO[bytes], batch_size: int = 10_000, max_price_breaks: int = 8, spec_codes: Iterable[str] | None = None, compression: str = "zstd") -> int:
+    """
+    Streams items to a Parquet file, one row group per batch of `batch_size` rows (see: `iter_record_batches`).
+
+    Requires the optional `pyarrow` dependency (`pip install "lcsc[arrow]"`).
+
+    ## Parameters
+    - `items` ( *Iterable[ProductDetails | SearchResult]* ) - The items to export.
+    - `file` ( *str* | *PathLike* | *IO[bytes]* ) - Path to the output file, or an open binary file.
+    - `batch_size` ( *int*, *optional* ) - Rows per row group. Only one batch is held in memory at a time.
+    - `max_price_breaks` ( *int*, *optional* ) - Number of price-ladder columns.
+    - `spec_codes` ( *Iterable[str]*, *optional* ) - Spec codes to emit columns for, in order.
+    - `compression` ( *str*, *optional* ) - The Parquet compression codec.
+
+    ## Returns
+    - `count` ( *int* ) - The number of rows written.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    spec_codes = None if spec_codes is None else list(spec_codes)
+    count = 0
+    with pq.ParquetWriter(file, _schema(pa, max_price_breaks, spec_codes), compression=compression) as writer:
+        for batch in iter_record_batches(items, batch_size, max_price_breaks, spec_codes):
+            writer.write_batch(batch)
+            count += batch.num_rows
+    return count
+
+
+
+def write_arrow(items: Iterable[ProductDetails | SearchResult], file: str | os.PathLike | IO[bytes], batch_size: int = 10_000, max_price_breaks: int = 8, spec_codes: Iterable[str] | None = None) -> int:
+    """
+    Streams items to an Arrow IPC (Feather v2) file in record batches of `batch_size` rows (see: `iter_record_batches`).
+
+    Requires the optional `pyarrow` dependency (`pip install "lcsc[arrow]"`).
+
+    ## Parameters
+    - `items` ( *Iterable[ProductDetails | SearchResult]* ) - The items to export.
+    - `file` ( *str* | *PathLike* | *IO[bytes]* ) - Path to the output file, or an open binary file.
+    - `batch_size` ( *int*, *optional* ) - Rows per record batch. Only one batch is held in memory at a time.
+    - `max_price_breaks` ( *int*, *optional* ) - Number of price-ladder columns.
+    - `spec_codes` ( *Iterable[str]*, *optional* ) - Spec codes to emit columns for, in order.
+
+    ## Returns
+    - `count` ( *int* ) - The number of rows written.
+    """
+    import pyarrow as pa
+    spec_codes = None if spec_codes is None else list(spec_codes)
+    if isinstance(file, os.PathLike):
+        file = os.fspath(file)
+    count = 0
+    with pa.ipc.new_file(file, _schema(pa, max_price_breaks, spec_codes)) as writer:
+        for batch in iter_record_batches(items, batch_size, max_price_breaks, spec_codes):
+            writer.write_batch(batch)
+            count += batch.num_rows
+    return count
@@ -0,0 +1,320 @@
+"""
+src/lcsc/history.py
+
+A compact SQLite store of stock and price-ladder history, recording only changes between snapshots.
+"""
+import json
+import math
+import sqlite3
+import struct
+import threading
+import time
+from typing import Iterable
+from .types import ProductDetails, SearchResult
+
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parts (
+    product_code TEXT PRIMARY KEY,
+    static       TEXT NOT NULL,
+    stock        INTEGER NOT NULL,
+    stock_time   INTEGER NOT NULL,
+    ladder       BLOB NOT NULL,
+    price_time   INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deltas (
+    product_code TEXT NOT NULL,
+    kind         INTEGER NOT NULL,
+    start        INTEGER NOT NULL,
+    end          INTEGER NOT NULL,
+    count        INTEGER NOT NULL,
+    data         BLOB NOT NULL,
+    PRIMARY KEY (product_code, kind, start)
+);
+CREATE INDEX IF NOT EXISTS deltas_changed ON deltas (kind, end);
+"""
+
+_STOCK, _PRICE = 0, 1
+_KINDS = {"stock": _STOCK, "price": _PRICE}
+_PRICE_STRUCT = struct.Struct("<d")
+# SQLite's default limit on bound parameters is 999 in older versions.
+_QUERY_CHUNK = 500
+_MAX_TIME = 2**62
+
+
+
+def _write_varint(out: bytearray, n: int) -> None:
+    """
+    Appends a signed integer as a zigzag LEB128 varint (small magnitudes take one byte).
+    """
+    n = (n << 1) ^ (n >> 63)
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """
+    Reads a zigzag LEB128 varint at `pos`, returning it and the position after it.
+    """
+    n = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return (n >> 1) ^ -(n & 1), pos
+        shift += 7
+
+
+
+def _pack_ladder(details: ProductDetails) -> bytes:
+    """
+    Encodes a product's price ladder (ascending quantities) as a varint count, then a varint quantity and a float64 USD price per break.
+    """
+    out = bytearray()
+    breaks = details._sorted_price_breaks()
+    price = details.price
+    _write_varint(out, len(breaks))
+    for quantity in breaks:
+        _write_varint(out, quantity)
+        out += _PRICE_STRUCT.pack(price[quantity].price)
+    return bytes(out)
+
+
+def _read_ladder(data: bytes, pos: int) -> tuple[dict[int, float], int]:
+    n, pos = _read_varint(data, pos)
+    ladder = {}
+    for _ in range(n):
+        quantity, pos = _read_varint(data, pos)
+        ladder[quantity] = _PRICE_STRUCT.unpack_from(data, pos)[0]
+        pos += _PRICE_STRUCT.size
+    return ladder, pos
+
+
+
+def _decode_block(kind: int, start: int, data: bytes) -> list[tuple[int, int | dict[int, float]]]:
+    """
+    Decodes one delta block into `(timestamp, value)` pairs.
+
+    Stock entries are a timestamp delta and a stock delta (both from the previous entry, or from `(start, 0)`);
+    price entries are a timestamp delta and a full ladder (see: `_pack_ladder`), since ladders rarely change.
+    """
+    entries = []
+    pos, t, stock = 0, start, 0
+    while pos < len(data):
+        dt, pos = _read_varint(data, pos)
+        t += dt
+        if kind == _STOCK:
+            ds, pos = _read_varint(data, pos)
+            stock += ds
+            entries.append((t, stock))
+        else:
+            ladder, pos = _read_ladder(data, pos)
+            entries.append((t, ladder))
+    return entries
+
+
+
+class HistoryStore:
+    """
+    Tracks the stock and price history of many parts in one SQLite file, storing only what changes.
+
+    Each part's static fields (everything in `ProductDetails.as_dict()` but `stock` and `price`) are stored once,
+    when the part is first recorded. After that a snapshot only writes the parts whose stock or price ladder changed.
+    Changes go into per-part, per-field blocks of up to `block_size` entries, delta-encoded as varints, so a
+    stock change usually costs 2-4 bytes. `history()` reads one part's blocks, and `changed_since()` is answered
+    from an index on each block's last change, so neither loads the rest of the store.
+
+    Timestamps are whole seconds since the epoch.
+
+    ## Parameters
+    - `path` ( *str* ) - Path to the SQLite database file. Created if it doesn't exist.
+    - `block_size` ( *int*, *optional* ) - Maximum number of changes per block.
+
+    ## Example
+    ```python
+    >>> store = lcsc.HistoryStore("history.sqlite3")
+    >>> store.record(client.get_product_details_many(codes).values())  # e.g. every few hours
+    >>> store.history("C111887", since=time.time() - 7 * 86400)["stock"]
+    >>> store.changed_since(time.time() - 86400, "price")
+    ```
+    """
+    def __init__(self, path: str, block_size: int = 128) -> None:
+        self._path = str(path)
+        self._block_size = block_size
+        self._local = threading.local()
+        self._connect().executescript(_SCHEMA)
+
+    @property
+    def path(self) -> str:
+        """
+        Path to the SQLite database file.
+        """
+        return self._path
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Returns this thread's connection to the database, opening it on first use.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _append(self, conn: sqlite3.Connection, code: str, kind: int, t: int, value: int | bytes, last_time: int = 0, last_stock: int = 0) -> None:
+        """
+        Appends a change to the part's newest block for `kind`, or starts a new block if that one is full.
+
+        `value` is the new stock, or the new packed ladder; `last_time` and `last_stock` are those of the previous change.
+        """
+        row = conn.execute("SELECT start, count, data FROM deltas WHERE product_code = ? AND kind = ? ORDER BY start DESC LIMIT 1", (code, kind)).fetchone()
+        append = row is not None and (row[1] < self._block_size or row[0] == t)
+        if not append:
+            # Blocks are self-contained: the first entry is relative to `(start, 0)`.
+            last_time, last_stock = t, 0
+        entry = bytearray()
+        _write_varint(entry, t - last_time)
+        if kind == _STOCK:
+            _write_varint(entry, value - last_stock)
+        else:
+            entry += value
+        if append:
+            conn.execute("UPDATE deltas SET end = ?, count = ?, data = ? WHERE product_code = ? AND kind = ? AND start = ?", (t, row[1] + 1, row[2] + entry, code, kind, row[0]))
+        else:
+            conn.execute("INSERT INTO deltas (product_code, kind, start, end, count, data) VALUES (?, ?, ?, ?, 1, ?)", (code, kind, t, t, bytes(entry)))
+
+    def record(self, items: Iterable[ProductDetails | SearchResult], timestamp: float | None = None) -> int:
+        """
+        Records a snapshot of many parts in one transaction, writing only their changes since the previous snapshot.
+
+        ## Parameters
+        - `items` ( *Iterable[ProductDetails | SearchResult]* ) - The fresh details. Exceptions (e.g. from `get_product_details_many`) are skipped.
+        - `timestamp` ( *float*, *optional* ) - When the snapshot was taken, in seconds since the epoch. Defaults to now. Snapshots must be recorded in time order.
+
+        ## Returns
+        - `changed` ( *int* ) - The number of parts that were new or whose stock or price changed.
+        """
+        t = int(time.time() if timestamp is None else timestamp)
+        snapshot: dict[str, ProductDetails] = {}
+        for item in items:
+            details = item.product_details if isinstance(item, SearchResult) else item
+            if isinstance(details, ProductDetails):
+                snapshot[details.product_code] = details
+        conn = self._connect()
+        codes = list(snapshot)
+        changed = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            previous = {}
+            for i in range(0, len(codes), _QUERY_CHUNK):
+                chunk = codes[i:i + _QUERY_CHUNK]
+                rows = conn.execute(f"SELECT product_code, stock, stock_time, ladder, price_time FROM parts WHERE product_code IN ({','.join('?' * len(chunk))})", chunk)
+                previous.update((row[0], row[1:]) for row in rows)
+            for code, details in snapshot.items():
+                stock = details.stock
+                ladder = _pack_ladder(details)
+                before = previous.get(code)
+                if before is None:
+                    static = details.as_dict()
+                    del static["stock"], static["price"]
+                    conn.execute(
+                        "INSERT INTO parts (product_code, static, stock, stock_time, ladder, price_time) VALUES (?, ?, ?, ?, ?, ?)",
+                        (code, json.dumps(static, separators=(",", ":")), stock, t, ladder, t),
+                    )
+                    self._append(conn, code, _STOCK, t, stock)
+                    self._append(conn, code, _PRICE, t, ladder)
+                    changed += 1
+                    continue
+                last_stock, stock_time, last_ladder, price_time = before
+                if stock == last_stock and ladder == last_ladder:
+                    continue
+                changed += 1
+                if stock != last_stock:
+                    self._append(conn, code, _STOCK, t, stock, stock_time, last_stock)
+                    conn.execute("UPDATE parts SET stock = ?, stock_time = ? WHERE product_code = ?", (stock, t, code))
+                if ladder != last_ladder:
+                    self._append(conn, code, _PRICE, t, ladder, price_time)
+                    conn.execute("UPDATE parts SET ladder = ?, price_time = ? WHERE product_code = ?", (ladder, t, code))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return changed
+
+    def history(self, lcsc_part_number: str, since: float | None = None, until: float | None = None) -> dict[str, list[tuple[int, int | dict[int, float]]]]:
+        """
+        Returns a part's recorded changes, oldest first.
+
+        ## Parameters
+        - `lcsc_part_number` ( *str* ) - The part's LCSC code.
+        - `since` ( *float*, *optional* ) - Only changes at or after this time. The value in effect at `since` is included too, stamped with the time it was recorded.
+        - `until` ( *float*, *optional* ) - Only changes at or before this time.
+
+        ## Returns
+        - `history` ( *dict* ) - `{"stock": [(timestamp, stock), ...], "price": [(timestamp, {quantity: usd_price}), ...]}`; empty lists for an unknown part.
+        """
+        conn = self._connect()
+        history = {}
+        for name, kind in _KINDS.items():
+            # Blocks are ordered by their first change, so the value in effect at `since` is in the last block starting at or before it.
+            blocks = conn.execute(
+                "SELECT start, data FROM deltas WHERE product_code = ? AND kind = ? AND start <= ? AND start >= "
+                "COALESCE((SELECT MAX(start) FROM deltas WHERE product_code = ? AND kind = ? AND start <= ?), 0) ORDER BY start",
+                (lcsc_part_number, kind, _MAX_TIME if until is None else int(until), lcsc_part_number, kind, 0 if since is None else int(since)),
+            )
+            entries = [e for start, data in blocks for e in _decode_block(kind, start, data)]
+            if since is not None:
+                at = next((i for i, (t, _) in enumerate(entries) if t > since), len(entries))
+                entries = entries[max(at - 1, 0):]
+            if until is not None:
+                entries = [e for e in entries if e[0] <= until]
+            history[name] = entries
+        return history
+
+    def changed_since(self, since: float, field: str = "price") -> list[str]:
+        """
+        Returns the codes of every part whose `field` changed at or after `since` (parts first recorded since then included), sorted.
+
+        ## Parameters
+        - `since` ( *float* ) - Timestamp, in seconds since the epoch.
+        - `field` ( *str*, *optional* ) - `price` (the ladder) or `stock`.
+        """
+        if field not in _KINDS:
+            raise ValueError(f"Invalid `field` {field!r}; expected `price` or `stock`.")
+        rows = self._connect().execute("SELECT DISTINCT product_code FROM deltas WHERE kind = ? AND end >= ? ORDER BY product_code", (_KINDS[field], math.ceil(since)))
+        return [row[0] for row in rows]
+
+    def static(self, lcsc_part_number: str) -> dict | None:
+        """
+        Returns a part's static fields (`ProductDetails.as_dict()` without `stock` and `price`), or `None` if it was never recorded.
+        """
+        row = self._connect().execute("SELECT static FROM parts WHERE product_code = ?", (lcsc_part_number,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def latest(self, lcsc_part_number: str) -> tuple[int, dict[int, float]] | None:
+        """
+        Returns a part's last recorded `(stock, {quantity: usd_price})`, or `None` if it was never recorded.
+        """
+        row = self._connect().execute("SELECT stock, ladder FROM parts WHERE product_code = ?", (lcsc_part_number,)).fetchone()
+        return (row[0], _read_ladder(row[1], 0)[0]) if row is not None else None
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM parts").fetchone()[0]
+
+    def __contains__(self, lcsc_part_number: str) -> bool:
+        return self._connect().execute("SELECT 1 FROM parts WHERE product_code = ?", (lcsc_part_number,)).fetchone() is not None
+
+    def close(self) -> None:
+        """
+        Closes this thread's connection to the database.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,388 @@
+"""
+src/lcsc/index.py
+
+Local inverted index for offline keyword and parametric search over products.
+"""
+import heapq
+import os
+import pickle
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Iterable
+from .types import ProductDetails, SearchResult
+
+
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+_INDEX_VERSION = 2
+
+
+
+def _tokenize(text: str | None) -> set[str]:
+    """
+    Splits text into lowercase alphanumeric tokens.
+    """
+    return set(_TOKEN_RE.findall(text.lower())) if text else set()
+
+
+
+def _product_tokens(details: ProductDetails) -> set[str]:
+    """
+    The keyword tokens indexed for a product: its code, model, title, description and brand name.
+    """
+    tokens = _tokenize(details.product_model) | _tokenize(details.product_title) | _tokenize(details.description) | _tokenize(details.brand.name)
+    tokens.add(details.product_code.lower())
+    tokens.add("".join(_TOKEN_RE.findall(details.product_model.lower())))
+    tokens.discard("")
+    return tokens
+
+
+
+def _base_price(details: ProductDetails) -> float:
+    """
+    The product's price at its lowest quantity break (`inf` if it has no price ladder).
+    """
+    breaks = details.get_price_breaks()
+    return details.price[breaks[0]].price if breaks else float("inf")
+
+
+
+class SpecRangeIndex:
+    """
+    Sorted per-`Spec.code` columns of numeric spec values (see: `Spec.numeric_value`), for range queries by binary search.
+
+    Columns are (re)sorted lazily on the first query after they change, so bulk loads and incremental updates stay cheap.
+
+    ## Parameters
+    - `products` ( *Iterable[ProductDetails]*, *optional* ) - Products to index initially.
+
+    ## Example
+    ```python
+    >>> ranges = SpecRangeIndex(products)
+    >>> ranges.query("param_10953_n", 9.9e3, 10.1e3) & ranges.query("param_10954", maximum=1)
+    {'C25744', ...}
+    ```
+    """
+    def __init__(self, products: Iterable[ProductDetails] = ()) -> None:
+        self._values: dict[str, dict[str, tuple[float, str]]] = {}
+        self._product_specs: dict[str, tuple[str, ...]] = {}
+        self._columns: dict[str, tuple[list[float], list[str], list[str]]] = {}
+        for details in products:
+            self.add(details)
+
+    def add(self, details: ProductDetails) -> None:
+        """
+        Adds a product's numeric spec values, replacing any previously indexed values for it.
+        """
+        code = details.product_code
+        self.remove(code)
+        spec_codes = []
+        for spec in details.specs:
+            value = spec.numeric_value
+            if value is not None:
+                self._values.setdefault(spec.code, {})[code] = (value, spec.unit)
+                column = self._columns.get(spec.code)
+                if column is not None:
+                    # Keep an already sorted column sorted, rather than re-sorting it on the next query.
+                    at = bisect_right(column[0], value)
+                    column[0].insert(at, value)
+                    column[1].insert(at, code)
+                    column[2].insert(at, spec.unit)
+                spec_codes.append(spec.code)
+        if spec_codes:
+            self._product_specs[code] = tuple(spec_codes)
+
+    def remove(self, lcsc_part_number: str) -> None:
+        """
+        Removes a product's values, if present.
+        """
+        for spec_code in self._product_specs.pop(lcsc_part_number, ()):
+            values = self._values.get(spec_code)
+            if values is None or lcsc_part_number not in values:
+                continue
+            value = values.pop(lcsc_part_number)[0]
+            if not values:
+                del self._values[spec_code]
+                self._columns.pop(spec_code, None)
+                continue
+            column = self._columns.get(spec_code)
+            if column is not None:
+                start = bisect_left(column[0], value)
+                at = column[1].index(lcsc_part_number, start, bisect_right(column[0], value, start))
+                del column[0][at], column[1][at], column[2][at]
+
+    def _column(self, spec_code: str) -> tuple[list[float], list[str], list[str]]:
+        column = self._columns.get(spec_code)
+        if column is None:
+            rows = sorted((value, unit, code) for code, (value, unit) in self._values.get(spec_code, {}).items())
+            column = self._columns[spec_code] = ([r[0] for r in rows], [r[2] for r in rows], [r[1] for r in rows])
+        return column
+
+    def query(self, spec_code: str, minimum: float | None = None, maximum: float | None = None, unit: str | None = None) -> set[str]:
+        """
+        Finds the products whose value for a spec lies within a range.
+
+        ## Parameters
+        - `spec_code` ( *str* ) - The `Spec.code` to query.
+        - `minimum` ( *float*, *optional* ) - Inclusive lower bound, in base units (e.g. `9.9e3` for 9.9kΩ).
+        - `maximum` ( *float*, *optional* ) - Inclusive upper bound, in base units.
+        - `unit` ( *str*, *optional* ) - Only match values in this unit (e.g. `Ω`).
+
+        ## Returns
+        - `codes` ( *set[str]* ) - The matching LCSC part numbers.
+        """
+        values, codes, units = self._column(spec_code)
+        start = 0 if minimum is None else bisect_left(values, minimum)
+        stop = len(values) if maximum is None else bisect_right(values, maximum)
+        if unit is None:
+            return set(codes[start:stop])
+        return {c for c, u in zip(codes[start:stop], units[start:stop]) if u == unit}
+
+
+
+class ProductIndex:
+    """
+    In-memory inverted index over a collection of products, for offline keyword and parametric search.
+
+    Keywords are matched against the product code, model, title, description and brand name; every query
+    token must prefix-match an indexed token. Spec filters match exact `Spec.value` strings, and spec ranges match
+    parsed numeric values (see: `SpecRangeIndex`), both keyed on `Spec.code`.
+    Products can be added, updated and removed incrementally, and the whole index can be saved to and loaded from disk.
+
+    ## Parameters
+    - `products` ( *Iterable[ProductDetails | SearchResult]*, *optional* ) - Products to index initially.
+
+    ## Example
+    ```python
+    >>> index = lcsc.ProductIndex(lcsc.iter_search_results("L7805", limit=500))
+    >>> results = index.search("7805 to-220", min_stock=1000, sort_by="price")
+    >>> results = index.search(filters={"param_10953_n": ["10kΩ", "10KΩ"]})
+    >>> results = index.search(ranges={"param_10953_n": (9.9e3, 10.1e3), "param_10954": (None, 1)})
+    >>> index.save("products.idx")
+    >>> index = lcsc.ProductIndex.load("products.idx")
+    ```
+    """
+    def __init__(self, products: Iterable[ProductDetails | SearchResult] = ()) -> None:
+        self._lock = threading.RLock()
+        self._products: dict[str, ProductDetails] = {}
+        self._on_discount: dict[str, bool] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._spec_postings: dict[str, dict[str, set[str]]] = {}
+        self._vocabulary: list[str] | None = None
+        self._ranges = SpecRangeIndex()
+        self.add_many(products)
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def __contains__(self, lcsc_part_number: str) -> bool:
+        return lcsc_part_number in self._products
+
+    def get(self, lcsc_part_number: str) -> ProductDetails | None:
+        """
+        Returns the indexed details for a part number, or `None`.
+        """
+        return self._products.get(lcsc_part_number)
+
+    def add(self, item: ProductDetails | SearchResult) -> None:
+        """
+        Adds a product to the index, replacing any previously indexed version of it.
+
+        ## Parameters
+        - `item` ( *ProductDetails* | *SearchResult* ) - The product (a search result also records whether it is on discount).
+        """
+        on_discount = False
+        if isinstance(item, SearchResult):
+            on_discount = item.on_discount
+            item = item.product_details
+        code = item.product_code
+        with self._lock:
+            if code in self._products:
+                self._unindex(self._products[code])
+            self._products[code] = item
+            self._on_discount[code] = on_discount
+            for token in _product_tokens(item):
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = set()
+                    if self._vocabulary is not None:
+                        insort(self._vocabulary, token)
+                postings.add(code)
+            for spec in item.specs:
+                self._spec_postings.setdefault(spec.code, {}).setdefault(spec.value, set()).add(code)
+            self._ranges.add(item)
+
+    def add_many(self, items: Iterable[ProductDetails | SearchResult]) -> None:
+        """
+        Adds (or updates) many products.
+        """
+        for item in items:
+            self.add(item)
+
+    update = add
+
+    def remove(self, lcsc_part_number: str) -> bool:
+        """
+        Removes a product from the index.
+
+        ## Returns
+        - `removed` ( *bool* ) - Whether the product was indexed.
+        """
+        with self._lock:
+            details = self._products.pop(lcsc_part_number, None)
+            if details is None:
+                return False
+            self._on_discount.pop(lcsc_part_number, None)
+            self._unindex(details)
+            self._ranges.remove(lcsc_part_number)
+            return True
+
+    def _unindex(self, details: ProductDetails) -> None:
+        code = details.product_code
+        for token in _product_tokens(details):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(code)
+                if not postings:
+                    del self._postings[token]
+                    if self._vocabulary is not None:
+                        del self._vocabulary[bisect_left(self._vocabulary, token)]
+        for spec in details.specs:
+            values = self._spec_postings.get(spec.code)
+            if values is not None and spec.value in values:
+                values[spec.value].discard(code)
+                if not values[spec.value]:
+                    del values[spec.value]
+                if not values:
+                    del self._spec_postings[spec.code]
+
+    def _match_token(self, token: str, within: set[str] | None = None) -> set[str]:
+        """
+        Returns the codes of every product (out of `within`, if given) with an indexed token starting with `token`.
+
+        The sorted vocabulary is built on the first query and then kept sorted by `add` and `remove`.
+        """
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, token)
+        stop = bisect_left(vocabulary, token[:-1] + chr(ord(token[-1]) + 1), start)
+        if within is not None and len(within) * 16 < stop - start:
+            # Few candidates but many matching terms: checking each candidate's own tokens is cheaper.
+            return {code for code in within if any(t.startswith(token) for t in _product_tokens(self._products[code]))}
+        matches: set[str] = set()
+        for term in vocabulary[start:stop]:
+            postings = self._postings[term]
+            matches |= postings if within is None else postings & within
+        return matches
+
+    def spec_values(self, code: str) -> list[str]:
+        """
+        Returns every distinct value indexed for a spec code (e.g. to build filter choices).
+        """
+        return sorted(self._spec_postings.get(code, {}))
+
+    def search(self, keyword: str = "", filters: dict[str, str | Iterable[str]] | None = None, ranges: dict[str, tuple[float | None, float | None]] | None = None, min_stock: int | None = None, sort_by: str | None = "stock", limit: int | None = None) -> list[SearchResult]:
+        """
+        Searches the indexed products without touching the network.
+
+        ## Parameters
+        - `keyword` ( *str*, *optional* ) - Space-separated terms; every term must prefix-match the product's code, model, title, description or brand.
+        - `filters` ( *dict[str, str | Iterable[str]]*, *optional* ) - Maps `Spec.code` to the allowed `Spec.value` (or values).
+        - `ranges` ( *dict[str, tuple[float | None, float | None]]*, *optional* ) - Maps `Spec.code` to an inclusive `(minimum, maximum)` range of `Spec.numeric_value`; either bound may be `None`.
+        - `min_stock` ( *int*, *optional* ) - Only return products with at least the specified quantity in stock.
+        - `sort_by` ( *str*, *optional* ) - Sort by quantity in stock (`stock`, highest first), by base-price (`price`), or not at all (`None`, indexing order).
+        - `limit` ( *int*, *optional* ) - Return at most this many results.
+
+        ## Returns
+        - `results` ( *list[SearchResult]* ) - The matching products, with `index` giving each one's position in the list.
+        """
+        if sort_by is not None and sort_by.lower() not in ["stock", "price"]:
+            raise ValueError(f"Invalid `sort_by` parameter {sort_by!r}.")
+        with self._lock:
+            candidates: set[str] | None = None
+            # Narrow on the most selective terms first (fewest exact postings, then longest), so later prefix unions stay small.
+            tokens = sorted(_tokenize(keyword), key=lambda t: (len(self._postings.get(t, ())), -len(t)))
+            for token in tokens:
+                candidates = self._match_token(token, candidates)
+                if not candidates:
+                    return []
+            for code, values in (filters or {}).items():
+                postings = self._spec_postings.get(code, {})
+                values = [values] if isinstance(values, str) else values
+                matches = set().union(*(postings.get(v, ()) for v in values))
+                candidates = matches if candidates is None else candidates & matches
+                if not candidates:
+                    return []
+            for code, (minimum, maximum) in (ranges or {}).items():
+                matches = self._ranges.query(code, minimum, maximum)
+                candidates = matches if candidates is None else candidates & matches
+                if not candidates:
+                    return []
+            if candidates is None:
+                products = list(self._products.values())
+            elif sort_by is None:
+                products = [d for code, d in self._products.items() if code in candidates]
+            else:
+                products = [self._products[code] for code in candidates]
+            if min_stock is not None:
+                products = [d for d in products if d.stock >= min_stock]
+            if sort_by is not None and sort_by.lower() == "stock":
+                if limit is not None:
+                    products = heapq.nlargest(limit, products, key=lambda d: d.stock)
+                else:
+                    products.sort(key=lambda d: d.stock, reverse=True)
+            elif sort_by is not None and sort_by.lower() == "price":
+                if limit is not None:
+                    products = heapq.nsmallest(limit, products, key=_base_price)
+                else:
+                    products.sort(key=_base_price)
+            if limit is not None:
+                products = products[:limit]
+            return [SearchResult(i, d.product_url, self._on_discount[d.product_code], d) for i, d in enumerate(products)]
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Writes the index to disk (atomically replacing any existing file).
+
+        ## Parameters
+        - `path` ( *str* | *PathLike* ) - The file to write.
+        """
+        with self._lock:
+            state = {
+                "version": _INDEX_VERSION,
+                "products": self._products,
+                "on_discount": self._on_discount,
+                "postings": self._postings,
+                "spec_postings": self._spec_postings,
+                "range_values": self._ranges._values,
+                "range_product_specs": self._ranges._product_specs,
+            }
+            tmp_path = f"{os.fspath(path)}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "ProductIndex":
+        """
+        Loads an index previously written with `save`.
+
+        The file is a pickle, so only load indexes from trusted locations.
+
+        ## Parameters
+        - `path` ( *str* | *PathLike* ) - The file to read.
+        """
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != _INDEX_VERSION:
+            raise ValueError(f"Unsupported index version {state.get('version')!r} in {os.fspath(path)!r}.")
+        index = cls()
+        index._products = state["products"]
+        index._on_discount = state["on_discount"]
+        index._postings = state["postings"]
+        index._spec_postings = state["spec_postings"]
+        index._ranges._values = state["range_values"]
+        index._ranges._product_specs = state["range_product_specs"]
+        return index
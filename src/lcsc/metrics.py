@@ -0,0 +1,294 @@
+"""
+src/lcsc/metrics.py
+
+Request, decode and cache instrumentation for the `lcsc` clients, with a Prometheus text exporter.
+"""
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable
+
+
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_PARSE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+_SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+
+class Histogram:
+    """
+    A cumulative histogram with fixed bucket upper bounds, in the Prometheus style.
+
+    ## Parameters
+    - `buckets` ( *tuple[float, ...]* ) - Sorted bucket upper bounds; an implicit `+Inf` bucket catches the rest.
+    """
+    __slots__ = ("_buckets", "_counts", "_sum", "_count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self._buckets = tuple(buckets)
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    @property
+    def buckets(self) -> tuple[float, ...]:
+        """
+        The bucket upper bounds (excluding `+Inf`).
+        """
+        return self._buckets
+
+    @property
+    def sum(self) -> float:
+        """
+        The sum of every observed value.
+        """
+        return self._sum
+
+    @property
+    def count(self) -> int:
+        """
+        The number of observed values.
+        """
+        return self._count
+
+    def observe(self, value: float) -> None:
+        """
+        Records one value. Not thread-safe on its own; `Metrics` serializes calls.
+        """
+        self._counts[bisect_left(self._buckets, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    def cumulative_counts(self) -> list[tuple[float, int]]:
+        """
+        Returns `(upper_bound, count of values <= upper_bound)` pairs, ending with `(inf, count)`.
+        """
+        pairs, total = [], 0
+        for bound, n in zip(self._buckets + (float("inf"),), self._counts):
+            total += n
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates the `q`-quantile (`0 <= q <= 1`) as the upper bound of the bucket it falls in.
+        """
+        if not self._count:
+            return 0.0
+        rank = q * self._count
+        for bound, total in self.cumulative_counts():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+
+
+def _label_value(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels: object) -> str:
+    return "{" + ",".join(f'{k}="{_label_value(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+
+class Metrics:
+    """
+    Collects timings and counters from the clients it is passed to, and calls user hooks around every network request.
+
+    Recorded per endpoint: request latency, response size, status counts, retries, JSON decode time, and the time
+    spent building `ProductDetails`/`SearchResult` objects. Cache lookups are counted per cache and outcome.
+    A client without `metrics` skips all of this with a single `None` check per request.
+
+    ## Parameters
+    - `latency_buckets` ( *tuple[float, ...]*, *optional* ) - Upper bounds (seconds) of the request latency histogram buckets.
+    - `parse_buckets` ( *tuple[float, ...]*, *optional* ) - Upper bounds (seconds) of the decode and build histogram buckets.
+    - `size_buckets` ( *tuple[float, ...]*, *optional* ) - Upper bounds (bytes) of the response size histogram buckets.
+
+    ## Example
+    ```python
+    >>> metrics = lcsc.Metrics()
+    >>> metrics.on_request_end(lambda endpoint, params, status, seconds, size, error: print(endpoint, status, seconds))
+    >>> client = lcsc.LCSCClient(metrics=metrics)
+    >>> client.get_product_details("C111887")
+    >>> print(metrics.render_prometheus())
+    ```
+    """
+    def __init__(self, latency_buckets: tuple[float, ...] = _LATENCY_BUCKETS, parse_buckets: tuple[float, ...] = _PARSE_BUCKETS, size_buckets: tuple[float, ...] = _SIZE_BUCKETS) -> None:
+        self._latency_buckets = latency_buckets
+        self._parse_buckets = parse_buckets
+        self._size_buckets = size_buckets
+        self._lock = threading.Lock()
+        self._start_hooks: list[Callable] = []
+        self._end_hooks: list[Callable] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clears every recorded value (registered hooks are kept).
+        """
+        with self._lock:
+            self._latency: dict[str, Histogram] = {}
+            self._sizes: dict[str, Histogram] = {}
+            self._decode: dict[str, Histogram] = {}
+            self._build: dict[str, Histogram] = {}
+            self._requests: Counter[tuple[str, str]] = Counter()
+            self._retries: Counter[str] = Counter()
+            self._built: Counter[str] = Counter()
+            self._cache: Counter[tuple[str, str]] = Counter()
+
+    def on_request_start(self, callback: Callable[[str, dict], None]) -> Callable[[str, dict], None]:
+        """
+        Registers `callback(endpoint, params)`, called before every network request (each retry included). Usable as a decorator.
+        """
+        self._start_hooks.append(callback)
+        return callback
+
+    def on_request_end(self, callback: Callable[[str, dict, int | None, float, int, Exception | None], None]) -> Callable:
+        """
+        Registers `callback(endpoint, params, status, seconds, size, error)`, called after every network request. Usable as a decorator.
+
+        `status` is `None` and `error` is set when no response arrived (connection error or timeout).
+        """
+        self._end_hooks.append(callback)
+        return callback
+
+    def request_started(self, endpoint: str, params: dict) -> None:
+        """
+        Called by the clients before sending a request.
+        """
+        for hook in self._start_hooks:
+            hook(endpoint, params)
+
+    def request_finished(self, endpoint: str, params: dict, status: int | None, seconds: float, size: int, error: Exception | None = None) -> None:
+        """
+        Called by the clients once a request got a response (or failed without one).
+        """
+        with self._lock:
+            histogram = self._latency.get(endpoint)
+            if histogram is None:
+                histogram = self._latency[endpoint] = Histogram(self._latency_buckets)
+                self._sizes[endpoint] = Histogram(self._size_buckets)
+            histogram.observe(seconds)
+            if status is not None:
+                self._sizes[endpoint].observe(size)
+            self._requests[endpoint, str(status) if status is not None else "error"] += 1
+        for hook in self._end_hooks:
+            hook(endpoint, params, status, seconds, size, error)
+
+    def observe_retry(self, endpoint: str) -> None:
+        """
+        Counts one retried request.
+        """
+        with self._lock:
+            self._retries[endpoint] += 1
+
+    def observe_decode(self, endpoint: str, seconds: float) -> None:
+        """
+        Records the time spent decoding one response body.
+        """
+        with self._lock:
+            histogram = self._decode.get(endpoint)
+            if histogram is None:
+                histogram = self._decode[endpoint] = Histogram(self._parse_buckets)
+            histogram.observe(seconds)
+
+    def observe_build(self, endpoint: str, seconds: float, count: int = 1) -> None:
+        """
+        Records the time spent building the objects (`count` products) of one response.
+        """
+        with self._lock:
+            histogram = self._build.get(endpoint)
+            if histogram is None:
+                histogram = self._build[endpoint] = Histogram(self._parse_buckets)
+            histogram.observe(seconds)
+            self._built[endpoint] += count
+
+    def observe_cache(self, cache: str, outcome: str) -> None:
+        """
+        Counts one cache lookup (e.g. `("response", "hit")` or `("product", "volatile_refresh")`).
+        """
+        with self._lock:
+            self._cache[cache, outcome] += 1
+
+    def cache_hit_ratio(self, cache: str) -> float | None:
+        """
+        Returns the fraction of lookups in `cache` that were hits, or `None` if there were no lookups.
+        """
+        with self._lock:
+            outcomes = {o: n for (c, o), n in self._cache.items() if c == cache}
+        total = sum(outcomes.values())
+        return outcomes.get("hit", 0) / total if total else None
+
+    def snapshot(self) -> dict:
+        """
+        Returns a summary of everything recorded so far.
+
+        ## Keys
+        - `endpoints` ( *dict[str, dict]* ) - Per endpoint: `requests`, `statuses`, `retries`, `bytes`, latency `p50`/`p95`/`p99`/`mean` (bucket upper bounds), `decode_seconds`, `build_seconds` and `built`.
+        - `caches` ( *dict[str, dict]* ) - Per cache: lookups by outcome, and the `hit_ratio`.
+        """
+        with self._lock:
+            endpoints = {}
+            for endpoint, latency in self._latency.items():
+                endpoints[endpoint] = {
+                    "requests": latency.count,
+                    "statuses": {status: n for (e, status), n in self._requests.items() if e == endpoint},
+                    "retries": self._retries[endpoint],
+                    "bytes": int(self._sizes[endpoint].sum),
+                    "p50": latency.quantile(0.5),
+                    "p95": latency.quantile(0.95),
+                    "p99": latency.quantile(0.99),
+                    "mean": latency.sum / latency.count if latency.count else 0.0,
+                    "decode_seconds": self._decode[endpoint].sum if endpoint in self._decode else 0.0,
+                    "build_seconds": self._build[endpoint].sum if endpoint in self._build else 0.0,
+                    "built": self._built[endpoint],
+                }
+            caches: dict[str, dict] = {}
+            for (cache, outcome), n in self._cache.items():
+                caches.setdefault(cache, {})[outcome] = n
+        for outcomes in caches.values():
+            total = sum(outcomes.values())
+            outcomes["hit_ratio"] = outcomes.get("hit", 0) / total if total else None
+        return {"endpoints": endpoints, "caches": caches}
+
+    def render_prometheus(self, prefix: str = "lcsc") -> str:
+        """
+        Renders every metric in the Prometheus text exposition format (version 0.0.4).
+
+        ## Parameters
+        - `prefix` ( *str*, *optional* ) - Prefix of every metric name.
+
+        ## Returns
+        - `text` ( *str* ) - The exposition text, ending with a newline.
+        """
+        lines: list[str] = []
+        def histograms(name: str, help_text: str, series: dict[str, Histogram]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for endpoint, histogram in sorted(series.items()):
+                for bound, total in histogram.cumulative_counts():
+                    lines.append(f"{prefix}_{name}_bucket{_labels(endpoint=endpoint, le=_format_bound(bound))} {total}")
+                lines.append(f"{prefix}_{name}_sum{_labels(endpoint=endpoint)} {histogram.sum!r}")
+                lines.append(f"{prefix}_{name}_count{_labels(endpoint=endpoint)} {histogram.count}")
+        def counter(name: str, help_text: str, series: dict[tuple, int], label_names: tuple[str, ...]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for key, n in sorted(series.items()):
+                key = key if isinstance(key, tuple) else (key,)
+                lines.append(f"{prefix}_{name}{_labels(**dict(zip(label_names, key)))} {n}")
+        with self._lock:
+            histograms("request_duration_seconds", "Latency of API requests.", self._latency)
+            histograms("response_size_bytes", "Size of API response bodies.", self._sizes)
+            histograms("decode_duration_seconds", "Time spent decoding JSON response bodies.", self._decode)
+            histograms("build_duration_seconds", "Time spent building product objects from decoded responses.", self._build)
+            counter("requests_total", "API requests by response status.", self._requests, ("endpoint", "status"))
+            counter("retries_total", "Retried API requests.", self._retries, ("endpoint",))
+            counter("products_built_total", "Product objects built from responses.", self._built, ("endpoint",))
+            counter("cache_lookups_total", "Cache lookups by outcome.", self._cache, ("cache", "outcome"))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,172 @@
+"""
+src/lcsc/pricing.py
+
+Vectorized price table for bulk order-cost evaluation. Requires the optional `numpy` dependency (`pip install "lcsc[numpy]"`).
+"""
+from typing import Iterable, Sequence
+import numpy as np
+from .types import ProductDetails
+
+
+
+# Ladder lookups search a single sorted array of `row << _ROW_SHIFT | quantity` keys,
+# so quantities must stay below 2**32.
+_ROW_SHIFT = 32
+
+
+
+class PriceTable:
+    """
+    Price ladders of many products, stored as contiguous NumPy arrays.
+
+    Each product's ladder occupies a contiguous slice of the `quantities`/`prices` arrays, so the applicable price
+    for thousands of `(product, quantity)` pairs is found with one `searchsorted` call instead of a Python loop per pair.
+
+    ## Parameters
+    - `products` ( *Iterable[ProductDetails]* ) - The products to include. A later product with the same code replaces an earlier one.
+
+    ## Example
+    ```python
+    >>> from lcsc.pricing import PriceTable
+    >>> table = PriceTable(details_list)
+    >>> costs, valid = table.cost(["C111887", "C3795"], [100, 2500])
+    >>> costs[~valid]  # NaN where the code is unknown or the quantity isn't orderable
+    ```
+    """
+    def __init__(self, products: Iterable[ProductDetails]) -> None:
+        unique = list({p.product_code: p for p in products}.values())
+        self._codes = [p.product_code for p in unique]
+        self._rows = {code: i for i, code in enumerate(self._codes)}
+        ladders = [p.get_price_breaks() for p in unique]
+        lengths = np.fromiter((len(x) for x in ladders), dtype=np.int64, count=len(ladders))
+        self._offsets = np.zeros(len(unique) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self._offsets[1:])
+        self._quantities = np.fromiter((q for x in ladders for q in x), dtype=np.int64, count=int(self._offsets[-1]))
+        self._prices = np.fromiter((p.price[q].price for p, x in zip(unique, ladders) for q in x), dtype=np.float64, count=int(self._offsets[-1]))
+        self._keys = (np.repeat(np.arange(len(unique), dtype=np.int64), lengths) << _ROW_SHIFT) | self._quantities
+        self._min_quantity = np.fromiter((p.min_quantity for p in unique), dtype=np.int64, count=len(unique))
+        self._split_quantity = np.fromiter((max(p.split_quantity, 1) for p in unique), dtype=np.int64, count=len(unique))
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __contains__(self, lcsc_part_number: str) -> bool:
+        return lcsc_part_number in self._rows
+
+    @property
+    def codes(self) -> list[str]:
+        """
+        The LCSC part numbers in the table, in row order.
+        """
+        return self._codes
+
+    @property
+    def min_quantity(self) -> np.ndarray:
+        """
+        Minimum order quantity of each row.
+        """
+        return self._min_quantity
+
+    @property
+    def split_quantity(self) -> np.ndarray:
+        """
+        Split quantity (order multiple) of each row.
+        """
+        return self._split_quantity
+
+    def rows(self, codes: Iterable[str]) -> np.ndarray:
+        """
+        Resolves part numbers to row indices (`-1` for unknown codes).
+
+        Resolve once and pass the result to `cost`/`unit_price`/`validate` when evaluating the same lines repeatedly.
+        """
+        return np.fromiter((self._rows.get(c, -1) for c in codes), dtype=np.int64)
+
+    def ladder(self, lcsc_part_number: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the sorted `(quantities, prices)` ladder of one product.
+        """
+        row = self._rows[lcsc_part_number]
+        start, stop = self._offsets[row], self._offsets[row + 1]
+        return self._quantities[start:stop], self._prices[start:stop]
+
+    def _resolve(self, codes: Sequence[str] | np.ndarray, quantities: Sequence[int] | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        if isinstance(codes, np.ndarray) and np.issubdtype(codes.dtype, np.integer):
+            rows = codes.astype(np.int64, copy=False)
+        else:
+            rows = self.rows(codes)
+        quantities = np.asarray(quantities, dtype=np.int64)
+        if rows.shape != quantities.shape:
+            raise ValueError(f"Got {rows.shape[0]} codes but {quantities.shape[0]} quantities.")
+        return rows, quantities
+
+    def validate(self, codes: Sequence[str] | np.ndarray, quantities: Sequence[int] | np.ndarray) -> np.ndarray:
+        """
+        Checks which `(code, quantity)` pairs can be ordered.
+
+        A pair is valid if the code is in the table, has at least one price ladder, and the quantity is at least the
+        minimum order quantity and a multiple of the split quantity.
+
+        ## Parameters
+        - `codes` ( *Sequence[str]* | *np.ndarray* ) - Part numbers, or row indices from `rows()`.
+        - `quantities` ( *Sequence[int]* | *np.ndarray* ) - Order quantity of each line.
+
+        ## Returns
+        - `valid` ( *np.ndarray[bool]* ) - Mask of orderable lines.
+        """
+        rows, quantities = self._resolve(codes, quantities)
+        return self._validate(rows, quantities)
+
+    def _validate(self, rows: np.ndarray, quantities: np.ndarray) -> np.ndarray:
+        if not self._codes:
+            return np.zeros(rows.shape, dtype=bool)
+        known = (rows >= 0) & (rows < len(self._codes))
+        r = np.where(known, rows, 0)
+        return (
+            known
+            & (self._offsets[r + 1] > self._offsets[r])
+            # Quantities must fit below the row bits of the lookup keys.
+            & (quantities >= 0)
+            & (quantities < 1 << _ROW_SHIFT)
+            & (quantities >= self._min_quantity[r])
+            & (quantities % self._split_quantity[r] == 0)
+        )
+
+    def unit_price(self, codes: Sequence[str] | np.ndarray, quantities: Sequence[int] | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Looks up the applicable unit price of each `(code, quantity)` pair.
+
+        ## Parameters
+        - `codes` ( *Sequence[str]* | *np.ndarray* ) - Part numbers, or row indices from `rows()`.
+        - `quantities` ( *Sequence[int]* | *np.ndarray* ) - Order quantity of each line.
+
+        ## Returns
+        - `(prices, valid)` ( *tuple[np.ndarray[float], np.ndarray[bool]]* ) - Unit prices in USD (`NaN` for invalid lines) and the mask of orderable lines.
+        """
+        rows, quantities = self._resolve(codes, quantities)
+        valid = self._validate(rows, quantities)
+        prices = np.full(rows.shape, np.nan)
+        if valid.any():
+            r = rows[valid]
+            idx = np.searchsorted(self._keys, (r << _ROW_SHIFT) | quantities[valid], side="right") - 1
+            # Quantities below the first break still pay the first break's price.
+            idx = np.maximum(idx, self._offsets[r])
+            prices[valid] = self._prices[idx]
+        return prices, valid
+
+    def cost(self, codes: Sequence[str] | np.ndarray, quantities: Sequence[int] | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Calculates the total cost of ordering each `(code, quantity)` pair, equivalent to `ProductDetails.get_order_cost` per line.
+
+        Invalid lines are reported through the returned mask instead of raising.
+
+        ## Parameters
+        - `codes` ( *Sequence[str]* | *np.ndarray* ) - Part numbers, or row indices from `rows()`.
+        - `quantities` ( *Sequence[int]* | *np.ndarray* ) - Order quantity of each line.
+
+        ## Returns
+        - `(costs, valid)` ( *tuple[np.ndarray[float], np.ndarray[bool]]* ) - Total costs in USD (`NaN` for invalid lines) and the mask of orderable lines.
+        """
+        rows, quantities = self._resolve(codes, quantities)
+        prices, valid = self.unit_price(rows, quantities)
+        return prices * quantities, valid
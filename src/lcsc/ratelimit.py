@@ -0,0 +1,265 @@
+"""
+src/lcsc/ratelimit.py
+
+Rate limiting and retry policy for the `lcsc` clients.
+"""
+import random
+import threading
+import time
+from typing import TYPE_CHECKING
+from .errors import LCSCHTTPError, LCSCResponseError
+if TYPE_CHECKING:
+    import sqlite3
+
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by every thread (and coroutine) of the clients it is passed to.
+
+    Up to `burst` requests may go out back to back, after which requests are spaced to `rate` per second.
+    Callers reserve a token and then wait, so waiting threads are served in order without holding a lock.
+
+    ## Parameters
+    - `rate` ( *float* ) - Sustained requests per second.
+    - `burst` ( *int*, *optional* ) - Maximum number of requests sent without waiting. Defaults to `max(1, rate)`.
+
+    ## Example
+    ```python
+    >>> limiter = lcsc.TokenBucket(rate=20, burst=40)
+    >>> client = lcsc.LCSCClient(rate_limiter=limiter)
+    ```
+    """
+    def __init__(self, rate: float, burst: int | None = None) -> None:
+        if rate <= 0:
+            raise ValueError(f"`rate` must be positive, got {rate}.")
+        self._rate = float(rate)
+        self._burst = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self._burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        """
+        Sustained requests per second.
+        """
+        return self._rate
+
+    @property
+    def burst(self) -> float:
+        """
+        Maximum number of requests sent without waiting.
+        """
+        return self._burst
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Takes `tokens` from the bucket (going into debt if needed) and returns how many seconds the caller must wait before sending.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self._rate)
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Blocks until `tokens` are available, and returns the number of seconds waited.
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds back every request not yet reserved for at least `seconds` (e.g. after a `429` or `503`).
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0) - seconds * self._rate
+
+
+
+_BUCKET_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name    TEXT PRIMARY KEY,
+    tokens  REAL NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+
+class SQLiteTokenBucket(TokenBucket):
+    """
+    A `TokenBucket` whose state lives in a SQLite database, so that several processes (e.g. crawler workers) share one rate limit.
+
+    Every reservation is a short `BEGIN IMMEDIATE` transaction, and the wall clock is used so that processes agree on time.
+
+    ## Parameters
+    - `path` ( *str* ) - Path to the SQLite database file. Created if it doesn't exist; may be the same file as a `ResponseCache`.
+    - `rate` ( *float* ) - Sustained requests per second, across all processes.
+    - `burst` ( *int*, *optional* ) - Maximum number of requests sent without waiting. Defaults to `max(1, rate)`.
+    - `name` ( *str*, *optional* ) - Name of the bucket, so one database can hold several independent limits.
+    """
+    def __init__(self, path: str, rate: float, burst: int | None = None, name: str = "default") -> None:
+        super().__init__(rate, burst)
+        self._path = str(path)
+        self._name = name
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(_BUCKET_SCHEMA)
+        conn.execute("INSERT OR IGNORE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)", (name, self._burst, time.time()))
+
+    @property
+    def path(self) -> str:
+        """
+        Path to the SQLite database file.
+        """
+        return self._path
+
+    def _connect(self) -> "sqlite3.Connection":
+        """
+        Returns this thread's connection to the database, opening it on first use.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import sqlite3
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _update(self, tokens: float, floor_at_zero: bool) -> float:
+        """
+        Refills the shared bucket, takes `tokens` from it, and returns the resulting token count.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current, updated = conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (self._name,)).fetchone()
+            now = time.time()
+            current = min(self._burst, current + max(now - updated, 0.0) * self._rate)
+            if floor_at_zero:
+                current = min(current, 0.0)
+            current -= tokens
+            conn.execute("UPDATE buckets SET tokens = ?, updated = ? WHERE name = ?", (current, now, self._name))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return current
+
+    def reserve(self, tokens: float = 1) -> float:
+        return max(0.0, -self._update(tokens, False) / self._rate)
+
+    def pause(self, seconds: float) -> None:
+        self._update(seconds * self._rate, True)
+
+    def close(self) -> None:
+        """
+        Closes this thread's connection to the database.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses a `Retry-After` header (delay in seconds, or an HTTP date) into seconds from now.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+
+# Statuses that say the server is throttling or overloaded, rather than that one request failed.
+_THROTTLE_STATUSES = frozenset((429, 503))
+
+def _is_throttled(error: Exception) -> bool:
+    """
+    Whether a failure should slow down every caller sharing a rate limiter: a `429` or `503` status, or any `Retry-After`.
+    """
+    return bool(getattr(error, "retry_after", None)) or getattr(error, "status", None) in _THROTTLE_STATUSES
+
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    Only idempotent methods are retried, after connection errors and timeouts, after the `retry_statuses` HTTP
+    statuses, and after a non-JSON body (typically an error page from a proxy in front of the API). A `Retry-After`
+    header is honoured; otherwise the delay grows exponentially from `backoff`, with jitter so that parallel
+    workers don't retry in lockstep.
+
+    ## Parameters
+    - `max_retries` ( *int*, *optional* ) - Maximum number of retries per request.
+    - `backoff` ( *float*, *optional* ) - Base delay in seconds; the cap doubles with each retry.
+    - `max_backoff` ( *float*, *optional* ) - Maximum delay in seconds between retries (a `Retry-After` may exceed it).
+    - `retry_statuses` ( *Iterable[int]*, *optional* ) - HTTP statuses worth retrying.
+    - `methods` ( *Iterable[str]*, *optional* ) - HTTP methods that may be retried.
+
+    ## Example
+    ```python
+    >>> client = lcsc.LCSCClient(retry=lcsc.RetryPolicy(max_retries=5, backoff=1.0))
+    ```
+    """
+    def __init__(self, max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0, retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504), methods: tuple[str, ...] = ("GET", "HEAD")) -> None:
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._retry_statuses = frozenset(retry_statuses)
+        self._methods = frozenset(m.upper() for m in methods)
+
+    @property
+    def max_retries(self) -> int:
+        """
+        Maximum number of retries per request.
+        """
+        return self._max_retries
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Returns a jittered delay for retry number `attempt` (0-based): between half and all of `min(max_backoff, backoff * 2**attempt)`.
+        """
+        cap = min(self._max_backoff, self._backoff * 2 ** attempt)
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    def get_delay(self, method: str, error: Exception, attempt: int) -> float | None:
+        """
+        Returns how long to wait before retrying a request that failed with `error`, or `None` if it shouldn't be retried.
+
+        ## Parameters
+        - `method` ( *str* ) - The request's HTTP method.
+        - `error` ( *Exception* ) - The failure: an `LCSCHTTPError`, an `LCSCResponseError`, or a connection error or timeout.
+        - `attempt` ( *int* ) - Number of retries already made.
+        """
+        if attempt >= self._max_retries or method.upper() not in self._methods:
+            return None
+        if isinstance(error, LCSCHTTPError):
+            if error.status not in self._retry_statuses:
+                return None
+            if error.retry_after is not None:
+                return error.retry_after
+        elif isinstance(error, LCSCResponseError) and error.is_json:
+            # A well-formed API error (e.g. an unknown part number) won't change on retry.
+            return None
+        return self.backoff(attempt)
@@ -0,0 +1,136 @@
+"""
+src/lcsc/singleflight.py
+
+Coalescing of concurrent identical calls, so that one in-flight request serves every caller waiting on it.
+"""
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable
+if TYPE_CHECKING:
+    import asyncio
+
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time across threads; callers that arrive while a call with the same key
+    is in flight wait for it and share its result (or its exception) instead of running their own.
+
+    Nothing is cached: once a call finishes, the next caller with that key starts a new one.
+
+    ## Example
+    ```python
+    >>> flight = SingleFlight()
+    >>> flight.do(("GET", url, "productCode=C111887"), fetch, url)  # concurrent duplicates wait for one `fetch`
+    >>> flight.deduplicated
+    ```
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+        self._deduplicated = 0
+
+    @property
+    def deduplicated(self) -> int:
+        """
+        Number of calls that were served by another caller's in-flight call.
+        """
+        return self._deduplicated
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Number of distinct keys currently being called.
+        """
+        return len(self._calls)
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Returns `func(*args)`, or the result of the call already in flight for `key`.
+
+        ## Parameters
+        - `key` ( *Hashable* ) - Identifies calls that are interchangeable.
+        - `func` ( *Callable* ) - The function to call if no call for `key` is in flight.
+        - `*args` ( *Any* ) - Arguments passed to `func`.
+
+        ## Returns
+        - `result` ( *Any* ) - The shared result. An exception raised by `func` is raised in every waiting caller.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                future.set_running_or_notify_cancel()
+            else:
+                self._deduplicated += 1
+        if not leader:
+            return future.result()
+        try:
+            result = func(*args)
+        except BaseException as e:
+            self._forget(key)
+            future.set_exception(e)
+            raise
+        self._forget(key)
+        future.set_result(result)
+        return result
+
+    def _forget(self, key: Hashable) -> None:
+        # Removed before waiters are woken, so that later callers start a fresh call instead of joining a finished one.
+        with self._lock:
+            del self._calls[key]
+
+
+
+class AsyncSingleFlight:
+    """
+    The asyncio counterpart of `SingleFlight`, for coroutines running on one event loop.
+
+    The shared call runs as its own task, so cancelling one waiter (even the first) doesn't cancel it for the others.
+    """
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, "asyncio.Task"] = {}
+        self._deduplicated = 0
+
+    @property
+    def deduplicated(self) -> int:
+        """
+        Number of calls that were served by another caller's in-flight call.
+        """
+        return self._deduplicated
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Number of distinct keys currently being called.
+        """
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        Returns `await func(*args)`, or the result of the call already in flight for `key`.
+
+        ## Parameters
+        - `key` ( *Hashable* ) - Identifies calls that are interchangeable.
+        - `func` ( *Callable[..., Awaitable]* ) - The coroutine function to call if no call for `key` is in flight.
+        - `*args` ( *Any* ) - Arguments passed to `func`.
+
+        ## Returns
+        - `result` ( *Any* ) - The shared result. An exception raised by `func` is raised in every waiting caller.
+        """
+        import asyncio
+        task = self._calls.get(key)
+        if task is not None:
+            self._deduplicated += 1
+        else:
+            task = self._calls[key] = asyncio.ensure_future(func(*args))
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: "asyncio.Task") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Marks the exception as retrieved even if every waiter was cancelled.
+            task.exception()
@@ -3,6 +3,10 @@ src/lcsc/types.py
 
 Class objects/types for the `lcsc` package.
 """
+import copy
+import sys
+from bisect import bisect_right
+from .units import parse_value
 
 
 
@@ -10,9 +14,27 @@ class CatalogDetails:
     """
     Catalog details for a product.
     """
+    __slots__ = ("_id", "_name")
+    # One shared instance per catalog ID, for the life of the process. It is never pruned: it only grows with the
+    # number of distinct catalogs seen, which LCSC's catalog list bounds, at a few hundred bytes per entry.
+    _interned: dict[int, "CatalogDetails"] = {}
+
     def __init__(self, id: int, name: str) -> None:
         self._id = id
         self._name = name
+
+    @classmethod
+    def _intern(cls, id: int, name: str) -> "CatalogDetails":
+        """
+        Returns the shared instance for this catalog ID, so products in the same catalog don't each carry their own copy.
+        """
+        instance = cls._interned.get(id)
+        if instance is None:
+            # `setdefault` is atomic, so threads interning the same new ID at once all get the same instance.
+            instance = cls._interned.setdefault(id, cls(id, name))
+        if instance._name != name:
+            instance = cls._interned[id] = cls(id, name)
+        return instance
     
     @property
     def id(self) -> int:
@@ -61,9 +83,27 @@ class BrandDetails:
     """
     Brand details for a product.
     """
+    __slots__ = ("_id", "_name")
+    # One shared instance per brand ID, for the life of the process. It is never pruned: it only grows with the
+    # number of distinct brands seen, which LCSC's brand list bounds, at a few hundred bytes per entry.
+    _interned: dict[int, "BrandDetails"] = {}
+
     def __init__(self, id: int, name: str) -> None:
         self._id = id
         self._name = name
+
+    @classmethod
+    def _intern(cls, id: int, name: str) -> "BrandDetails":
+        """
+        Returns the shared instance for this brand ID, so products in the same brand don't each carry their own copy.
+        """
+        instance = cls._interned.get(id)
+        if instance is None:
+            # `setdefault` is atomic, so threads interning the same new ID at once all get the same instance.
+            instance = cls._interned.setdefault(id, cls(id, name))
+        if instance._name != name:
+            instance = cls._interned[id] = cls(id, name)
+        return instance
     
     @property
     def id(self) -> int:
@@ -112,6 +152,8 @@ class PriceDetails:
     """
     Price details for a product.
     """
+    __slots__ = ("_quantity", "_price", "_discount", "_discount_pct")
+
     def __init__(self, quantity: int, price: float, discount: float, discount_pct: float) -> None:
         self._quantity = quantity
         self._price = price
@@ -188,10 +230,14 @@ class Spec:
     """
     Specification detail for a product.
     """
+    __slots__ = ("_name", "_code", "_value", "_parsed")
+
     def __init__(self, name: str, code: str, value: str) -> None:
-        self._name = name
-        self._code = code
+        # Names and codes repeat across every product in a catalog, so share one copy of each string.
+        self._name = sys.intern(name)
+        self._code = sys.intern(code)
         self._value = value
+        self._parsed: tuple[float | None, str | None] | None = None
     
     @property
     def name(self) -> str:
@@ -214,6 +260,24 @@ class Spec:
         """
         return self._value
 
+    @property
+    def numeric_value(self) -> float | None:
+        """
+        The specification's value as a number in base SI units (e.g. `10000.0` for `10kΩ`), or `None` if it isn't a single quantity.
+        """
+        if self._parsed is None:
+            self._parsed = parse_value(self._value)
+        return self._parsed[0]
+
+    @property
+    def unit(self) -> str | None:
+        """
+        The unit of `numeric_value` (e.g. `Ω`, `%`, or `""` if dimensionless), or `None` if the value isn't a single quantity.
+        """
+        if self._parsed is None:
+            self._parsed = parse_value(self._value)
+        return self._parsed[1]
+
     def as_dict(self) -> dict[str, str]:
         """
         Returns the specification detail as a dictionary.
@@ -249,55 +313,127 @@ class Spec:
 
 
 
+def _parse_price_list(price_list: list[dict]) -> dict[int, PriceDetails]:
+    """
+    Builds the quantity -> `PriceDetails` mapping from a raw `productPriceList`.
+    """
+    price_details: dict[int, PriceDetails] = {}
+    first_price = float(price_list[0]["usdPrice"]) if price_list else 0
+    for i, p in enumerate(price_list):
+        ladder = int(p["ladder"])
+        price = float(p["usdPrice"])
+        discount = 0
+        discount_percent = 0
+        if i > 0:
+            discount = first_price - price
+            discount_percent = 100 * abs((price - first_price) / first_price)
+        price_details[ladder] = PriceDetails(ladder, price, discount, discount_percent)
+    return price_details
+
+
+
+def _parse_param_list(param_list: list[dict]) -> list["Spec"]:
+    """
+    Builds the list of `Spec` objects from a raw `paramVOList`.
+    """
+    return [Spec(str(p["paramNameEn"]), str(p["paramCode"]), str(p["paramValueEn"])) for p in param_list]
+
+
+
+# The raw payload keys that the lazily built properties read; all a `keep_raw=False` product holds on to.
+_LAZY_RAW_KEYS = (
+    "parentCatalogId", "parentCatalogName", "catalogId", "catalogName",
+    "brandId", "brandNameEn", "productPriceList", "paramVOList",
+)
+
+
+
 class ProductDetails:
     """
     Details for a product.
+
+    ## Parameters
+    - `raw_data` ( *dict* ) - The product's raw API payload.
+    - `keep_raw` ( *bool*, *optional* ) - Keep the whole payload for `view_raw`. With `False`, only the price list,
+      spec list, catalog and brand members needed for lazy parsing are kept, and the rest of the payload can be freed.
     """
-    def __init__(self, raw_data: dict) -> None:
-        self.__raw_data = raw_data
-        self._product_id =     int(self.__raw_data["productId"])
-        self._product_code =   self.__raw_data["productCode"]
-        self._product_url =    f"https://www.lcsc.com/product-detail/{self.__raw_data['productCode']}.html"
-        self._product_model =  self.__raw_data["productModel"]
-        self._product_title =  self.__raw_data["title"]
-        self._parent_catalog = CatalogDetails(int(self.__raw_data["parentCatalogId"]), self.__raw_data["parentCatalogName"])
-        self._catalog =        CatalogDetails(int(self.__raw_data["catalogId"]), self.__raw_data["catalogName"])
-        self._brand =          BrandDetails(int(self.__raw_data["brandId"]), self.__raw_data["brandNameEn"])
-        self._split_quantity = int(self.__raw_data["split"])
-        self._min_quantity =   int(self.__raw_data["minBuyNumber"])
-        self._is_hot =         bool(self.__raw_data["isHot"])
-        self._stock =          int(self.__raw_data["stockNumber"])
-        
-        price_details: dict[int, PriceDetails] = {}
-        for i, p in enumerate(self.__raw_data["productPriceList"]):
-            ladder = int(p["ladder"])
-            price = float(p["usdPrice"])
-            discount = 0
-            discount_percent = 0
-            if i > 0:
-                first_price = float(self.__raw_data["productPriceList"][0]["usdPrice"])
-                discount = first_price - price
-                discount_percent = 100 * abs((price - first_price) / first_price)
-            price_details[ladder] = PriceDetails(ladder, price, discount, discount_percent)
-        self._price = price_details
-        
-        self._image_urls =     self.__raw_data["productImages"]
-        self._datasheet_url =  self.__raw_data["pdfUrl"]
-        self._description =    self.__raw_data["productIntroEn"]
-        
-        specs_list = []
-        for p in self.__raw_data["paramVOList"]:
-            name = str(p["paramNameEn"])
-            code = str(p["paramCode"])
-            value = str(p["paramValueEn"])
-            specs_list.append(Spec(name, code, value))
-        self._specs: list["Spec"] = specs_list
+    __slots__ = (
+        "__raw_data", "_keep_raw", "_product_id", "_product_code", "_product_model", "_product_title", "_split_quantity",
+        "_min_quantity", "_is_hot", "_stock", "_image_urls", "_datasheet_url", "_description",
+        "_parent_catalog", "_catalog", "_brand", "_price", "_price_breaks", "_specs",
+    )
+
+    def __init__(self, raw_data: dict, keep_raw: bool = True) -> None:
+        self.__raw_data = raw_data if keep_raw else {k: raw_data[k] for k in _LAZY_RAW_KEYS}
+        self._keep_raw = keep_raw
+        self._product_id =     int(raw_data["productId"])
+        self._product_code =   raw_data["productCode"]
+        self._product_model =  raw_data["productModel"]
+        self._product_title =  raw_data["title"]
+        self._split_quantity = int(raw_data["split"])
+        self._min_quantity =   int(raw_data["minBuyNumber"])
+        self._is_hot =         bool(raw_data["isHot"])
+        self._stock =          int(raw_data["stockNumber"])
+        self._image_urls =     raw_data["productImages"]
+        self._datasheet_url =  raw_data["pdfUrl"]
+        self._description =    raw_data["productIntroEn"]
+
+        # Built from the raw data on first access (see the matching properties), since most callers
+        # (e.g. filtering search results by stock) never touch them.
+        self._parent_catalog: CatalogDetails | None = None
+        self._catalog:        CatalogDetails | None = None
+        self._brand:          BrandDetails | None = None
+        self._price:          dict[int, PriceDetails] | None = None
+        self._price_breaks:   list[int] | None = None
+        self._specs:          list["Spec"] | None = None
+
+    def _with_volatile(self, raw_data: dict) -> "ProductDetails":
+        """
+        Returns a copy of these details that shares every static field, with `stock` and `price` re-read from a fresher payload.
+        """
+        details = copy.copy(self)
+        details.__raw_data = raw_data if self._keep_raw else {k: raw_data[k] for k in _LAZY_RAW_KEYS}
+        details._stock = int(raw_data["stockNumber"])
+        details._price = None
+        details._price_breaks = None
+        return details
 
     def __hash__(self):
         """
         Allows using `ProductDetails` as dictionary keys and in sets.
         """
         return hash(self._product_code)
+
+    def __reduce__(self):
+        """
+        Pickles as the raw payload, which is much smaller and faster to serialize than the parsed objects.
+        """
+        if self._keep_raw:
+            return (ProductDetails, (self.__raw_data,))
+        raw_data = {
+            "productId": self._product_id,
+            "productCode": self._product_code,
+            "productModel": self._product_model,
+            "title": self._product_title,
+            "split": self._split_quantity,
+            "minBuyNumber": self._min_quantity,
+            "isHot": self._is_hot,
+            "stockNumber": self._stock,
+            "productImages": self._image_urls,
+            "pdfUrl": self._datasheet_url,
+            "productIntroEn": self._description,
+            **self.__raw_data,
+        }
+        return (ProductDetails, (raw_data, False))
+
+    def __copy__(self) -> "ProductDetails":
+        """
+        Shallow copy that keeps any sub-structures that were already parsed.
+        """
+        details = ProductDetails.__new__(ProductDetails)
+        for name in _PRODUCT_DETAILS_SLOTS:
+            setattr(details, name, getattr(self, name))
+        return details
     
     @property
     def product_id(self) -> int:
@@ -318,7 +454,7 @@ class ProductDetails:
         """
         The URL pointing to the product on LCSC's website (e.g. `www.lcsc.com/product-detail/C111887.html"`).
         """
-        return self._product_url
+        return f"https://www.lcsc.com/product-detail/{self._product_code}.html"
     
     @property
     def product_model(self) -> str:
@@ -339,6 +475,8 @@ class ProductDetails:
         """
         The product's parent catalog details (see: [`CatalogDetails`](https://github.com/mkaufman2023/LCSC/blob/main/src/lcsc/types.py#L9)).
         """
+        if self._parent_catalog is None:
+            self._parent_catalog = CatalogDetails._intern(int(self.__raw_data["parentCatalogId"]), self.__raw_data["parentCatalogName"])
         return self._parent_catalog
     
     @property
@@ -346,6 +484,8 @@ class ProductDetails:
         """
         The product's catalog details (see: [`CatalogDetails`](https://github.com/mkaufman2023/LCSC/blob/main/src/lcsc/types.py#L9)).
         """
+        if self._catalog is None:
+            self._catalog = CatalogDetails._intern(int(self.__raw_data["catalogId"]), self.__raw_data["catalogName"])
         return self._catalog
     
     @property
@@ -353,6 +493,8 @@ class ProductDetails:
         """
         The product's brand details (see: [`BrandDetails`](https://github.com/mkaufman2023/LCSC/blob/main/src/lcsc/types.py#L60)).
         """
+        if self._brand is None:
+            self._brand = BrandDetails._intern(int(self.__raw_data["brandId"]), self.__raw_data["brandNameEn"])
         return self._brand
     
     @property
@@ -388,6 +530,8 @@ class ProductDetails:
         """
         A dictionary mapping quantity breakpoints to their corresponding price details (see: [`PriceDetails`](https://github.com/mkaufman2023/LCSC/blob/main/src/lcsc/types.py#L111)).
         """
+        if self._price is None:
+            self._price = _parse_price_list(self.__raw_data["productPriceList"])
         return self._price
     
     @property
@@ -416,6 +560,8 @@ class ProductDetails:
         """
         A list of the product's specifications (see: [`Spec`](https://github.com/mkaufman2023/LCSC/blob/main/src/lcsc/types.py#L187)).
         """
+        if self._specs is None:
+            self._specs = _parse_param_list(self.__raw_data["paramVOList"])
         return self._specs
     
     def as_dict(self) -> dict[str, int | str | bool | dict | list]:
@@ -444,21 +590,21 @@ class ProductDetails:
         return {
             "product_id": self._product_id,
             "product_code": self._product_code,
-            "product_url": self._product_url,
+            "product_url": self.product_url,
             "product_model": self._product_model,
             "product_title": self._product_title,
-            "parent_catalog": self._parent_catalog.as_dict(),
-            "catalog": self._catalog.as_dict(),
-            "brand": self._brand.as_dict(),
+            "parent_catalog": self.parent_catalog.as_dict(),
+            "catalog": self.catalog.as_dict(),
+            "brand": self.brand.as_dict(),
             "split_quantity": self._split_quantity,
             "min_quantity": self._min_quantity,
             "is_hot": self._is_hot,
             "stock": self._stock,
-            "price": {k: v.as_dict() for k, v in self._price.items()},
+            "price": {k: v.as_dict() for k, v in self.price.items()},
             "image_urls": self._image_urls,
             "datasheet_url": self._datasheet_url,
             "description": self._description,
-            "specs": [s.as_dict() for s in self._specs],
+            "specs": [s.as_dict() for s in self.specs],
         }
     
     def as_tuple(self) -> tuple[int, str, str, str, str, tuple[int, str], tuple[int, str], tuple[int, str], int, int, bool, int, tuple[tuple[int, tuple[int, float, float, float]], ...], tuple[str], str, str, tuple[tuple[str, str, str], ...]]:
@@ -487,21 +633,21 @@ class ProductDetails:
         return (
             self._product_id,
             self._product_code,
-            self._product_url,
+            self.product_url,
             self._product_model,
             self._product_title,
-            self._parent_catalog.as_tuple(),
-            self._catalog.as_tuple(),
-            self._brand.as_tuple(),
+            self.parent_catalog.as_tuple(),
+            self.catalog.as_tuple(),
+            self.brand.as_tuple(),
             self._split_quantity,
             self._min_quantity,
             self._is_hot,
             self._stock,
-            tuple((k, v.as_tuple()) for k, v in self._price.items()),
+            tuple((k, v.as_tuple()) for k, v in self.price.items()),
             tuple(self._image_urls),
             self._datasheet_url,
             self._description,
-            tuple(s.as_tuple() for s in self._specs),
+            tuple(s.as_tuple() for s in self.specs),
         )
     
     def view(self) -> None:
@@ -514,7 +660,11 @@ class ProductDetails:
     def view_raw(self) -> None:
         """
         Views the raw product details data in a GUI window.
+
+        Raises a `ValueError` if the details were built with `keep_raw=False`.
         """
+        if not self._keep_raw:
+            raise ValueError(f"The raw data of {self._product_code} was not kept (built with `keep_raw=False`).")
         from pyjsonviewer import view_data as _view
         _view(json_data=self.__raw_data)
 
@@ -525,7 +675,15 @@ class ProductDetails:
         ## Returns
         - `price_breaks` ( *list[int]* ) - A sorted list of the quantity breakpoints.
         """
-        return sorted(self.price.keys())
+        return list(self._sorted_price_breaks())
+
+    def _sorted_price_breaks(self) -> list[int]:
+        """
+        The sorted quantity breakpoints, computed once and memoized.
+        """
+        if self._price_breaks is None:
+            self._price_breaks = sorted(self.price.keys())
+        return self._price_breaks
     
     def get_order_cost(self, quantity: int) -> float:
         """
@@ -541,21 +699,21 @@ class ProductDetails:
             raise ValueError(f"Quantity {quantity} is less than minimum order quantity of {self.min_quantity}.")
         if quantity % self.split_quantity != 0:
             raise ValueError(f"Quantity {quantity} is not a multiple of split quantity of {self.split_quantity}.")
-        ladders = sorted(self.price.keys())
-        applicable_ladder = ladders[0]
-        for ladder in ladders:
-            if quantity >= ladder:
-                applicable_ladder = ladder
-            else:
-                break
+        ladders = self._sorted_price_breaks()
+        applicable_ladder = ladders[max(bisect_right(ladders, quantity) - 1, 0)]
         return self.price[applicable_ladder].price * quantity
 
 
+_PRODUCT_DETAILS_SLOTS = tuple(f"_ProductDetails{name}" if name.startswith("__") else name for name in ProductDetails.__slots__)
+
+
 
 class SearchResult:
     """
     Details for a search result item.
     """
+    __slots__ = ("_index", "_product_url", "_on_discount", "_product_details")
+
     def __init__(self, index: int, product_url: str, on_discount: bool, product_details: ProductDetails) -> None:
         self._index = index
         self._product_url = product_url
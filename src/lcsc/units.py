@@ -0,0 +1,69 @@
+"""
+src/lcsc/units.py
+
+Parsing of spec values such as `10kΩ`, `1.5A` or `±1%` into numbers in base SI units.
+"""
+import re
+
+
+
+_NUMBER_RE = re.compile(r"\s*[±+]?\s*(-?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)\s*([^\s@(,;/]*)")
+
+_PREFIXES = {
+    "p": 1e-12,
+    "n": 1e-9,
+    "u": 1e-6,
+    "µ": 1e-6,
+    "μ": 1e-6,
+    "m": 1e-3,
+    "k": 1e3,
+    "K": 1e3,
+    "M": 1e6,
+    "G": 1e9,
+    "T": 1e12,
+}
+
+_UNIT_ALIASES = {
+    "ohm": "Ω",
+    "ohms": "Ω",
+    "Ohm": "Ω",
+    "Ohms": "Ω",
+    "°C": "℃",
+    "degC": "℃",
+}
+
+_UNITS = {"Ω", "V", "A", "F", "H", "Hz", "W", "%", "℃", "s", "m", "g", "dB", "dBm", "ppm", "VA", "Wh", "Ah", "bps", "B", "bit", "lm", "cd"}
+
+
+
+def parse_value(text: str) -> tuple[float | None, str | None]:
+    """
+    Parses a spec value into a number in base units and its unit.
+
+    SI prefixes are applied (`10kΩ` -> `10000.0, "Ω"`), a leading `±` is dropped (`±1%` -> `1.0, "%"`), and
+    trailing conditions are ignored (`62dB@(120Hz)` -> `62.0, "dB"`). Ranges (`-55℃~+150℃`) and non-numeric
+    values (`SOT-23`) give `(None, None)`.
+
+    ## Parameters
+    - `text` ( *str* ) - The raw spec value.
+
+    ## Returns
+    - `(value, unit)` ( *tuple[float | None, str | None]* ) - The number in base units, and the unit (`""` if dimensionless).
+    """
+    if not text or "~" in text:
+        return None, None
+    match = _NUMBER_RE.match(text)
+    if match is None:
+        return None, None
+    number, unit = match.groups()
+    rest = text[match.end():].lstrip()
+    if rest and rest[0] not in "@(,;/":
+        return None, None
+    value = float(number)
+    unit = _UNIT_ALIASES.get(unit, unit)
+    if unit in _UNITS or unit == "":
+        return value, unit
+    prefix, base = unit[0], _UNIT_ALIASES.get(unit[1:], unit[1:])
+    if prefix in _PREFIXES and (base in _UNITS or base == ""):
+        return value * _PREFIXES[prefix], base
+    return None, None
@@ -0,0 +1,320 @@
+"""
+src/lcsc/watch.py
+
+Watches parts for stock and price changes, polling each one at an interval adapted to how often it changes.
+"""
+import heapq
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import AsyncIterator, Callable, Iterable, NamedTuple
+from .client import LCSCClient, get_default_client
+from .ratelimit import TokenBucket
+from .types import ProductDetails
+
+# Longest `run()` sleeps between checks of its `stop` event, in seconds.
+_STOP_CHECK_INTERVAL = 0.5
+
+
+
+class WatchEvent(NamedTuple):
+    """
+    A change seen by a `StockWatcher`.
+
+    ## Attributes
+    - `kind` ( *str* ) - `in_stock` (stock went from 0 to positive), `out_of_stock` (to 0), `stock` (any other stock change), `price` (the price ladder changed) or `error` (the lookup failed).
+    - `product_code` ( *str* ) - The part's LCSC code.
+    - `old` ( *int | dict[int, float] | None* ) - The previous stock, or price ladder as `{quantity: usd_price}`. `None` for errors.
+    - `new` ( *int | dict[int, float] | Exception* ) - The new stock or price ladder, or the exception raised by the lookup.
+    - `details` ( *ProductDetails | None* ) - The fresh details. `None` for errors.
+    - `timestamp` ( *float* ) - When the change was seen, in seconds since the epoch.
+    """
+    kind: str
+    product_code: str
+    old: int | dict[int, float] | None
+    new: int | dict[int, float] | Exception
+    details: ProductDetails | None
+    timestamp: float
+
+
+
+def _ladder(details: ProductDetails) -> tuple[tuple[int, float], ...]:
+    price = details.price
+    return tuple((quantity, price[quantity].price) for quantity in details._sorted_price_breaks())
+
+
+def _diff(code: str, old: ProductDetails, new: ProductDetails, timestamp: float) -> list[WatchEvent]:
+    """
+    Returns the events between two snapshots of a part: at most one stock event and one price event.
+    """
+    events = []
+    if new.stock != old.stock:
+        kind = "in_stock" if old.stock <= 0 < new.stock else "out_of_stock" if new.stock <= 0 < old.stock else "stock"
+        events.append(WatchEvent(kind, code, old.stock, new.stock, new, timestamp))
+    old_ladder, new_ladder = _ladder(old), _ladder(new)
+    if new_ladder != old_ladder:
+        events.append(WatchEvent("price", code, dict(old_ladder), dict(new_ladder), new, timestamp))
+    return events
+
+
+
+class StockWatcher:
+    """
+    Polls a set of parts and reports their stock and price changes, spending the request budget where changes happen.
+
+    Every part has its own polling interval. It drops to `min_interval` whenever the part changes and grows by
+    `backoff` after each unchanged poll, up to `max_interval`. Parts with less than `low_stock` in stock are
+    capped lower, in proportion to their stock, so out-of-stock parts are polled every `min_interval` and a
+    restock is seen quickly. Every lookup takes a token from `rate`, so the watcher never sends more than that
+    many requests per second. If the intervals call for more (see: `demand`), the most overdue parts go first.
+
+    The first poll of a part only records its state. After that, each change is passed to `callback` (from the
+    polling thread) and returned by `poll()`, or yielded by `events()`.
+
+    ## Parameters
+    - `codes` ( *Iterable[str]*, *optional* ) - The LCSC part codes to watch. More can be added with `add()`.
+    - `callback` ( *Callable[[WatchEvent], None]*, *optional* ) - Called with every event.
+    - `client` ( *LCSCClient*, *optional* ) - The client used for lookups. Defaults to the shared default client.
+    - `rate` ( *float | TokenBucket*, *optional* ) - Maximum lookups per second, or a (possibly shared) `TokenBucket`.
+    - `min_interval` ( *float*, *optional* ) - Shortest polling interval, in seconds.
+    - `max_interval` ( *float*, *optional* ) - Longest polling interval, in seconds.
+    - `low_stock` ( *int*, *optional* ) - Parts with less stock than this are polled more often. `0` disables.
+    - `backoff` ( *float*, *optional* ) - Factor by which the interval of an unchanged part grows.
+    - `max_workers` ( *int*, *optional* ) - Concurrent lookups. Defaults to the client's `pool_size`.
+
+    ## Example
+    ```python
+    >>> watcher = lcsc.StockWatcher(codes, callback=print, rate=2, min_interval=60, max_interval=6 * 3600)
+    >>> watcher.run()  # until interrupted
+    >>> async for event in watcher.events():
+    ...     if event.kind == "in_stock":
+    ...         notify(event.product_code, event.new)
+    ```
+    """
+    def __init__(self, codes: Iterable[str] = (), callback: Callable[[WatchEvent], None] | None = None, client: LCSCClient | None = None, rate: float | TokenBucket = 1.0, min_interval: float = 60.0, max_interval: float = 3600.0, low_stock: int = 100, backoff: float = 1.5, max_workers: int | None = None) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError(f"Expected 0 < `min_interval` <= `max_interval`, got {min_interval} and {max_interval}.")
+        if backoff < 1:
+            raise ValueError(f"`backoff` must be at least 1, got {backoff}.")
+        self._callback = callback
+        self._client = client
+        self._rate_limiter = rate if isinstance(rate, TokenBucket) else TokenBucket(rate)
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._low_stock = low_stock
+        self._backoff = backoff
+        self._max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._state: dict[str, ProductDetails | None] = {}
+        self._intervals: dict[str, float] = {}
+        self._due: dict[str, float] = {}
+        self._queue: list[tuple[float, str]] = []
+        # Set by `add()` so that `run()` polls new parts right away instead of sleeping out the current wait.
+        self._wakeup = threading.Event()
+        self.add(codes)
+
+    @property
+    def client(self) -> LCSCClient:
+        """
+        The client used for lookups.
+        """
+        return self._client if self._client is not None else get_default_client()
+
+    @property
+    def rate_limiter(self) -> TokenBucket:
+        """
+        The token bucket every lookup is taken from.
+        """
+        return self._rate_limiter
+
+    @property
+    def codes(self) -> list[str]:
+        """
+        The watched part codes, in the order they were added.
+        """
+        return list(self._state)
+
+    @property
+    def demand(self) -> float:
+        """
+        Lookups per second the current intervals call for. While it exceeds `rate_limiter.rate`, parts are polled late.
+        """
+        with self._lock:
+            return sum(1 / interval for interval in self._intervals.values())
+
+    def add(self, codes: Iterable[str]) -> None:
+        """
+        Starts watching `codes` (already watched ones are left as they are). New parts are polled right away.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for code in codes:
+                if code not in self._state:
+                    self._state[code] = None
+                    self._intervals[code] = self._min_interval
+                    self._schedule(code, now)
+        self._wakeup.set()
+
+    def remove(self, codes: Iterable[str]) -> None:
+        """
+        Stops watching `codes`.
+        """
+        with self._lock:
+            for code in codes:
+                self._state.pop(code, None)
+                self._intervals.pop(code, None)
+                self._due.pop(code, None)
+
+    def interval(self, lcsc_part_number: str) -> float:
+        """
+        The part's current polling interval, in seconds.
+        """
+        return self._intervals[lcsc_part_number]
+
+    def last_seen(self, lcsc_part_number: str) -> ProductDetails | None:
+        """
+        The part's details as of its last successful poll, or `None` if it hasn't been polled yet.
+        """
+        return self._state[lcsc_part_number]
+
+    def _schedule(self, code: str, due: float) -> None:
+        # Entries for removed or rescheduled parts stay in the heap and are skipped when they come up.
+        self._due[code] = due
+        heapq.heappush(self._queue, (due, code))
+
+    def _pop_due(self, now: float, force: bool) -> list[str]:
+        due = []
+        with self._lock:
+            if force:
+                self._queue = []
+                due = list(self._due)
+                self._due.clear()
+                return due
+            while self._queue and self._queue[0][0] <= now:
+                at, code = heapq.heappop(self._queue)
+                if self._due.get(code) == at:
+                    del self._due[code]
+                    due.append(code)
+        return due
+
+    def next_poll(self) -> float | None:
+        """
+        Seconds until the next part is due (`0` if one is overdue), or `None` if nothing is watched.
+        """
+        with self._lock:
+            while self._queue and self._due.get(self._queue[0][1]) != self._queue[0][0]:
+                heapq.heappop(self._queue)
+            if not self._queue:
+                return None
+            return max(0.0, self._queue[0][0] - time.monotonic())
+
+    def _next_interval(self, interval: float, changed: bool, stock: int) -> float:
+        if changed:
+            return self._min_interval
+        cap = self._max_interval
+        if stock < self._low_stock:
+            cap = self._min_interval + (cap - self._min_interval) * max(stock, 0) / self._low_stock
+        return max(self._min_interval, min(interval * self._backoff, cap))
+
+    def _update(self, code: str, result: ProductDetails | Exception) -> list[WatchEvent]:
+        """
+        Diffs a lookup result against the part's last state and reschedules the part.
+        """
+        timestamp = time.time()
+        with self._lock:
+            if code not in self._state:
+                return []
+            interval = self._intervals[code]
+            if isinstance(result, Exception):
+                events = [WatchEvent("error", code, None, result, None, timestamp)]
+            else:
+                previous = self._state[code]
+                events = _diff(code, previous, result, timestamp) if previous is not None else []
+                self._state[code] = result
+                interval = self._next_interval(interval, bool(events), result.stock)
+                self._intervals[code] = interval
+            self._schedule(code, time.monotonic() + interval)
+        return events
+
+    def poll(self, force: bool = False) -> list[WatchEvent]:
+        """
+        Looks up every part that is due, within the rate budget, and returns the changes found (in completion order).
+
+        ## Parameters
+        - `force` ( *bool*, *optional* ) - Poll every watched part now, due or not.
+
+        ## Returns
+        - `events` ( *list[WatchEvent]* ) - The changes, also passed to `callback`.
+        """
+        codes = self._pop_due(time.monotonic(), force)
+        if not codes:
+            return []
+        client = self.client
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers or client.pool_size, thread_name_prefix="lcsc-watch")
+        futures: dict[Future, str] = {}
+        for code in codes:
+            self._rate_limiter.acquire()
+            futures[self._executor.submit(client.get_product_details, code, "refresh")] = code
+        events = []
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = e
+            for event in self._update(futures[future], result):
+                events.append(event)
+                if self._callback is not None:
+                    self._callback(event)
+        return events
+
+    def run(self, duration: float | None = None, stop: threading.Event | None = None) -> None:
+        """
+        Polls parts as they come due, passing the changes to `callback`, until `duration` has passed or `stop` is set.
+
+        ## Parameters
+        - `duration` ( *float*, *optional* ) - How long to run, in seconds. Defaults to forever.
+        - `stop` ( *threading.Event*, *optional* ) - Set it (e.g. from another thread) to stop after the current poll.
+        """
+        deadline = time.monotonic() + duration if duration is not None else None
+        while stop is None or not stop.is_set():
+            self._wakeup.clear()
+            wait = self.next_poll()
+            # Sleeps are bounded so that `stop` is seen promptly, and end early when `add()` is called.
+            cap = min(self._min_interval, _STOP_CHECK_INTERVAL)
+            wait = cap if wait is None else min(wait, cap)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                wait = min(wait, remaining)
+            if wait > 0:
+                self._wakeup.wait(wait)
+                continue
+            self.poll()
+
+    async def events(self) -> AsyncIterator[WatchEvent]:
+        """
+        Polls parts as they come due and yields each change, forever. Lookups run in a worker thread, so the event loop is never blocked.
+
+        ## Yields
+        - `event` ( *WatchEvent* ) - In the order the changes are seen.
+        """
+        import asyncio
+        while True:
+            wait = self.next_poll()
+            if wait is None or wait > 0:
+                # Parts added meanwhile are polled within `min_interval`.
+                await asyncio.sleep(self._min_interval if wait is None else min(wait, self._min_interval))
+                continue
+            for event in await asyncio.to_thread(self.poll):
+                yield event
+
+    def close(self) -> None:
+        """
+        Shuts down the lookup threads. The watcher can still be used afterwards.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,205 @@
+"""
+tests/conftest.py
+
+Shared fixtures: synthetic API payloads and a local stub of the LCSC API.
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+
+
+def make_product(code: str) -> dict:
+    """
+    Builds a deterministic, API-shaped product payload for an LCSC code such as `C1234`.
+    """
+    n = int(code.lstrip("C"))
+    base_price = round(0.05 + (n % 97) / 100, 4)
+    return {
+        "productId": 100000 + n,
+        "productCode": code,
+        "productModel": f"MODEL-{n}",
+        "title": f"ACME MODEL-{n}",
+        "parentCatalogId": 1000 + n % 3,
+        "parentCatalogName": f"Parent Catalog {n % 3}",
+        "catalogId": 2000 + n % 7,
+        "catalogName": f"Catalog {n % 7}",
+        "brandId": 300 + n % 5,
+        "brandNameEn": f"Brand {n % 5}",
+        "split": 5,
+        "minBuyNumber": 5,
+        "isHot": n % 2,
+        "stockNumber": (n * 37) % 5000,
+        "productPriceList": [
+            {"ladder": 5, "usdPrice": base_price},
+            {"ladder": 50, "usdPrice": round(base_price * 0.9, 4)},
+            {"ladder": 500, "usdPrice": round(base_price * 0.8, 4)},
+        ],
+        "productImages": [f"https://assets.lcsc.com/images/{code}_front.jpg"],
+        "pdfUrl": f"https://www.lcsc.com/datasheet/{code}.pdf",
+        "productIntroEn": f"Synthetic test product number {n}",
+        "paramVOList": [
+            {"paramNameEn": "Resistance", "paramCode": "param_10953_n", "paramValueEn": f"{n % 100}kΩ"},
+            {"paramNameEn": "Tolerance", "paramCode": "param_10954", "paramValueEn": "±1%"},
+        ],
+        "url": f"https://www.lcsc.com/product-detail/{code}.html",
+        "isDiscount": n % 4 == 0,
+    }
+
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: dict | None = None) -> None:
+        self._send(status, json.dumps(body).encode(), "application/json", headers)
+
+    def _send(self, status: int, data: bytes, content_type: str, headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        stub: StubServer = self.server.stub
+        parts = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        with stub.lock:
+            stub.requests.append((parts.path, params, dict(self.headers)))
+            stub.connections.add(self.client_address)
+            stub.in_flight += 1
+            stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+        try:
+            if stub.delay:
+                time.sleep(stub.delay)
+            self._respond(stub, parts.path, params)
+        finally:
+            with stub.lock:
+                stub.in_flight -= 1
+
+    def _respond(self, stub: "StubServer", path: str, params: dict) -> None:
+        if path == "/ftps/wm/product/detail":
+            code = params["productCode"]
+            with stub.lock:
+                flaky = stub.flaky.get(code, 0)
+                if flaky:
+                    stub.flaky[code] = flaky - 1
+            if flaky:
+                headers = {"Retry-After": stub.retry_after} if stub.retry_after is not None else None
+                self._send_json(stub.flaky_status, {"code": stub.flaky_status, "msg": "busy"}, headers)
+                return
+            if code in stub.html_codes:
+                self._send(200, b"<html><body>Access denied</body></html>", "text/html")
+                return
+            if code in stub.fail_codes:
+                self._send_json(500, {"code": 500, "msg": "error"})
+                return
+            self._send_json(200, {"code": 200, "result": make_product(code)})
+        elif path == "/ftps/wm/search/global":
+            page = int(params.get("currentPage", 1))
+            page_size = int(params.get("pageSize", 100))
+            start = (page - 1) * page_size
+            stop = min(start + page_size, stub.total_hits)
+            products = [make_product(f"C{i + 1}") for i in range(start, stop)]
+            self._send_json(200, {"code": 200, "result": {"productSearchResultVO": {
+                "productList": products,
+                "totalCount": stub.total_hits,
+                "currentPage": page,
+                "pageSize": page_size,
+                "totalPage": -(-stub.total_hits // page_size),
+            }}})
+        elif path.startswith("/files/"):
+            self._send_file(stub, path[len("/files/"):])
+        else:
+            self._send_json(404, {"code": 404, "msg": "not found"})
+
+    def _send_file(self, stub: "StubServer", name: str) -> None:
+        """
+        Serves `stub.files[name]`, honouring `Range` (and `If-Range`), and breaks off after `stub.cut_after[name]` bytes once.
+        """
+        data = stub.files.get(name)
+        if data is None:
+            self._send_json(404, {"code": 404, "msg": "not found"})
+            return
+        etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", etag) == etag:
+            start = int(range_header.split("=", 1)[1].split("-", 1)[0])
+            if start >= len(data):
+                self._send(416, b"", "text/plain", {"Content-Range": f"bytes */{len(data)}"})
+                return
+        body = data[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+        self.end_headers()
+        with stub.lock:
+            cut = stub.cut_after.pop(name, None)
+        if cut is not None:
+            self.wfile.write(body[:cut])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+
+class StubServer:
+    """
+    A threaded local HTTP server that mimics the LCSC API endpoints.
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.requests: list[tuple[str, dict, dict]] = []
+        self.connections: set[tuple[str, int]] = set()
+        self.fail_codes: set[str] = set()
+        self.html_codes: set[str] = set()
+        self.flaky: dict[str, int] = {}
+        self.flaky_status = 503
+        self.retry_after: str | None = None
+        self.total_hits = 25
+        self.files: dict[str, bytes] = {}
+        self.cut_after: dict[str, int] = {}
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,136 @@
+"""
+tests/test_aio.py
+
+
+"""
+import asyncio
+import gc
+import time
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from lcsc import AsyncLCSCClient, LCSCClient, ProductDetails, get_product_details_async, get_search_results_async
+
+
+
+def test_get_product_details_async(stub_server):
+    async def main():
+        async with AsyncLCSCClient(base_url=stub_server.url) as client:
+            return await client.get_product_details("C111887")
+    details = asyncio.run(main())
+    assert isinstance(details, ProductDetails)
+    assert details.product_code == "C111887"
+
+
+def test_concurrency_is_bounded(stub_server):
+    stub_server.delay = 0.05
+    async def main():
+        async with AsyncLCSCClient(base_url=stub_server.url, concurrency=4) as client:
+            return await asyncio.gather(*(client.get_product_details(f"C{i + 1}") for i in range(20)))
+    results = asyncio.run(main())
+    assert [r.product_code for r in results] == [f"C{i + 1}" for i in range(20)]
+    assert stub_server.max_in_flight <= 4
+    assert len(stub_server.connections) <= 4
+
+
+def test_get_search_results_async_matches_sync_shape(stub_server):
+    async def main():
+        async with AsyncLCSCClient(base_url=stub_server.url) as client:
+            return await client.get_search_results("anything", min_stock=None, sort_by="price")
+    results = asyncio.run(main())
+    assert len(results) == stub_server.total_hits
+    prices = [r.product_details.price[5].price for r in results]
+    assert prices == sorted(prices)
+
+
+def test_get_search_results_async_limit_matches_sync(stub_server):
+    async def main():
+        async with AsyncLCSCClient(base_url=stub_server.url) as client:
+            return await get_search_results_async("anything", min_stock=None, sort_by="price", client=client, limit=3)
+    results = asyncio.run(main())
+    with LCSCClient(base_url=stub_server.url) as client:
+        expected = client.get_search_results("anything", min_stock=None, sort_by="price", limit=3)
+    assert len(results) == 3
+    assert [r.product_details.product_code for r in results] == [r.product_details.product_code for r in expected]
+
+
+def test_invalid_sort_by_raises_async(stub_server):
+    async def main():
+        async with AsyncLCSCClient(base_url=stub_server.url) as client:
+            return await client.get_search_results("anything", sort_by="name")
+    with pytest.raises(ValueError, match="sort_by"):
+        asyncio.run(main())
+
+
+def test_module_function_accepts_client(stub_server):
+    async def main():
+        async with AsyncLCSCClient(base_url=stub_server.url) as client:
+            return await get_product_details_async("C7", client=client)
+    assert asyncio.run(main()).product_code == "C7"
+
+
+def test_module_functions_reuse_default_client_across_loops(stub_server, tmp_path, caplog):
+    from lcsc import ResponseCache, SQLiteTokenBucket, aclose_default_client, get_default_async_client, set_default_async_client
+    client = AsyncLCSCClient(base_url=stub_server.url, cache=ResponseCache(tmp_path / "cache.sqlite3"), rate_limiter=SQLiteTokenBucket(str(tmp_path / "bucket.sqlite3"), rate=1000))
+    set_default_async_client(client)
+    async def main():
+        assert get_default_async_client() is client
+        first = await get_product_details_async("C7")
+        session = client._get_session()
+        second = await get_product_details_async("C7")
+        assert client._get_session() is session
+        await aclose_default_client()
+        return first, second
+    try:
+        for _ in range(2):
+            first, second = asyncio.run(main())
+            assert first.as_dict() == second.as_dict()
+            # The session was closed before `asyncio.run()` shut its loop down, and is reopened in the next loop.
+            assert client._session is None
+    finally:
+        set_default_async_client(None)
+    assert len(stub_server.requests) == 1
+    gc.collect()
+    assert "Unclosed" not in caplog.text
+
+
+def test_default_client_on_a_manually_managed_loop(stub_server, caplog):
+    from lcsc import set_default_async_client
+    from lcsc.aio import _close_default_client_at_exit
+    client = AsyncLCSCClient(base_url=stub_server.url)
+    set_default_async_client(client)
+    loop = asyncio.new_event_loop()
+    try:
+        for code in ("C7", "C8"):
+            assert loop.run_until_complete(get_product_details_async(code)).product_code == code
+        assert client._session is not None and len(stub_server.connections) == 1
+        # Nothing is left pending on the loop; the session is closed by the exit hook while the loop is still open.
+        assert asyncio.all_tasks(loop) == set()
+        _close_default_client_at_exit()
+        assert client._session is None
+    finally:
+        loop.close()
+        set_default_async_client(None)
+    gc.collect()
+    assert "Task was destroyed" not in caplog.text and "Unclosed" not in caplog.text
+
+
+def test_blocking_cache_calls_leave_the_loop_free(stub_server, tmp_path, monkeypatch):
+    from lcsc import ResponseCache
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    get = cache.get
+    def slow_get(*args):
+        time.sleep(0.2)
+        return get(*args)
+    monkeypatch.setattr(cache, "get", slow_get)
+    async def main():
+        async with AsyncLCSCClient(base_url=stub_server.url, cache=cache) as client:
+            lookup = asyncio.ensure_future(client.get_product_details("C7"))
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            ticked = time.perf_counter() - started
+            await lookup
+            return ticked
+    assert asyncio.run(main()) < 0.1
@@ -0,0 +1,35 @@
+"""
+tests/test_benchmarks.py
+
+
+"""
+import json
+import math
+import os
+import subprocess
+import sys
+
+_RUN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "run.py")
+
+
+
+def _numbers(value):
+    if isinstance(value, dict):
+        for v in value.values():
+            yield from _numbers(v)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield value
+
+
+def test_every_benchmark_runs_against_the_stub(tmp_path):
+    output = tmp_path / "results.json"
+    subprocess.run([sys.executable, _RUN, "--quick", "--scale", "0.01", "--output", str(output)], capture_output=True, text=True, check=True, timeout=120)
+    results = json.loads(output.read_text())
+    assert results["meta"]["scale"] == 0.01
+    assert list(results["results"]) == ["single_lookup", "batch_throughput", "parse", "search", "order_cost"]
+    assert all(math.isfinite(n) and n >= 0 for n in _numbers(results["results"]))
+    assert results["results"]["batch_throughput"]["threads_4"]["errors"] == 0
+    # Comparing with a baseline prints one line per shared metric.
+    compared = subprocess.run([sys.executable, _RUN, "--quick", "--scale", "0.01", "--only", "search", "--baseline", str(output)], capture_output=True, text=True, check=True, timeout=120)
+    assert json.loads(compared.stdout)["results"].keys() == {"search"}
+    assert sum(line.startswith("search.") for line in compared.stderr.splitlines()) == 5
@@ -0,0 +1,47 @@
+"""
+tests/test_bom.py
+
+
+"""
+import io
+
+import pytest
+
+from conftest import make_product
+from lcsc import LCSCClient, quote_bom, read_bom_csv
+from lcsc.bom import best_order_quantity
+from lcsc.types import ProductDetails
+
+
+
+def test_best_order_quantity_rounds_to_legal_quantity():
+    details = ProductDetails(make_product("C10"))
+    assert best_order_quantity(details, 1)[0] == 5
+    assert best_order_quantity(details, 12)[0] == 15
+    assert best_order_quantity(details, 0) == (0, 0.0)
+
+
+def test_best_order_quantity_buys_up_to_cheaper_break():
+    details = ProductDetails(make_product("C10"))
+    quantity, cost = best_order_quantity(details, 493)
+    assert quantity == 500
+    assert cost == pytest.approx(details.get_order_cost(500))
+    assert cost < details.get_order_cost(495)
+
+
+def test_read_bom_csv():
+    rows = read_bom_csv(io.StringIO("Ref,LCSC_Code,Quantity\nR1,C1,10\nR2,,3\nU1,C2,1\n"))
+    assert rows == [("C1", 10), ("C2", 1)]
+    with pytest.raises(ValueError):
+        read_bom_csv(io.StringIO("a,b\n1,2\n"))
+
+
+def test_quote_bom(stub_server):
+    stub_server.fail_codes = {"C3"}
+    with LCSCClient(base_url=stub_server.url, retry=None) as client:
+        quote = quote_bom([("C1", 10), ("C2", 4000), ("C3", 1), ("C1", 2)], client=client)
+    assert [line.lcsc_code for line in quote.lines] == ["C1", "C2", "C3", "C1"]
+    assert [line.lcsc_code for line in quote.errors] == ["C3"]
+    assert [line.lcsc_code for line in quote.shortfalls] == ["C2"]
+    assert quote.total_cost == pytest.approx(sum(line.total_cost for line in quote.lines))
+    assert len(stub_server.requests) == 3
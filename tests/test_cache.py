@@ -0,0 +1,112 @@
+"""
+tests/test_cache.py
+
+
+"""
+import time
+
+import pytest
+
+import lcsc.cache
+from lcsc import CacheMissError, LCSCClient, ProductCache, ProductDetails, ResponseCache
+
+from conftest import make_product
+
+
+
+def test_default_mode_serves_from_cache(stub_server, tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    with LCSCClient(base_url=stub_server.url, cache=cache) as client:
+        first = client.get_product_details("C5")
+        second = client.get_product_details("C5")
+    assert first.as_dict() == second.as_dict()
+    assert len(stub_server.requests) == 1
+
+
+def test_refresh_and_only_modes(stub_server, tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    with LCSCClient(base_url=stub_server.url, cache=cache) as client:
+        with pytest.raises(CacheMissError):
+            client.get_product_details("C5", cache="only")
+        client.get_product_details("C5", cache="refresh")
+        client.get_product_details("C5", cache="refresh")
+        assert client.get_product_details("C5", cache="only").product_code == "C5"
+        with pytest.raises(ValueError):
+            client.get_product_details("C5", cache="sometimes")
+    assert len(stub_server.requests) == 2
+
+
+def test_cache_is_shared_between_instances(stub_server, tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    with LCSCClient(base_url=stub_server.url, cache=ResponseCache(path)) as client:
+        client.get_search_results("anything")
+    with LCSCClient(base_url=stub_server.url, cache=ResponseCache(path)) as client:
+        assert client.get_search_results("anything", cache="only")
+
+
+def test_entries_expire_per_endpoint(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", detail_ttl=60, search_ttl=0.01)
+    cache.set("/ftps/wm/product/detail", {"productCode": "C1"}, {"a": 1})
+    cache.set("/ftps/wm/search/global", {"keyword": "x"}, {"b": 2})
+    time.sleep(0.05)
+    assert cache.get("/ftps/wm/product/detail", {"productCode": "C1"}) == {"a": 1}
+    assert cache.get("/ftps/wm/search/global", {"keyword": "x"}) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(lcsc.cache, "_TOUCH_INTERVAL", 0.0)
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_entries=3)
+    for i in range(3):
+        cache.set("/e", {"i": i}, {"i": i})
+        time.sleep(0.01)
+    cache.get("/e", {"i": 0})
+    time.sleep(0.01)
+    cache.set("/e", {"i": 3}, {"i": 3})
+    # Over the limit: evicted in one batch, down to 90% of `max_entries` (rounded down).
+    assert len(cache) == 2
+    assert cache.get("/e", {"i": 1}) is None and cache.get("/e", {"i": 2}) is None
+    assert cache.get("/e", {"i": 0}) == {"i": 0}
+
+
+def test_eviction_is_batched_and_hits_are_read_only(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_entries=100)
+    for i in range(150):
+        cache.set("/e", {"i": i}, {"i": i})
+    # Checked every 10 inserts, so the cache never runs more than 10 entries over.
+    assert 90 <= len(cache) <= 110
+    conn = cache._connect()
+    before = conn.total_changes
+    assert cache.get("/e", {"i": 149}) == {"i": 149}
+    assert conn.total_changes == before
+
+
+def test_product_cache_hits_and_volatile_refresh(stub_server):
+    product_cache = ProductCache(static_ttl=60, volatile_ttl=0.05)
+    with LCSCClient(base_url=stub_server.url, product_cache=product_cache) as client:
+        first = client.get_product_details("C9")
+        first_specs = first.specs
+        assert client.get_product_details("C9") is first
+        time.sleep(0.1)
+        refreshed = client.get_product_details("C9")
+    assert refreshed is not first
+    assert refreshed.specs is first_specs
+    assert refreshed.stock == first.stock
+    assert product_cache.stats() == {"hits": 1, "volatile_refreshes": 1, "misses": 1, "size": 1}
+    assert len(stub_server.requests) == 2
+
+
+def test_product_cache_evicts_least_recently_used(stub_server):
+    product_cache = ProductCache(max_entries=2)
+    with LCSCClient(base_url=stub_server.url, product_cache=product_cache) as client:
+        for code in ("C1", "C2", "C1", "C3"):
+            client.get_product_details(code)
+    assert product_cache.lookup("C1")[0] is not None
+    assert product_cache.lookup("C2")[0] is None
+
+
+def test_product_cache_volatile_updates_respect_max_entries():
+    product_cache = ProductCache(max_entries=2)
+    for code in ("C1", "C2", "C3", "C4"):
+        product_cache.update_volatile(ProductDetails(make_product(code)))
+    assert len(product_cache) == 2
+    assert product_cache.lookup("C4")[0] is not None and product_cache.lookup("C1")[0] is None
@@ -0,0 +1,62 @@
+"""
+tests/test_cli.py
+
+
+"""
+import io
+import json
+import subprocess
+import sys
+
+from lcsc.cli import _iter_codes, main
+
+
+
+def _lines(capsys) -> list[dict]:
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_iter_codes():
+    assert list(_iter_codes(["C1 C2", "# comment", "C2\tC3  # C4", ""])) == ["C1", "C2", "C3"]
+
+
+def test_detail_from_arguments(stub_server, capsys):
+    assert main(["detail", "C1", "C2", "C1", "--base-url", stub_server.url]) == 0
+    rows = _lines(capsys)
+    assert sorted(row["product_code"] for row in rows) == ["C1", "C2"]
+    assert rows[0]["price_1_quantity"] == 5
+
+
+def test_detail_batch_from_stdin_reports_failures(stub_server, capsys, monkeypatch):
+    stub_server.fail_codes = {"C3"}
+    monkeypatch.setattr(sys, "stdin", io.StringIO("C1\nC2 C3\n" + "\n".join(f"C{i}" for i in range(4, 40)) + "\n"))
+    assert main(["detail", "--workers", "4", "--retries", "0", "--base-url", stub_server.url]) == 1
+    rows = {row["product_code"]: row for row in _lines(capsys)}
+    assert len(rows) == 39
+    assert rows["C3"]["error_type"] == "LCSCHTTPError"
+    assert stub_server.max_in_flight <= 4
+
+
+def test_search_streams_or_sorts(stub_server, capsys):
+    assert main(["search", "anything", "--limit", "7", "--base-url", stub_server.url]) == 0
+    assert [row["search_index"] for row in _lines(capsys)] == list(range(7))
+    assert main(["search", "anything", "--sort", "stock", "--limit", "5", "--base-url", stub_server.url]) == 0
+    stocks = [row["stock"] for row in _lines(capsys)]
+    assert len(stocks) == 5 and stocks == sorted(stocks, reverse=True)
+
+
+def test_replay_without_network(stub_server, capsys, tmp_path):
+    cassette = str(tmp_path / "traffic.cassette")
+    assert main(["detail", "C5", "--record", cassette, "--base-url", stub_server.url]) == 0
+    recorded = _lines(capsys)
+    requests_made = len(stub_server.requests)
+    assert main(["detail", "C5", "--replay", cassette]) == 0
+    assert _lines(capsys) == recorded
+    assert len(stub_server.requests) == requests_made
+
+
+def test_module_entry_point_imports_lazily():
+    modules = ["requests", "asyncio", "lcsc.crawler", "lcsc.download", "lcsc.export", "multiprocessing", "sqlite3"]
+    code = f"import sys, lcsc.cli; print([m for m in {modules!r} if m in sys.modules])"
+    assert subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip() == "[]"
+    assert subprocess.run([sys.executable, "-m", "lcsc", "--version"], capture_output=True, text=True).stdout.startswith("lcsc ")
@@ -0,0 +1,156 @@
+"""
+tests/test_client.py
+
+
+"""
+import random
+
+import pytest
+
+import lcsc
+from lcsc import LCSCClient, LCSCHTTPError, ProductDetails
+from lcsc.client import _build_search_results
+
+from conftest import make_product
+
+
+
+def test_get_product_details(stub_server):
+    with LCSCClient(base_url=stub_server.url) as client:
+        details = client.get_product_details("C111887")
+    assert isinstance(details, ProductDetails)
+    assert details.product_code == "C111887"
+    assert details.min_quantity == 5
+    assert details.get_price_breaks() == [5, 50, 500]
+
+
+def test_connections_are_reused(stub_server):
+    with LCSCClient(base_url=stub_server.url) as client:
+        for i in range(5):
+            client.get_product_details(f"C{i + 1}")
+    assert len(stub_server.requests) == 5
+    assert len(stub_server.connections) == 1
+
+
+def test_headers_are_per_client(stub_server):
+    with LCSCClient(base_url=stub_server.url, headers={"x-test": "1"}) as client:
+        client.get_product_details("C1")
+    sent = {k.lower(): v for k, v in stub_server.requests[-1][2].items()}
+    assert sent["x-test"] == "1"
+    assert "gzip" in sent["accept-encoding"]
+    assert "x-test" not in LCSCClient().headers
+
+
+def test_get_search_results_filters_and_sorts(stub_server):
+    with LCSCClient(base_url=stub_server.url) as client:
+        results = client.get_search_results("anything", min_stock=1000)
+    stocks = [r.product_details.stock for r in results]
+    assert stocks == sorted(stocks, reverse=True)
+    assert all(s >= 1000 for s in stocks)
+
+
+def test_invalid_sort_by_raises(stub_server):
+    with LCSCClient(base_url=stub_server.url) as client:
+        with pytest.raises(ValueError, match="sort_by"):
+            client.get_search_results("anything", sort_by="name")
+    assert stub_server.requests == []
+
+
+def test_search_results_top_k_matches_full_sort(monkeypatch):
+    rng = random.Random(1)
+    hits = []
+    for i in range(100):
+        data = make_product(f"C{i + 1}")
+        data["stockNumber"] = rng.choice((0, 200, 800, 1500))
+        data["productPriceList"][0]["usdPrice"] = rng.choice((0.1, 0.2, 0.3))
+        hits.append(data)
+    raw = {"productSearchResultVO": {"productList": hits}}
+    for sort_by in ("stock", "price"):
+        full = _build_search_results(raw, 500, sort_by)
+        assert all(r.product_details.stock >= 500 for r in full)
+        key = (lambda r: -r.product_details.stock) if sort_by == "stock" else (lambda r: r.product_details.price[5].price)
+        assert [r.index for r in full] == [r.index for r in sorted(sorted(full, key=lambda r: r.index), key=key)]
+        assert [r.index for r in _build_search_results(raw, 500, sort_by, limit=7)] == [r.index for r in full[:7]]
+    built = []
+    monkeypatch.setattr(lcsc.client, "ProductDetails", lambda data, keep_raw: built.append(data["productCode"]) or ProductDetails(data, keep_raw))
+    assert len(_build_search_results(raw, 1000, "price", limit=3)) == 3
+    assert len(built) == 3
+
+
+def test_search_hints_are_sent(stub_server):
+    with LCSCClient(base_url=stub_server.url, search_hints={"isStock": "true"}) as client:
+        assert client.get_search_results("anything", min_stock=None, limit=4)
+        assert next(client.iter_search_results("anything"))
+    assert [request[1]["isStock"] for request in stub_server.requests] == ["true", "true"]
+
+
+def test_module_functions_use_default_client(stub_server):
+    previous = lcsc.get_default_client()
+    lcsc.set_default_client(LCSCClient(base_url=stub_server.url))
+    try:
+        assert lcsc.get_product_details("C42").product_code == "C42"
+    finally:
+        lcsc.set_default_client(previous)
+
+
+def test_get_product_details_many_dedups_and_keeps_order(stub_server):
+    codes = ["C3", "C1", "C2", "C1", "C3"]
+    with LCSCClient(base_url=stub_server.url) as client:
+        results = client.get_product_details_many(codes, max_workers=4)
+    assert list(results) == ["C3", "C1", "C2"]
+    assert all(results[c].product_code == c for c in results)
+    assert len(stub_server.requests) == 3
+
+
+def test_failed_code_does_not_abort_batch(stub_server):
+    stub_server.fail_codes = {"C2"}
+    with LCSCClient(base_url=stub_server.url, retry=None) as client:
+        results = client.get_product_details_many(["C1", "C2", "C3"])
+    assert isinstance(results["C2"], LCSCHTTPError) and results["C2"].status == 500
+    assert results["C1"].product_code == "C1"
+    assert results["C3"].product_code == "C3"
+
+
+def test_iter_product_details_streams_results(stub_server):
+    codes = [f"C{i + 1}" for i in range(10)]
+    with LCSCClient(base_url=stub_server.url) as client:
+        seen = {code: details for code, details in client.iter_product_details(codes, max_workers=5)}
+    assert set(seen) == set(codes)
+
+
+def test_iter_search_results_walks_all_pages(stub_server):
+    stub_server.total_hits = 250
+    with LCSCClient(base_url=stub_server.url) as client:
+        results = list(client.iter_search_results("anything", page_size=100))
+    assert [r.index for r in results] == list(range(250))
+    assert len(stub_server.requests) == 3
+
+
+def test_iter_search_results_stops_at_limit(stub_server):
+    stub_server.total_hits = 1000
+    with LCSCClient(base_url=stub_server.url) as client:
+        results = list(client.iter_search_results("anything", page_size=10, limit=25, prefetch=False))
+    assert len(results) == 25
+    assert len(stub_server.requests) == 3
+
+
+def test_iter_search_results_applies_min_stock(stub_server):
+    stub_server.total_hits = 60
+    with LCSCClient(base_url=stub_server.url) as client:
+        results = list(client.iter_search_results("anything", min_stock=1000, page_size=20))
+    assert results and all(r.product_details.stock >= 1000 for r in results)
+
+
+def test_keep_raw_is_passed_to_details(stub_server):
+    with LCSCClient(base_url=stub_server.url, keep_raw=False) as client:
+        details = client.get_product_details("C42")
+        results = client.get_search_results("anything", min_stock=None)
+    assert details.price and details.specs
+    assert not details._keep_raw
+    assert all(not r.product_details._keep_raw for r in results)
+
+
+def test_json_decoder_accepts_bytes_and_str():
+    from lcsc._json import backend, loads
+    assert backend in ("orjson", "msgspec", "json")
+    assert loads(b'{"result": {"a": [1, 2.5, "\\u03a9"]}}') == loads('{"result": {"a": [1, 2.5, "Ω"]}}') == {"result": {"a": [1, 2.5, "Ω"]}}
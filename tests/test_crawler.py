@@ -0,0 +1,79 @@
+"""
+tests/test_crawler.py
+
+
+"""
+import sqlite3
+import time
+
+from lcsc import Crawler, ProductDetails
+from lcsc.crawler import _ShardWorker
+
+from conftest import make_product
+
+
+
+def test_crawl_follows_catalogs_in_process(stub_server, tmp_path):
+    stub_server.total_hits = 250
+    crawler = Crawler(str(tmp_path / "mirror.sqlite3"), processes=0, page_size=20, rate=None, base_url=stub_server.url)
+    assert crawler.add_catalogs([ProductDetails(make_product("C3")).catalog, (2003, "dupe")]) == 1
+    progress = crawler.run()
+    assert progress == {"shards": 7, "done": 7, "failed": 0, "products": 250}
+    # 13 pages per catalog, each fetched exactly once.
+    assert len(stub_server.requests) == 7 * 13
+    products = list(crawler.iter_products(catalog_id=2003))
+    assert products and all(p.catalog.id == 2003 for p in products)
+    assert [p.product_code for p in products] == sorted(p.product_code for p in products)
+    assert crawler.run() == progress
+    assert len(stub_server.requests) == 7 * 13
+    crawler.close()
+
+
+def test_crawl_resumes_from_checkpoint(stub_server, tmp_path, monkeypatch):
+    stub_server.total_hits = 250
+    crawler = Crawler(str(tmp_path / "mirror.sqlite3"), processes=0, concurrency=1, page_size=20, rate=None, follow=False, base_url=stub_server.url)
+    crawler.add_catalogs([(2001, "Catalog 1")])
+    fetch = _ShardWorker._fetch
+    def crash_on_page_5(self, keyword, page):
+        if page == 5:
+            raise ConnectionError("network down")
+        return fetch(self, keyword, page)
+    monkeypatch.setattr(_ShardWorker, "_fetch", crash_on_page_5)
+    progress = crawler.run()
+    assert progress["done"] == 0 and progress["failed"] == 1
+    assert crawler.errors() == {2001: "ConnectionError: network down"}
+    monkeypatch.setattr(_ShardWorker, "_fetch", fetch)
+    del stub_server.requests[:]
+    assert crawler.run() == {"shards": 1, "done": 1, "failed": 0, "products": 36}
+    assert sorted(int(params["currentPage"]) for _, params, _ in stub_server.requests) == list(range(5, 14))
+    crawler.close()
+
+
+def test_failed_page_stops_the_shard(stub_server, tmp_path, monkeypatch):
+    stub_server.total_hits = 2000
+    path = str(tmp_path / "mirror.sqlite3")
+    crawler = Crawler(path, processes=0, concurrency=2, page_size=10, rate=None, follow=False, base_url=stub_server.url)
+    crawler.add_catalogs([(2001, "Catalog 1")])
+    fetch = _ShardWorker._fetch
+    def slow_crash_on_page_5(self, keyword, page):
+        if page == 5:
+            time.sleep(0.5)
+            raise ConnectionError("network down")
+        return fetch(self, keyword, page)
+    monkeypatch.setattr(_ShardWorker, "_fetch", slow_crash_on_page_5)
+    assert crawler.run()["failed"] == 1
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT next_page FROM shards WHERE catalog_id = 2001").fetchone() == (5,)
+    # While page 5 hung, the other thread only ran ahead to the end of the window (2 threads x 2), not through the shard.
+    fetched = sorted(int(params["currentPage"]) for _, params, _ in stub_server.requests)
+    assert fetched[:4] == [1, 2, 3, 4] and max(fetched) <= 5 + 4
+    crawler.close()
+
+
+def test_crawl_across_processes(stub_server, tmp_path):
+    stub_server.total_hits = 140
+    crawler = Crawler(str(tmp_path / "mirror.sqlite3"), processes=2, page_size=20, rate=1000, base_url=stub_server.url)
+    assert crawler.discover(["anything"]) == 7
+    assert crawler.run() == {"shards": 7, "done": 7, "failed": 0, "products": 140}
+    assert len({p.product_code for p in crawler.iter_products(keep_raw=False)}) == 140
+    crawler.close()
@@ -0,0 +1,120 @@
+"""
+tests/test_download.py
+
+
+"""
+import hashlib
+import os
+
+import pytest
+
+from lcsc import Downloader, LCSCHTTPError, ProductDetails, RetryPolicy, TokenBucket
+
+from conftest import make_product
+
+
+
+def _product(code: str, base_url: str, datasheet: str, images: list[str]) -> ProductDetails:
+    raw = make_product(code)
+    raw["pdfUrl"] = f"{base_url}/files/{datasheet}" if datasheet else ""
+    raw["productImages"] = [f"{base_url}/files/{name}" for name in images]
+    return ProductDetails(raw)
+
+
+def test_shared_files_are_stored_once(stub_server, tmp_path):
+    stub_server.files = {"a.pdf": b"%PDF shared" * 5000, "b.jpg": b"image b", "copy.pdf": b"%PDF shared" * 5000}
+    downloader = Downloader(str(tmp_path / "files"), max_workers=4, chunk_size=4096)
+    products = [
+        _product("C1", stub_server.url, "a.pdf", ["b.jpg"]),
+        _product("C2", stub_server.url, "a.pdf", []),
+        _product("C3", stub_server.url, "copy.pdf", ["missing.jpg"]),
+        _product("C4", stub_server.url, "", []),
+    ]
+    files = downloader.download_products(products + [ValueError("not a product")])
+    assert list(files) == ["C1", "C2", "C3", "C4"]
+    datasheet = files["C1"][0]
+    assert datasheet.sha256 == hashlib.sha256(stub_server.files["a.pdf"]).hexdigest()
+    assert datasheet.size == datasheet.transferred == 55000 and datasheet.content_type == "application/pdf"
+    assert files["C2"][0] == datasheet
+    assert files["C3"][0].path == datasheet.path
+    assert isinstance(files["C3"][1], LCSCHTTPError) and files["C3"][1].status == 404
+    assert files["C4"] == []
+    with open(files["C1"][1].path, "rb") as f:
+        assert f.read() == b"image b"
+    # a.pdf and copy.pdf were each requested once; their content is stored once.
+    assert sorted(path for path, _, _ in stub_server.requests) == ["/files/a.pdf", "/files/b.jpg", "/files/copy.pdf", "/files/missing.jpg"]
+    assert sum(len(names) for _, _, names in os.walk(tmp_path / "files" / "objects")) == 2
+    again = downloader.download(f"{stub_server.url}/files/a.pdf")
+    assert again.transferred == 0 and len(stub_server.requests) == 4
+    downloader.close()
+
+
+def test_interrupted_transfer_resumes_with_range(stub_server, tmp_path):
+    data = os.urandom(300_000)
+    stub_server.files = {"big.pdf": data}
+    stub_server.cut_after = {"big.pdf": 24 * 4096}
+    url = f"{stub_server.url}/files/big.pdf"
+    downloader = Downloader(str(tmp_path / "files"), chunk_size=4096, retry=None)
+    with pytest.raises(Exception):
+        downloader.download(url)
+    assert url not in downloader
+    download = downloader.download(url)
+    assert download.size == 300_000 and download.transferred == 300_000 - 24 * 4096
+    assert download.sha256 == hashlib.sha256(data).hexdigest()
+    headers = stub_server.requests[-1][2]
+    assert headers["Range"] == "bytes=98304-" and headers["If-Range"] == '"' + hashlib.sha1(data).hexdigest() + '"'
+    assert os.listdir(tmp_path / "files" / "partial") == []
+    downloader.close()
+
+
+def test_changed_file_restarts_and_retries_resume(stub_server, tmp_path):
+    stub_server.files = {"doc.pdf": b"old" * 10_000}
+    stub_server.cut_after = {"doc.pdf": 2000}
+    url = f"{stub_server.url}/files/doc.pdf"
+    downloader = Downloader(str(tmp_path / "files"), chunk_size=1000, retry=None)
+    with pytest.raises(Exception):
+        downloader.download(url)
+    # The server's copy changed, so `If-Range` fails and the whole new file is sent.
+    stub_server.files["doc.pdf"] = b"new" * 10_000
+    download = downloader.download(url)
+    assert stub_server.requests[-1][2]["Range"] == "bytes=2000-"
+    assert download.transferred == 30_000 and download.sha256 == hashlib.sha256(b"new" * 10_000).hexdigest()
+    # With retries, a broken transfer is resumed within the same call.
+    stub_server.cut_after = {"doc.pdf": 5 * 1024}
+    download = Downloader(str(tmp_path / "other"), chunk_size=1024, retry=RetryPolicy(backoff=0.01)).download(url)
+    assert download.transferred == 30_000 and download.size == 30_000
+    assert stub_server.requests[-1][2]["Range"] == "bytes=5120-"
+    downloader.close()
+
+
+class _CountingBucket(TokenBucket):
+    def __init__(self) -> None:
+        super().__init__(rate=1000, burst=1000)
+        self.acquired = 0
+
+    def acquire(self, tokens: float = 1) -> float:
+        self.acquired += 1
+        return super().acquire(tokens)
+
+
+def test_restart_goes_through_the_rate_limiter_and_retries(stub_server, tmp_path):
+    stub_server.files = {"doc.pdf": b"old" * 10_000}
+    stub_server.cut_after = {"doc.pdf": 2000}
+    url = f"{stub_server.url}/files/doc.pdf"
+    limiter = _CountingBucket()
+    downloader = Downloader(str(tmp_path / "files"), chunk_size=1000, rate_limiter=limiter, retry=RetryPolicy(max_retries=1, backoff=0.01))
+    with pytest.raises(Exception):
+        Downloader(str(tmp_path / "files"), chunk_size=1000, retry=None).download(url)
+    # Without a validator the `Range` is sent unconditionally, and the shorter new file answers it with a 416.
+    partial = tmp_path / "files" / "partial"
+    for name in os.listdir(partial):
+        if name.endswith(".json"):
+            os.remove(partial / name)
+    stub_server.files["doc.pdf"] = b"new" * 500
+    stub_server.cut_after = {"doc.pdf": 1000}
+    download = downloader.download(url)
+    assert download.sha256 == hashlib.sha256(b"new" * 500).hexdigest() and download.size == 1500
+    # The restart, its broken transfer and the resumed retry each took a token.
+    assert [headers.get("Range") for _, _, headers in stub_server.requests[-3:]] == ["bytes=2000-", None, "bytes=1000-"]
+    assert limiter.acquired == 3
+    downloader.close()
@@ -0,0 +1,94 @@
+"""
+tests/test_export.py
+
+
+"""
+import csv
+import io
+import json
+
+import pytest
+
+from conftest import make_product
+from lcsc import flatten_product, write_csv, write_ndjson
+from lcsc.export import iter_record_batches
+from lcsc.types import ProductDetails, SearchResult
+
+
+
+def _items(n):
+    for i in range(1, n + 1):
+        details = ProductDetails(make_product(f"C{i}"))
+        yield SearchResult(i - 1, details.product_url, False, details) if i % 2 else details
+
+
+def test_flatten_product():
+    details = ProductDetails(make_product("C7"))
+    row = flatten_product(details)
+    assert row["product_code"] == "C7"
+    assert row["search_index"] is None
+    assert [row[f"price_{i}_quantity"] for i in (1, 2, 3)] == [5, 50, 500]
+    assert row["price_1_usd"] == details.price[5].price
+    assert row["spec_param_10953_n"] == "7kΩ"
+    row = flatten_product(SearchResult(3, details.product_url, True, details), max_price_breaks=4, spec_codes=["param_10954", "missing"])
+    assert row["search_index"] == 3 and row["on_discount"] is True
+    assert row["price_4_quantity"] is None
+    assert row["spec_param_10954"] == "±1%" and row["spec_missing"] is None
+    assert "spec_param_10953_n" not in row
+
+
+def test_write_ndjson():
+    out = io.StringIO()
+    assert write_ndjson(_items(5), out) == 5
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["product_code"] for r in rows] == ["C1", "C2", "C3", "C4", "C5"]
+    assert rows[0]["search_index"] == 0 and rows[1]["search_index"] is None
+
+
+def test_write_csv(tmp_path):
+    path = tmp_path / "out.csv"
+    assert write_csv(_items(4), path, max_price_breaks=2, spec_codes=["param_10954"]) == 4
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4
+    assert "price_3_quantity" not in rows[0]
+    assert rows[2]["price_2_quantity"] == "50"
+    assert rows[2]["spec_param_10954"] == "±1%"
+    out = io.StringIO()
+    write_csv(_items(1), out)
+    row = next(csv.DictReader(io.StringIO(out.getvalue())))
+    assert json.loads(row["specs"]) == {"param_10953_n": "1kΩ", "param_10954": "±1%"}
+
+
+def test_write_csv_consumes_lazily():
+    consumed = []
+    def items():
+        for item in _items(3):
+            consumed.append(item)
+            yield item
+    class Probe(io.StringIO):
+        def write(self, s):
+            lines.append(len(consumed))
+            return super().write(s)
+    lines = []
+    write_csv(items(), Probe())
+    # The header is written before any item is pulled, and each row right after its item.
+    assert lines == [0, 1, 2, 3]
+
+
+def test_parquet_and_arrow_round_trip(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    from lcsc import write_arrow, write_parquet
+    batches = list(iter_record_batches(_items(25), batch_size=10))
+    assert [b.num_rows for b in batches] == [10, 10, 5]
+    assert write_parquet(_items(25), tmp_path / "out.parquet", batch_size=10) == 25
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert table.num_rows == 25
+    assert pq.ParquetFile(tmp_path / "out.parquet").num_row_groups == 3
+    assert table.column("product_code").to_pylist()[:3] == ["C1", "C2", "C3"]
+    assert table.schema.field("stock").type == pa.int64()
+    assert write_arrow(_items(25), tmp_path / "out.arrow", batch_size=10) == 25
+    with pa.ipc.open_file(tmp_path / "out.arrow") as reader:
+        assert reader.num_record_batches == 3
+        assert reader.read_all().column("price_3_quantity").to_pylist()[0] == 500
@@ -0,0 +1,70 @@
+"""
+tests/test_history.py
+
+
+"""
+import json
+import pytest
+
+from lcsc import HistoryStore, ProductDetails
+
+from conftest import make_product
+
+
+
+def _details(code: str, stock: int | None = None, price_factor: float = 1.0) -> ProductDetails:
+    raw = make_product(code)
+    if stock is not None:
+        raw["stockNumber"] = stock
+    for entry in raw["productPriceList"]:
+        entry["usdPrice"] = round(entry["usdPrice"] * price_factor, 4)
+    return ProductDetails(raw)
+
+
+def test_records_only_changes(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    assert store.record([_details("C1", 100), _details("C2", 200), ConnectionError("down")], timestamp=1000) == 2
+    assert store.record([_details("C1", 100), _details("C2", 200)], timestamp=2000) == 0
+    assert store.record([_details("C1", 90), _details("C2", 200, 1.5)], timestamp=3000) == 2
+    assert len(store) == 2 and "C1" in store and "C3" not in store
+    history = store.history("C1")
+    assert history["stock"] == [(1000, 100), (3000, 90)]
+    assert history["price"] == [(1000, {5: 0.06, 50: 0.054, 500: 0.048})]
+    assert [t for t, _ in store.history("C2")["price"]] == [1000, 3000]
+    assert store.latest("C2") == (200, {5: 0.105, 50: 0.0945, 500: 0.084})
+    static = store.static("C1")
+    assert "stock" not in static and "price" not in static
+    assert static["catalog"] == {"id": 2001, "name": "Catalog 1"}
+    assert store.history("C404") == {"stock": [], "price": []} and store.static("C404") is None
+    store.close()
+
+
+def test_history_window_and_changed_since(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"), block_size=4)
+    for i in range(20):
+        store.record([_details("C1", 1000 - i), _details("C2", 500, 1 + (i == 15))], timestamp=100 * i)
+    stock = store.history("C1", since=550, until=1200)["stock"]
+    # The value in effect at `since` comes first, even though it spans a block boundary.
+    assert stock == [(500, 995)] + [(100 * i, 1000 - i) for i in range(6, 13)]
+    assert store.history("C1")["stock"] == [(100 * i, 1000 - i) for i in range(20)]
+    assert store.changed_since(1500, "price") == ["C2"]
+    assert store.changed_since(1700, "price") == []
+    assert store.changed_since(1700, "stock") == ["C1"]
+    assert store.changed_since(0, "price") == ["C1", "C2"]
+    with pytest.raises(ValueError):
+        store.changed_since(0, "description")
+    store.close()
+
+
+def test_deltas_are_smaller_than_snapshots(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"))
+    codes = [f"C{n}" for n in range(1, 51)]
+    store.record([_details(code) for code in codes], timestamp=0)
+    for i in range(1, 30):
+        store.record([_details(code, 4000 + i * (n % 3)) for n, code in enumerate(codes)], timestamp=3600 * i)
+    conn = store._connect()
+    stored = conn.execute("SELECT SUM(LENGTH(data)) FROM deltas").fetchone()[0]
+    snapshots = 30 * sum(len(json.dumps(_details(code).as_dict())) for code in codes)
+    assert stored * 50 < snapshots
+    assert store.history("C3")["stock"][-1] == (3600 * 29, 4000 + 29 * 2)
+    store.close()
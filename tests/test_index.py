@@ -0,0 +1,104 @@
+"""
+tests/test_index.py
+
+
+"""
+import copy
+
+from conftest import make_product
+from lcsc import ProductIndex, SpecRangeIndex
+from lcsc.types import ProductDetails, SearchResult
+
+
+
+def _products(n: int = 30) -> list[ProductDetails]:
+    return [ProductDetails(make_product(f"C{i + 1}")) for i in range(n)]
+
+
+def test_keyword_search_prefix_matches_all_terms():
+    index = ProductIndex(_products())
+    assert [r.product_details.product_code for r in index.search("model-12")] == ["C12"]
+    codes = {r.product_details.product_code for r in index.search("brand 3")}
+    assert codes == {f"C{i}" for i in range(1, 31) if i % 5 == 3} | {"C30"}
+    assert {r.product_details.product_code for r in index.search("model2", sort_by=None)} == {"C2"} | {f"C{i}" for i in range(20, 30)}
+    assert index.search("nothing-matches") == []
+
+
+def test_spec_filters_and_stock():
+    index = ProductIndex(_products())
+    results = index.search(filters={"param_10953_n": ["5kΩ", "25kΩ"]}, min_stock=0)
+    assert {r.product_details.product_code for r in results} == {"C5", "C25"}
+    assert index.search("brand", filters={"param_10954": "±1%"}, min_stock=1000, limit=3)
+    assert all(r.product_details.stock >= 1000 for r in index.search(min_stock=1000))
+    assert index.spec_values("param_10954") == ["±1%"]
+
+
+def test_results_are_search_results_sorted_like_the_api():
+    index = ProductIndex(SearchResult(0, "", True, d) for d in _products())
+    results = index.search(sort_by="price")
+    prices = [r.product_details.price[5].price for r in results]
+    assert prices == sorted(prices)
+    assert [r.index for r in results] == list(range(len(results)))
+    assert all(r.on_discount for r in results)
+
+
+def test_incremental_update_and_remove():
+    products = _products(5)
+    index = ProductIndex(products)
+    renamed = make_product("C3")
+    renamed["productModel"] = renamed["title"] = "RENAMED-PART"
+    index.update(ProductDetails(renamed))
+    assert index.search("model") and index.search("model-3") == []
+    assert [r.product_details.product_code for r in index.search("renamed")] == ["C3"]
+    assert index.remove("C3") and not index.remove("C3")
+    assert index.search("renamed") == [] and len(index) == 4
+
+
+def test_save_and_load(tmp_path):
+    index = ProductIndex(_products())
+    index.save(tmp_path / "products.idx")
+    loaded = ProductIndex.load(tmp_path / "products.idx")
+    assert len(loaded) == len(index)
+    assert [r.product_details.as_dict() for r in loaded.search("model-1")] == [r.product_details.as_dict() for r in index.search("model-1")]
+    assert [r.product_details.product_code for r in loaded.search(ranges={"param_10953_n": (5e3, 5e3)})] == ["C5"]
+    loaded.add(ProductDetails(make_product("C99")))
+    assert loaded.search("model-99")
+
+
+def test_range_queries():
+    products = _products(100)
+    ranges = SpecRangeIndex(products)
+    assert ranges.query("param_10953_n", 9.9e3, 10.1e3) == {"C10"}
+    assert ranges.query("param_10953_n", maximum=1e3) == {"C1", "C100"}
+    assert ranges.query("param_10953_n", 98e3, unit="Ω") == {"C98", "C99"}
+    assert ranges.query("param_10953_n", 98e3, unit="V") == set()
+    index = ProductIndex(products)
+    results = index.search(ranges={"param_10953_n": (9.9e3, 10.1e3), "param_10954": (None, 1)}, sort_by=None)
+    assert [r.product_details.product_code for r in results] == ["C10"]
+    assert index.search(ranges={"param_10954": (None, 0.5)}) == []
+    index.remove("C10")
+    assert index.search(ranges={"param_10953_n": (9.9e3, 10.1e3)}) == []
+
+
+def test_sorted_vocabulary_and_columns_are_updated_in_place():
+    products = _products(50)
+    index = ProductIndex(products[:40])
+    assert index.search("model-1")
+    assert index.search(ranges={"param_10953_n": (0, 1e6)})
+    vocabulary = index._vocabulary
+    column = index._ranges._columns["param_10953_n"]
+    for details in products[40:]:
+        index.add(details)
+    renamed = make_product("C7")
+    renamed["productModel"] = renamed["title"] = "ZZTOP-ONLY"
+    index.update(ProductDetails(renamed))
+    for code in ("C1", "C2", "C45"):
+        index.remove(code)
+    assert index._vocabulary is vocabulary and vocabulary == sorted(index._postings)
+    assert index._ranges._columns["param_10953_n"] is column and column[0] == sorted(column[0])
+    assert sorted(column[1]) == sorted(code for code in index._ranges._values["param_10953_n"])
+    assert [r.product_details.product_code for r in index.search("zztop")] == ["C7"]
+    fresh = ProductIndex(index.get(code) for code in sorted(index._products))
+    for keyword in ("model-4", "brand 2", "acme"):
+        assert [r.product_details.product_code for r in index.search(keyword)] == [r.product_details.product_code for r in fresh.search(keyword)]
+    assert {r.product_details.product_code for r in index.search(ranges={"param_10953_n": (45e3, 46e3)}, sort_by=None)} == {"C46"}
@@ -0,0 +1,72 @@
+"""
+tests/test_metrics.py
+
+
+"""
+import pytest
+
+from lcsc import LCSCClient, Metrics, ProductCache, ResponseCache, RetryPolicy
+from lcsc.metrics import Histogram
+
+
+
+def test_histogram():
+    histogram = Histogram((1, 2, 5))
+    for value in (0.5, 1, 1.5, 3, 10):
+        histogram.observe(value)
+    assert histogram.cumulative_counts() == [(1, 2), (2, 3), (5, 4), (float("inf"), 5)]
+    assert histogram.sum == 16 and histogram.count == 5
+    assert histogram.quantile(0.5) == 2
+    assert Histogram((1,)).quantile(0.5) == 0.0
+
+
+def test_client_records_requests_and_runs_hooks(stub_server, tmp_path):
+    stub_server.flaky = {"C1": 1}
+    metrics = Metrics()
+    started, ended = [], []
+    metrics.on_request_start(lambda endpoint, params: started.append(params.get("productCode", endpoint)))
+    @metrics.on_request_end
+    def end(endpoint, params, status, seconds, size, error):
+        ended.append((status, size > 0, error))
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    with LCSCClient(base_url=stub_server.url, retry=RetryPolicy(backoff=0.01), metrics=metrics, cache=cache) as client:
+        client.get_product_details("C1")
+        client.get_product_details("C1")
+        client.get_search_results("anything", min_stock=None)
+    assert started == ["C1", "C1", "/ftps/wm/search/global"]
+    assert ended == [(503, True, None), (200, True, None), (200, True, None)]
+    snapshot = metrics.snapshot()
+    detail = snapshot["endpoints"]["/ftps/wm/product/detail"]
+    assert detail["requests"] == 2
+    assert detail["statuses"] == {"503": 1, "200": 1}
+    assert detail["retries"] == 1
+    assert detail["bytes"] > 0 and detail["decode_seconds"] > 0
+    assert detail["built"] == 2
+    assert snapshot["endpoints"]["/ftps/wm/search/global"]["built"] == stub_server.total_hits
+    assert snapshot["caches"]["response"] == {"miss": 2, "hit": 1, "hit_ratio": pytest.approx(1 / 3)}
+    cache.close()
+
+
+def test_product_cache_outcomes(stub_server):
+    metrics = Metrics()
+    with LCSCClient(base_url=stub_server.url, metrics=metrics, product_cache=ProductCache(volatile_ttl=0)) as client:
+        client.get_product_details("C1")
+        client.get_product_details("C1")
+    assert metrics.snapshot()["caches"]["product"] == {"miss": 1, "volatile_refresh": 1, "hit_ratio": 0.0}
+    assert metrics.cache_hit_ratio("product") == 0.0
+    assert metrics.cache_hit_ratio("response") is None
+
+
+def test_render_prometheus(stub_server):
+    metrics = Metrics(latency_buckets=(0.5, 5.0))
+    with LCSCClient(base_url=stub_server.url, metrics=metrics) as client:
+        client.get_product_details("C1")
+    text = metrics.render_prometheus()
+    assert text.endswith("\n")
+    assert "# TYPE lcsc_request_duration_seconds histogram" in text
+    assert 'lcsc_request_duration_seconds_bucket{endpoint="/ftps/wm/product/detail",le="+Inf"} 1' in text
+    assert 'lcsc_request_duration_seconds_count{endpoint="/ftps/wm/product/detail"} 1' in text
+    assert 'lcsc_requests_total{endpoint="/ftps/wm/product/detail",status="200"} 1' in text
+    assert "# TYPE lcsc_cache_lookups_total counter" in text
+    metrics.reset()
+    assert "lcsc_requests_total{" not in metrics.render_prometheus()
@@ -0,0 +1,59 @@
+"""
+tests/test_pricing.py
+
+
+"""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from conftest import make_product
+from lcsc.pricing import PriceTable
+from lcsc.types import ProductDetails
+
+
+
+@pytest.fixture
+def products():
+    return [ProductDetails(make_product(f"C{i + 1}")) for i in range(50)]
+
+
+def test_cost_matches_get_order_cost(products):
+    table = PriceTable(products)
+    rng = random.Random(0)
+    lines = [(rng.choice(products), 5 * rng.randint(1, 300)) for _ in range(1000)]
+    costs, valid = table.cost([p.product_code for p, _ in lines], [q for _, q in lines])
+    assert valid.all()
+    expected = [p.get_order_cost(q) for p, q in lines]
+    assert np.allclose(costs, expected)
+
+
+def test_invalid_lines_are_masked(products):
+    table = PriceTable(products)
+    costs, valid = table.cost(["C1", "C1", "C1", "C999"], [2, 7, 10, 10])
+    assert valid.tolist() == [False, False, True, False]
+    assert np.isnan(costs[[0, 1, 3]]).all()
+    assert costs[2] == pytest.approx(products[0].get_order_cost(10))
+
+
+def test_quantities_beyond_the_key_range_are_masked(products):
+    table = PriceTable(products)
+    # `C1` at 5 * 2**32 + 10 would otherwise be looked up as `C6` at 10.
+    costs, valid = table.cost(["C1", "C1", "C1"], [(5 << 32) + 10, -10, 10])
+    assert valid.tolist() == [False, False, True]
+    assert np.isnan(costs[:2]).all()
+
+
+def test_rows_can_be_resolved_once(products):
+    table = PriceTable(products)
+    rows = table.rows(["C3", "C4"])
+    costs, valid = table.cost(rows, np.array([500, 50]))
+    assert valid.all()
+    assert costs.tolist() == pytest.approx([products[2].get_order_cost(500), products[3].get_order_cost(50)])
+
+
+def test_empty_table():
+    costs, valid = PriceTable([]).cost(["C1"], [5])
+    assert not valid.any()
@@ -0,0 +1,132 @@
+"""
+tests/test_ratelimit.py
+
+
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lcsc import LCSCClient, LCSCHTTPError, LCSCResponseError, RetryPolicy, SQLiteTokenBucket, TokenBucket
+from lcsc.ratelimit import _parse_retry_after
+
+
+
+FAST_RETRY = RetryPolicy(max_retries=3, backoff=0.01)
+
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate=50, burst=5)
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+    waits = [bucket.reserve() for _ in range(3)]
+    assert waits == sorted(waits)
+    assert waits[0] == pytest.approx(0.02, abs=0.005)
+    assert waits[2] == pytest.approx(0.06, abs=0.005)
+
+
+def test_token_bucket_is_shared_across_threads():
+    bucket = TokenBucket(rate=100, burst=1)
+    start = time.monotonic()
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: bucket.acquire(), range(21)))
+    assert time.monotonic() - start >= 0.19
+
+
+def test_token_bucket_pause():
+    bucket = TokenBucket(rate=100, burst=10)
+    bucket.pause(0.5)
+    assert bucket.reserve() == pytest.approx(0.51, abs=0.01)
+
+
+def test_sqlite_token_bucket_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "limits.sqlite3")
+    a = SQLiteTokenBucket(path, rate=10, burst=2)
+    b = SQLiteTokenBucket(path, rate=10, burst=2)
+    assert a.reserve() == 0.0 and b.reserve() == 0.0
+    assert a.reserve() == pytest.approx(0.1, abs=0.02)
+    assert b.reserve() == pytest.approx(0.2, abs=0.02)
+    a.close()
+    b.close()
+
+
+def test_parse_retry_after():
+    assert _parse_retry_after("2") == 2.0
+    assert _parse_retry_after(None) is None
+    assert _parse_retry_after("garbage") is None
+    assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_retry_policy_decisions():
+    policy = RetryPolicy(max_retries=2, backoff=1.0, max_backoff=3.0)
+    assert 0.5 <= policy.backoff(0) <= 1.0
+    assert 1.5 <= policy.backoff(5) <= 3.0
+    assert policy.get_delay("GET", LCSCHTTPError(503, "u"), 0) is not None
+    assert policy.get_delay("GET", LCSCHTTPError(429, "u", retry_after=7.0), 1) == 7.0
+    assert policy.get_delay("GET", LCSCHTTPError(503, "u"), 2) is None
+    assert policy.get_delay("GET", LCSCHTTPError(404, "u"), 0) is None
+    assert policy.get_delay("POST", LCSCHTTPError(503, "u"), 0) is None
+    assert policy.get_delay("GET", LCSCResponseError("m", "u", is_json=False), 0) is not None
+    assert policy.get_delay("GET", LCSCResponseError("m", "u", is_json=True), 0) is None
+    assert policy.get_delay("GET", ConnectionError(), 0) is not None
+
+
+def test_client_retries_transient_errors(stub_server):
+    stub_server.flaky = {"C1": 2}
+    with LCSCClient(base_url=stub_server.url, retry=FAST_RETRY) as client:
+        assert client.get_product_details("C1").product_code == "C1"
+    assert len(stub_server.requests) == 3
+
+
+def test_client_gives_up_with_typed_errors(stub_server):
+    stub_server.flaky = {"C1": 10}
+    stub_server.html_codes = {"C2"}
+    with LCSCClient(base_url=stub_server.url, retry=FAST_RETRY) as client:
+        with pytest.raises(LCSCHTTPError) as e:
+            client.get_product_details("C1")
+        assert e.value.status == 503
+        with pytest.raises(LCSCResponseError):
+            client.get_product_details("C2")
+    assert len(stub_server.requests) == 8
+
+
+def test_client_honours_retry_after_and_pauses_limiter(stub_server):
+    stub_server.flaky = {"C1": 1}
+    stub_server.flaky_status = 429
+    stub_server.retry_after = "0.2"
+    limiter = TokenBucket(rate=1000, burst=100)
+    with LCSCClient(base_url=stub_server.url, retry=FAST_RETRY, rate_limiter=limiter) as client:
+        start = time.monotonic()
+        client.get_product_details("C1")
+        assert time.monotonic() - start >= 0.2
+    assert len(stub_server.requests) == 2
+
+
+def test_throttling_without_retry_after_slows_every_thread(stub_server):
+    stub_server.flaky = {"C1": 1}
+    stub_server.flaky_status = 429
+    limiter = TokenBucket(rate=1000, burst=100)
+    with LCSCClient(base_url=stub_server.url, retry=RetryPolicy(max_retries=1, backoff=0.6), rate_limiter=limiter) as client:
+        with ThreadPoolExecutor(1) as pool:
+            throttled = pool.submit(client.get_product_details, "C1")
+            while not stub_server.requests:
+                time.sleep(0.001)
+            time.sleep(0.05)
+            # Other threads wait out the pause (0.3-0.6s) instead of only the thread that got the 429.
+            start = time.monotonic()
+            assert [d.product_code for d in map(client.get_product_details, ["C2", "C3", "C4"])] == ["C2", "C3", "C4"]
+            assert time.monotonic() - start >= 0.2
+            assert throttled.result().product_code == "C1"
+
+
+def test_async_client_retries(stub_server):
+    pytest.importorskip("aiohttp")
+    from lcsc import AsyncLCSCClient
+    stub_server.flaky = {"C1": 2}
+    async def main():
+        async with AsyncLCSCClient(base_url=stub_server.url, retry=FAST_RETRY, rate_limiter=TokenBucket(rate=200, burst=1)) as client:
+            return await client.get_product_details("C1")
+    assert asyncio.run(main()).product_code == "C1"
+    assert len(stub_server.requests) == 3
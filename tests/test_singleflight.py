@@ -0,0 +1,103 @@
+"""
+tests/test_singleflight.py
+
+
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lcsc import LCSCClient
+from lcsc.singleflight import AsyncSingleFlight, SingleFlight
+
+
+
+def test_single_flight_shares_one_call():
+    flight = SingleFlight()
+    calls = []
+    gate = threading.Event()
+    def slow(x):
+        calls.append(x)
+        gate.wait(5)
+        return x * 2
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(flight.do, "key", slow, 21) for _ in range(8)]
+        while flight.deduplicated < 7:
+            time.sleep(0.001)
+        gate.set()
+        assert [f.result() for f in futures] == [42] * 8
+    assert calls == [21]
+    assert flight.in_flight == 0
+    assert flight.do("key", slow, 1) == 2
+
+
+def test_single_flight_shares_exceptions():
+    flight = SingleFlight()
+    gate = threading.Event()
+    def fail():
+        gate.wait(5)
+        raise KeyError("boom")
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flight.do, "key", fail) for _ in range(4)]
+        while flight.deduplicated < 3:
+            time.sleep(0.001)
+        gate.set()
+        for f in futures:
+            with pytest.raises(KeyError):
+                f.result()
+
+
+def test_client_coalesces_identical_lookups(stub_server):
+    stub_server.delay = 0.2
+    with LCSCClient(base_url=stub_server.url) as client:
+        with ThreadPoolExecutor(10) as pool:
+            details = list(pool.map(client.get_product_details, ["C111887"] * 10))
+        assert client.deduplicated == 9
+    assert {d.product_code for d in details} == {"C111887"}
+    assert len(stub_server.requests) == 1
+
+
+def test_client_without_coalescing(stub_server):
+    stub_server.delay = 0.05
+    with LCSCClient(base_url=stub_server.url, coalesce=False) as client:
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(client.get_product_details, ["C1"] * 4))
+        assert client.deduplicated == 0
+    assert len(stub_server.requests) == 4
+
+
+def test_async_single_flight_survives_cancelled_waiter():
+    async def main():
+        flight = AsyncSingleFlight()
+        calls = []
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "done"
+        first = asyncio.ensure_future(flight.do("key", slow))
+        others = [asyncio.ensure_future(flight.do("key", slow)) for _ in range(4)]
+        await asyncio.sleep(0)
+        first.cancel()
+        results = await asyncio.gather(*others)
+        return calls, results, flight
+    calls, results, flight = asyncio.run(main())
+    assert calls == [1]
+    assert results == ["done"] * 4
+    assert flight.deduplicated == 4 and flight.in_flight == 0
+
+
+def test_async_client_coalesces_identical_lookups(stub_server):
+    pytest.importorskip("aiohttp")
+    from lcsc import AsyncLCSCClient
+    stub_server.delay = 0.05
+    async def main():
+        async with AsyncLCSCClient(base_url=stub_server.url) as client:
+            details = await asyncio.gather(*(client.get_product_details("C111887") for _ in range(10)))
+            return details, client.deduplicated
+    details, deduplicated = asyncio.run(main())
+    assert [d.product_code for d in details] == ["C111887"] * 10
+    assert deduplicated == 9
+    assert len(stub_server.requests) == 1
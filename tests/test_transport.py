@@ -0,0 +1,77 @@
+"""
+tests/test_transport.py
+
+
+"""
+import pytest
+
+from lcsc import CacheMissError, LCSCClient, RecordingTransport, ReplayTransport, RetryPolicy, Transport
+from lcsc.transport import HTTPTransport, request_key
+
+
+
+def test_request_key_ignores_host_and_param_order():
+    a = request_key("get", "http://127.0.0.1:1234/ftps/wm/search/global", {"keyword": "x", "currentPage": 1})
+    b = request_key("GET", "https://wmsc.lcsc.com/ftps/wm/search/global", {"currentPage": "1", "keyword": "x"})
+    assert a == b == b"GET /ftps/wm/search/global?currentPage=1&keyword=x"
+
+
+def test_transport_without_send_cannot_be_created():
+    class Incomplete(Transport):
+        pass
+    with pytest.raises(TypeError, match="send"):
+        Incomplete()
+
+
+def test_record_then_replay_offline(stub_server, tmp_path):
+    path = str(tmp_path / "traffic.cassette")
+    with RecordingTransport(path) as transport:
+        with LCSCClient(base_url=stub_server.url, transport=transport, retry=None) as client:
+            recorded = client.get_product_details("C7")
+            search = client.get_search_results("anything", min_stock=None)
+        assert transport.recorded == 2
+    requests_made = len(stub_server.requests)
+    with LCSCClient(base_url="http://unreachable.invalid", transport=ReplayTransport(path)) as client:
+        assert client.session is None
+        assert client.transport.path == path
+        replayed = client.get_product_details("C7")
+        assert replayed.as_dict() == recorded.as_dict()
+        assert [r.product_details.product_code for r in client.get_search_results("anything", min_stock=None)] == [r.product_details.product_code for r in search]
+        with pytest.raises(CacheMissError):
+            client.get_product_details("C8")
+    assert len(stub_server.requests) == requests_made
+
+
+def test_replay_serves_repeated_requests_in_order(stub_server, tmp_path):
+    path = str(tmp_path / "traffic.cassette")
+    stub_server.flaky = {"C1": 1}
+    stub_server.retry_after = "0"
+    with RecordingTransport(path, HTTPTransport(), compress=False) as transport:
+        with LCSCClient(base_url=stub_server.url, transport=transport, retry=RetryPolicy(backoff=0.01)) as client:
+            client.get_product_details("C1")
+    replay = ReplayTransport(path)
+    assert len(replay) == 2
+    key = request_key("GET", "/ftps/wm/product/detail", {"productCode": "C1"})
+    assert key in replay
+    first = replay.send("GET", "http://x/ftps/wm/product/detail", {"productCode": "C1"})
+    assert first.status_code == 503 and first.headers == {"Content-Type": "application/json", "Retry-After": "0"}
+    assert replay.send("GET", "http://x/ftps/wm/product/detail", {"productCode": "C1"}).status_code == 200
+    assert replay.send("GET", "http://x/ftps/wm/product/detail", {"productCode": "C1"}).status_code == 200
+    replay.rewind()
+    assert replay.send("GET", "http://x/ftps/wm/product/detail", {"productCode": "C1"}).status_code == 503
+    replay.close()
+
+
+def test_recording_appends_and_replay_skips_truncated_record(stub_server, tmp_path):
+    path = tmp_path / "traffic.cassette"
+    for code in ("C1", "C2"):
+        with RecordingTransport(str(path)) as transport:
+            LCSCClient(base_url=stub_server.url, transport=transport).get_product_details(code)
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+    replay = ReplayTransport(str(path))
+    assert len(replay) == 1
+    replay.close()
+    (tmp_path / "other").write_bytes(b"not a cassette")
+    with pytest.raises(ValueError):
+        ReplayTransport(str(tmp_path / "other"))
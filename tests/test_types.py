@@ -0,0 +1,65 @@
+"""
+tests/test_types.py
+
+
+"""
+import copy
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import make_product
+from lcsc.types import BrandDetails, CatalogDetails, ProductDetails, Spec
+
+
+
+def test_sub_structures_are_lazy_and_memoized():
+    details = ProductDetails(make_product("C12"))
+    assert details._specs is None and details._price is None
+    assert details.stock == (12 * 37) % 5000
+    assert details.specs is details.specs
+    assert details.price[50].discount > 0
+
+
+def test_catalogs_and_brands_are_interned():
+    a = ProductDetails(make_product("C1"))
+    b = ProductDetails(make_product("C8"))
+    assert a.catalog is b.catalog
+    assert a.brand is not b.brand
+    assert CatalogDetails._intern(a.catalog.id, "Renamed").name == "Renamed"
+
+
+def test_concurrent_interning_keeps_one_instance():
+    ids = range(900_000, 900_200)
+    with ThreadPoolExecutor(8) as pool:
+        runs = list(pool.map(lambda _: [BrandDetails._intern(i, f"Brand {i}") for i in ids], range(8)))
+    assert all(all(a is b for a, b in zip(run, runs[0])) for run in runs)
+    assert all(BrandDetails._interned[i] is brand for i, brand in zip(ids, runs[0]))
+
+
+def test_slotted_types_have_no_instance_dict():
+    details = ProductDetails(make_product("C3"))
+    for obj in (details, details.catalog, details.brand, details.price[5], details.specs[0]):
+        assert not hasattr(obj, "__dict__")
+    assert Spec("Resistance", "param_1", "1kΩ").name is details.specs[0].name
+
+
+def test_slotted_details_copy_and_pickle():
+    details = ProductDetails(make_product("C4"))
+    assert copy.copy(details).as_dict() == details.as_dict()
+    assert pickle.loads(pickle.dumps(details)).as_dict() == details.as_dict()
+
+
+def test_keep_raw_false_drops_unused_payload():
+    raw = make_product("C15")
+    raw["unusedMember"] = "x" * 1000
+    details = ProductDetails(raw, keep_raw=False)
+    assert details.as_dict() == ProductDetails(raw).as_dict()
+    with pytest.raises(ValueError):
+        details.view_raw()
+    restored = pickle.loads(pickle.dumps(details))
+    assert restored.as_dict() == details.as_dict()
+    assert "unusedMember" not in pickle.dumps(details).decode("latin-1")
+    fresher = dict(raw, stockNumber=7)
+    assert details._with_volatile(fresher).stock == 7
@@ -0,0 +1,39 @@
+"""
+tests/test_units.py
+
+
+"""
+import pytest
+
+from lcsc.types import Spec
+from lcsc.units import parse_value
+
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("10kΩ", (10e3, "Ω")),
+    ("2.2mΩ", (2.2e-3, "Ω")),
+    ("1.5A", (1.5, "A")),
+    ("25V", (25.0, "V")),
+    ("±1%", (1.0, "%")),
+    ("100nF", (100e-9, "F")),
+    ("0.1µF", (0.1e-6, "F")),
+    ("4.7uH", (4.7e-6, "H")),
+    ("-40°C", (-40.0, "℃")),
+    ("62dB@(120Hz)", (62.0, "dB")),
+    ("10K", (10e3, "")),
+    ("-55℃~+150℃", (None, None)),
+    ("SOT-23", (None, None)),
+    ("X7R", (None, None)),
+    ("", (None, None)),
+])
+def test_parse_value(text, expected):
+    value, unit = parse_value(text)
+    assert unit == expected[1]
+    assert value == pytest.approx(expected[0]) if expected[0] is not None else value is None
+
+
+def test_spec_parses_once():
+    spec = Spec("Resistance", "param_1", "10kΩ")
+    assert spec.numeric_value == 10e3 and spec.unit == "Ω"
+    assert spec._parsed is not None
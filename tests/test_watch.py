@@ -0,0 +1,125 @@
+"""
+tests/test_watch.py
+
+
+"""
+import asyncio
+import threading
+import time
+
+from lcsc import LCSCClient, ProductDetails, StockWatcher
+
+from conftest import make_product
+
+
+
+class _FakeClient:
+    """
+    Serves details from a mutable `{code: (stock, price_factor)}` table and counts lookups.
+    """
+    pool_size = 4
+
+    def __init__(self, table: dict) -> None:
+        self.table = table
+        self.lookups = []
+
+    def get_product_details(self, code: str, cache: str = "default") -> ProductDetails:
+        self.lookups.append(code)
+        if code not in self.table:
+            raise ConnectionError(f"no {code}")
+        stock, factor = self.table[code]
+        raw = make_product(code)
+        raw["stockNumber"] = stock
+        for entry in raw["productPriceList"]:
+            entry["usdPrice"] = round(entry["usdPrice"] * factor, 4)
+        return ProductDetails(raw)
+
+
+def test_diffs_against_last_state():
+    client = _FakeClient({"C1": (0, 1.0), "C2": (500, 1.0), "C3": (50, 1.0)})
+    seen = []
+    watcher = StockWatcher(["C1", "C2", "C3", "C4"], callback=seen.append, client=client, rate=1000)
+    events = watcher.poll()
+    assert [(e.kind, e.product_code) for e in events] == [("error", "C4")]
+    client.table.update({"C1": (20, 1.0), "C2": (0, 1.0), "C3": (49, 1.1)})
+    events = sorted(watcher.poll(force=True))
+    assert [(e.kind, e.product_code, e.old, e.new) for e in events if e.kind != "price" and e.kind != "error"] == [("in_stock", "C1", 0, 20), ("out_of_stock", "C2", 500, 0), ("stock", "C3", 50, 49)]
+    price = next(e for e in events if e.kind == "price")
+    assert price.product_code == "C3" and price.old[5] == 0.08 and price.new[5] == 0.088
+    assert sorted(seen[1:]) == events
+    assert watcher.last_seen("C1").stock == 20
+    assert [e.kind for e in watcher.poll(force=True)] == ["error"]
+    watcher.close()
+
+
+def test_intervals_adapt_to_changes_and_stock():
+    client = _FakeClient({"C1": (5000, 1.0), "C2": (0, 1.0), "C3": (50, 1.0), "C4": (5000, 1.0)})
+    watcher = StockWatcher(client.table, client=client, rate=1000, min_interval=10, max_interval=1000, low_stock=100, backoff=2)
+    for i in range(12):
+        client.table["C4"] = (5000 + i, 1.0)
+        watcher.poll(force=True)
+    assert watcher.interval("C1") == 1000
+    assert watcher.interval("C2") == 10
+    assert watcher.interval("C3") == 10 + 990 * 50 / 100
+    assert watcher.interval("C4") == 10
+    assert watcher.demand == 1 / 1000 + 1 / 10 + 1 / 505 + 1 / 10
+    assert 0 < watcher.next_poll() <= 10
+    assert watcher.poll() == []
+    watcher.remove(["C2", "C4"])
+    assert watcher.codes == ["C1", "C3"]
+    watcher.close()
+
+
+def test_rate_budget_is_enforced():
+    client = _FakeClient({f"C{n}": (0, 1.0) for n in range(1, 31)})
+    watcher = StockWatcher(client.table, client=client, rate=100, min_interval=0.01)
+    start = time.monotonic()
+    watcher.run(duration=0.3)
+    elapsed = time.monotonic() - start
+    # A burst of 100 tokens, then 100 per second.
+    assert len(client.lookups) <= 100 + 100 * elapsed + 1
+    assert len(client.lookups) > 60
+    watcher.close()
+
+
+def test_add_wakes_a_sleeping_run():
+    client = _FakeClient({"C1": (0, 1.0), "C2": (0, 1.0)})
+    watcher = StockWatcher(client=client, rate=1000, min_interval=60, max_interval=600)
+    stop = threading.Event()
+    thread = threading.Thread(target=watcher.run, kwargs={"stop": stop})
+    thread.start()
+    # Nothing is watched yet, and then C1 is due again only in a minute: both used to block `run()`.
+    for code in ("C1", "C2"):
+        time.sleep(0.05)
+        watcher.add([code])
+        deadline = time.monotonic() + 2
+        while code not in client.lookups and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert client.lookups[-1] == code
+    stop.set()
+    thread.join(2)
+    assert not thread.is_alive()
+    assert client.lookups == ["C1", "C2"]
+    watcher.close()
+
+
+def test_run_and_async_events_against_stub(stub_server):
+    client = LCSCClient(base_url=stub_server.url, retry=None)
+    watcher = StockWatcher(["C100", "C101"], client=client, rate=50, min_interval=0.05, max_interval=0.2)
+    stop = threading.Event()
+    thread = threading.Thread(target=watcher.run, kwargs={"stop": stop})
+    thread.start()
+    time.sleep(0.6)
+    stop.set()
+    thread.join(5)
+    assert not thread.is_alive()
+    # Nothing changes in the stub, so the intervals have backed off to `max_interval`.
+    assert watcher.interval("C100") == 0.2 and watcher.last_seen("C101").stock == 3737
+    stub_server.fail_codes = {"C100"}
+    async def first_event():
+        async for event in watcher.events():
+            return event
+    event = asyncio.run(asyncio.wait_for(first_event(), 5))
+    assert event.kind == "error" and event.product_code == "C100"
+    watcher.close()
+    client.close()